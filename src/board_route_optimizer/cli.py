@@ -36,6 +36,12 @@ Examples:
   
   # Load configuration from file
   python -m board_route_optimizer.cli --config config.json
+  
+  # Re-optimize from yesterday's published routes
+  python -m board_route_optimizer.cli --use-cache --warm-start
+  
+  # Continue an interrupted run, skipping districts already finished
+  python -m board_route_optimizer.cli --resume
         """
     )
     
@@ -119,6 +125,50 @@ Examples:
         help='Walking speed in km/h (default: 4.0)'
     )
     
+    parser.add_argument(
+        '--warm-start',
+        action='store_true',
+        help='Re-optimize starting from the routes in the existing output file'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Worker processes for the multi-start TSP search (0 = one per CPU)'
+    )
+    
+    parser.add_argument(
+        '--solver',
+        help='TSP solver backend, e.g. builtin or ortools; any registered backend name '
+             'is accepted (optional backends fall back to builtin when not installed)'
+    )
+    
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        help='Seconds of iterated local search per solve (ils_time_budget), '
+             'on top of any --total-time-budget'
+    )
+    
+    parser.add_argument(
+        '--total-time-budget',
+        type=float,
+        help='Seconds for the whole run (time_budget), shared among districts by size; '
+             'each district spends what is left after local search on iterated local search'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip districts finished by an interrupted run and reuse its distance matrices'
+    )
+    
+    parser.add_argument(
+        '--checkpoint-dir',
+        type=str,
+        help='Directory for per-district checkpoints (default: <cache directory>/checkpoints)'
+    )
+    
     # Output options
     parser.add_argument(
         '--quiet',
@@ -178,6 +228,20 @@ def create_config_from_args(args) -> Config:
     
     # Optimization settings
     config.optimization.walking_speed_kmh = args.walking_speed
+    if args.workers is not None:
+        config.optimization.parallel_workers = args.workers
+    if args.time_budget is not None:
+        config.optimization.ils_time_budget = args.time_budget
+    if args.total_time_budget is not None:
+        config.optimization.time_budget = args.total_time_budget
+    if args.solver:
+        config.optimization.solver = args.solver
+    
+    # Checkpoints, so that an interrupted run can be resumed
+    if args.checkpoint_dir:
+        config.data.checkpoint_directory = args.checkpoint_dir
+    elif not config.data.checkpoint_directory:
+        config.data.checkpoint_directory = str(Path(config.data.cache_directory) / 'checkpoints')
     
     # API settings
     if args.api_key:
@@ -207,6 +271,8 @@ def main():
         
         # Initialize optimizer
         optimizer = RouteOptimizer(config)
+        if args.warm_start:
+            optimizer.load_previous_routes(args.output)
         
         # Print header
         if not args.quiet:
@@ -222,7 +288,7 @@ def main():
         if args.districts:
             results = optimizer.optimize_specific_districts(args.districts)
         else:
-            results = optimizer.optimize_all_districts()
+            results = optimizer.optimize_all_districts(resume=args.resume)
         
         # Export results
         output_path = Path(args.output)
@@ -15,6 +15,10 @@ class APIConfig:
     request_delay: float = 1.6  # seconds (for 40 requests/minute limit)
     timeout: int = 30
     max_retries: int = 3
+    matrix_max_elements: int = 3500  # Sources x destinations per matrix request (0 = no tiling)
+    rate_limit_burst: int = 1  # Requests that may go out back to back after an idle period
+    max_concurrent_requests: int = 4  # Matrix requests in flight at once (rate limit still applies)
+    retry_backoff: float = 2.0  # seconds before the first retry; doubles on each attempt
     
     def __post_init__(self):
         """Initialize API key from environment if not provided."""
@@ -29,8 +33,43 @@ class APIConfig:
 class OptimizationConfig:
     """Optimization algorithm settings."""
     walking_speed_kmh: float = 4.0
+    # Straight-line fallback: "ellipsoidal" (WGS-84), "haversine" or "equirectangular"
+    straight_line_method: str = "ellipsoidal"
     max_tsp_iterations: int = 50
     tsp_improvement_threshold: float = 0.01
+    solver: str = "builtin"  # Solver backend: "builtin", "ortools" or a registered name
+    open_path: bool = True  # Single dummy-node solve instead of trying every start
+    exact_max_points: int = 15  # Held-Karp for instances up to this size
+    metaheuristic_min_points: int = 8  # Iterated local search only from this size
+    # "nearest_neighbor", "space_filling_curve", "greedy",
+    # "farthest_insertion" or "cheapest_insertion"
+    construction: str = "nearest_neighbor"
+    two_opt_strategy: str = "first"  # "first" or "best" improvement
+    two_opt_engine: str = "candidates"  # "candidates" or "vectorized" (whole neighbourhood in NumPy)
+    candidate_neighbors: int = 10  # k-nearest candidates per point in local search
+    use_or_opt: bool = True  # Or-opt segment relocation after 2-opt
+    lin_kernighan: bool = False  # Variable-depth refinement of the final route
+    lk_max_depth: int = 10  # Maximum 2-opt steps per variable-depth move
+    lk_time_budget: float = 10.0  # seconds per solve
+    ils_time_budget: float = 0.0  # seconds of iterated local search per solve (0 = off)
+    ils_acceptance: str = "better"  # "better" or "annealing"
+    ils_segment_length: int = 50  # Maximum length of the double-bridge segments
+    ils_seed: int = 0  # Seed for the double-bridge kicks
+    # "auto" (Held-Karp only when target_gap is set, else the cheap 1-tree),
+    # "held_karp", "one_tree" or "none"
+    lower_bound: str = "auto"
+    lower_bound_iterations: int = 50  # Subgradient steps of the Held-Karp bound
+    target_gap: float = 0.0  # Stop searching once (distance - bound) / bound is this small
+    time_budget: float = 0.0  # Seconds for the whole run, shared out by district size (0 = none)
+    batch_max_points: int = 0  # Solve districts up to this size in one vectorised batch (0 = off)
+    decomposition_min_points: int = 0  # Decompose districts larger than this (0 = never)
+    decomposition_method: str = "kmeans"  # "kmeans" or "grid" partitioning
+    decomposition_part_size: int = 200  # Maximum points per part
+    decomposition_repair_window: int = 20  # Points re-optimised on each side of a junction
+    use_numba: bool = True  # Compiled kernels for the hot loops when Numba is installed
+    parallel_workers: int = 1  # Multi-start workers (0 = one per CPU)
+    parallel_backend: str = "process"  # "process" or "thread"
+    parallel_min_points: int = 64  # Smaller instances always run serially
     
     @property
     def walking_speed_ms(self) -> float:
@@ -59,6 +98,10 @@ class DataConfig:
     
     # Cache settings
     cache_directory: str = "src/board_route_optimizer/cache"
+    checkpoint_directory: Optional[str] = None  # Per-district checkpoints for resuming (None = off)
+    road_cache: bool = True  # Persistent SQLite cache of road distances per coordinate pair
+    road_cache_ttl_days: float = 90.0  # Request pairs again after this many days (0 = never)
+    road_cache_max_pairs: int = 5_000_000  # Evict least recently used pairs beyond this (0 = no limit)
     
     # Privacy settings
     anonymize_personal_names: bool = True
@@ -122,12 +165,46 @@ class Config:
                 'openrouteservice_base_url': self.api.openrouteservice_base_url,
                 'request_delay': self.api.request_delay,
                 'timeout': self.api.timeout,
-                'max_retries': self.api.max_retries
+                'max_retries': self.api.max_retries,
+                'matrix_max_elements': self.api.matrix_max_elements,
+                'rate_limit_burst': self.api.rate_limit_burst,
+                'max_concurrent_requests': self.api.max_concurrent_requests,
+                'retry_backoff': self.api.retry_backoff
             },
             'optimization': {
                 'walking_speed_kmh': self.optimization.walking_speed_kmh,
+                'straight_line_method': self.optimization.straight_line_method,
                 'max_tsp_iterations': self.optimization.max_tsp_iterations,
-                'tsp_improvement_threshold': self.optimization.tsp_improvement_threshold
+                'tsp_improvement_threshold': self.optimization.tsp_improvement_threshold,
+                'solver': self.optimization.solver,
+                'open_path': self.optimization.open_path,
+                'exact_max_points': self.optimization.exact_max_points,
+                'metaheuristic_min_points': self.optimization.metaheuristic_min_points,
+                'construction': self.optimization.construction,
+                'two_opt_strategy': self.optimization.two_opt_strategy,
+                'two_opt_engine': self.optimization.two_opt_engine,
+                'candidate_neighbors': self.optimization.candidate_neighbors,
+                'use_or_opt': self.optimization.use_or_opt,
+                'lin_kernighan': self.optimization.lin_kernighan,
+                'lk_max_depth': self.optimization.lk_max_depth,
+                'lk_time_budget': self.optimization.lk_time_budget,
+                'ils_time_budget': self.optimization.ils_time_budget,
+                'ils_acceptance': self.optimization.ils_acceptance,
+                'ils_segment_length': self.optimization.ils_segment_length,
+                'ils_seed': self.optimization.ils_seed,
+                'lower_bound': self.optimization.lower_bound,
+                'lower_bound_iterations': self.optimization.lower_bound_iterations,
+                'target_gap': self.optimization.target_gap,
+                'time_budget': self.optimization.time_budget,
+                'batch_max_points': self.optimization.batch_max_points,
+                'decomposition_min_points': self.optimization.decomposition_min_points,
+                'decomposition_method': self.optimization.decomposition_method,
+                'decomposition_part_size': self.optimization.decomposition_part_size,
+                'decomposition_repair_window': self.optimization.decomposition_repair_window,
+                'use_numba': self.optimization.use_numba,
+                'parallel_workers': self.optimization.parallel_workers,
+                'parallel_backend': self.optimization.parallel_backend,
+                'parallel_min_points': self.optimization.parallel_min_points
             },
             'data': {
                 'use_bigquery': self.data.use_bigquery,
@@ -140,6 +217,10 @@ class Config:
                 'output_directory': self.data.output_directory,
                 'output_filename': self.data.output_filename,
                 'cache_directory': self.data.cache_directory,
+                'checkpoint_directory': self.data.checkpoint_directory,
+                'road_cache': self.data.road_cache,
+                'road_cache_ttl_days': self.data.road_cache_ttl_days,
+                'road_cache_max_pairs': self.data.road_cache_max_pairs,
                 'anonymize_personal_names': self.data.anonymize_personal_names
             }
         }
\ No newline at end of file
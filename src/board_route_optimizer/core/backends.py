@@ -0,0 +1,250 @@
+"""
+Pluggable TSP solver backends.
+"""
+
+import time
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+from ..config import Config
+from .lower_bound import LowerBoundCalculator
+from .tsp_solver import TSPSolver
+
+
+class SolverBackend(Protocol):
+    """
+    Interface of a route solver usable by ``RouteOptimizer``.
+
+    A backend solves one open route over a distance matrix, optionally with
+    a fixed first and/or last point, and keeps statistics of its last solve
+    in ``stats`` (at least "strategy" and "seconds").
+    """
+
+    name: str
+    stats: Dict[str, Any]
+
+    def solve(self, distances: np.ndarray, start: Optional[int] = None,
+              end: Optional[int] = None, time_budget: float = 0.0,
+              coordinates: Optional[np.ndarray] = None) -> Tuple[List[int], float]:
+        """
+        Solve an open route.
+
+        Args:
+            distances: Distance matrix (n x n)
+            start: Point the route must start at, or None to choose freely
+            end: Point the route must end at, or None to choose freely
+            time_budget: Seconds the backend may spend (0 = its default)
+            coordinates: Point coordinates (n x 2); backends may ignore them
+
+        Returns:
+            Tuple of (route, total_distance)
+        """
+        ...
+
+
+class BuiltinBackend:
+    """The package's own ``TSPSolver``."""
+
+    name = 'builtin'
+
+    def __init__(self, config: Config):
+        """
+        Initialize builtin backend.
+
+        Args:
+            config: Configuration object
+        """
+        self.solver = TSPSolver(config)
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """The builtin solver needs nothing beyond NumPy."""
+        return True
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Statistics of the most recent solve."""
+        return self.solver.stats
+
+    def solve(self, distances: np.ndarray, start: Optional[int] = None,
+              end: Optional[int] = None, time_budget: float = 0.0,
+              coordinates: Optional[np.ndarray] = None) -> Tuple[List[int], float]:
+        """
+        Solve with the adaptive portfolio, or as a constrained open path.
+
+        Args:
+            distances: Distance matrix (n x n)
+            start: Point the route must start at, or None to choose freely
+            end: Point the route must end at, or None to choose freely
+            time_budget: Seconds the solver may spend
+            coordinates: Point coordinates (n x 2)
+
+        Returns:
+            Tuple of (route, total_distance)
+        """
+        if start is None and end is None:
+            return self.solver.solve(distances, coordinates, time_budget)
+
+        started = time.perf_counter()
+        route, distance = self.solver.solve_open_path(distances, start, end, coordinates)
+        self.solver.stats['strategy'] = 'open_path'
+        self.solver.stats['seconds'] = time.perf_counter() - started
+        return route, distance
+
+
+class OrToolsBackend:
+    """
+    Google OR-Tools routing solver (optional, ``pip install ortools``).
+
+    Free endpoints are modelled with a dummy depot that costs nothing to
+    reach; distances are scaled to integer centimetres. With a time budget
+    the search continues with guided local search until it runs out.
+    """
+
+    name = 'ortools'
+
+    def __init__(self, config: Config):
+        """
+        Initialize OR-Tools backend.
+
+        Args:
+            config: Configuration object
+        """
+        from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+
+        self.config = config
+        self.lower_bound = LowerBoundCalculator(config)
+        self.stats: Dict[str, Any] = {}
+        self._pywrapcp = pywrapcp
+        self._enums = routing_enums_pb2
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Check whether OR-Tools is installed."""
+        try:
+            from ortools.constraint_solver import pywrapcp  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def solve(self, distances: np.ndarray, start: Optional[int] = None,
+              end: Optional[int] = None, time_budget: float = 0.0,
+              coordinates: Optional[np.ndarray] = None) -> Tuple[List[int], float]:
+        """
+        Solve an open route with the OR-Tools routing library.
+
+        Args:
+            distances: Distance matrix (n x n)
+            start: Point the route must start at, or None to choose freely
+            end: Point the route must end at, or None to choose freely
+            time_budget: Seconds of guided local search (0 = first solution
+                plus local search only)
+            coordinates: Ignored
+
+        Returns:
+            Tuple of (route, total_distance)
+        """
+        started = time.perf_counter()
+        self.stats = {}
+        distances = np.asarray(distances, dtype=float)
+        n = distances.shape[0]
+        if n <= 1:
+            self.stats.update(strategy=self.name, seconds=0.0, lower_bound=0.0, optimality_gap=0.0)
+            return list(range(n)), 0.0
+
+        # A dummy node closes the open path unless both ends are fixed
+        size = n if start is not None and end is not None else n + 1
+        costs = np.zeros((size, size), dtype=np.int64)
+        costs[:n, :n] = np.rint(distances * 100).astype(np.int64)
+        first = start if start is not None else n
+        last = end if end is not None else n
+
+        manager = self._pywrapcp.RoutingIndexManager(size, 1, [first], [last])
+        routing = self._pywrapcp.RoutingModel(manager)
+
+        def cost_callback(from_index, to_index):
+            return int(costs[manager.IndexToNode(from_index), manager.IndexToNode(to_index)])
+
+        transit = routing.RegisterTransitCallback(cost_callback)
+        routing.SetArcCostEvaluatorOfAllVehicles(transit)
+
+        parameters = self._pywrapcp.DefaultRoutingSearchParameters()
+        parameters.first_solution_strategy = (
+            self._enums.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+        )
+        if time_budget > 0:
+            parameters.local_search_metaheuristic = (
+                self._enums.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+            )
+            parameters.time_limit.FromMilliseconds(max(int(time_budget * 1000), 1))
+
+        solution = routing.SolveWithParameters(parameters)
+        if solution is None:
+            raise RuntimeError("OR-Tools found no route")
+
+        route = []
+        index = routing.Start(0)
+        while True:
+            node = manager.IndexToNode(index)
+            if node < n:
+                route.append(int(node))
+            if routing.IsEnd(index):
+                break
+            index = solution.Value(routing.NextVar(index))
+
+        path = np.asarray(route)
+        distance = float(distances[path[:-1], path[1:]].sum())
+        bound = self.lower_bound.compute(distances, distance, start, end)
+        self.stats.update(
+            strategy=self.name,
+            seconds=time.perf_counter() - started,
+            lower_bound=bound,
+            optimality_gap=(max((distance - bound) / bound, 0.0) if bound else None)
+        )
+        return route, distance
+
+
+# Backend factories by name; see register_backend
+SOLVER_BACKENDS: Dict[str, Callable[[Config], SolverBackend]] = {
+    BuiltinBackend.name: BuiltinBackend,
+    OrToolsBackend.name: OrToolsBackend,
+}
+
+
+def register_backend(name: str, factory: Callable[[Config], SolverBackend]) -> None:
+    """
+    Register a solver backend under a name usable in config and CLI.
+
+    The factory is called with the ``Config``. If it has an
+    ``is_available`` class method returning False, ``create_backend`` falls
+    back to the builtin solver.
+
+    Args:
+        name: Backend name, e.g. "ortools"
+        factory: Class or callable creating the backend
+    """
+    SOLVER_BACKENDS[name] = factory
+
+
+def create_backend(config: Config) -> SolverBackend:
+    """
+    Create the backend selected by ``OptimizationConfig.solver``.
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        Solver backend; the builtin one if the selected backend is not
+        installed
+    """
+    name = config.optimization.solver
+    if name not in SOLVER_BACKENDS:
+        raise ValueError(
+            f"Unknown solver backend: {name} (available: {', '.join(sorted(SOLVER_BACKENDS))})"
+        )
+
+    factory = SOLVER_BACKENDS[name]
+    is_available = getattr(factory, 'is_available', None)
+    if is_available is not None and not is_available():
+        print(f"Solver backend '{name}' is not installed; using the builtin solver")
+        return BuiltinBackend(config)
+    return factory(config)
@@ -0,0 +1,258 @@
+"""
+Per-district checkpoints for resuming interrupted optimization runs.
+"""
+
+import hashlib
+import json
+import os
+import re
+import numpy as np
+import pandas as pd
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from ..config import Config
+from ..utils.distance import DistanceCalculator
+
+
+# Result entries stored in a checkpoint besides the matrices
+RESULT_KEYS = (
+    'route', 'distance', 'duration', 'warm_started', 'decomposed',
+    'lower_bound', 'optimality_gap', 'strategy', 'solve_seconds'
+)
+
+# Optimization settings that change how fast a route is found, not which
+SPEED_ONLY_SETTINGS = ('use_numba', 'parallel_workers', 'parallel_backend')
+
+# Optimization settings that change the distance and duration matrices
+DISTANCE_SETTINGS = ('straight_line_method', 'walking_speed_kmh')
+
+
+class CheckpointStore:
+    """
+    Stores each district's matrices and solved route as it completes.
+
+    Every district is one ``.npz`` file holding the distance and duration
+    matrices plus a JSON header with the route and its statistics. The
+    header carries a fingerprint of the district's boards and of the
+    distance settings, so the matrices are reused for the same input and
+    distance source, and a digest of the solver settings, which decides
+    whether the stored route still counts as finished. The boards and coordinates are kept
+    as well, so that a later run on changed data can still update the
+    solved route incrementally (see ``load_previous``).
+    Files are written to a temporary name and renamed, so an interrupted
+    write never leaves a truncated checkpoint behind.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize checkpoint store.
+
+        Args:
+            directory: Directory holding the checkpoint files
+        """
+        self.directory = Path(directory)
+
+    def fingerprint(self, district_data: pd.DataFrame, config: Config) -> str:
+        """
+        Identify a district's input and the settings its matrices depend on.
+
+        Args:
+            district_data: District data in matrix order
+            config: Configuration whose distance settings apply
+
+        Returns:
+            Hex digest of the boards, their coordinates and order, and of
+            ``distance_settings(config)``
+        """
+        return self._digest({**self._boards(district_data), 'settings': self.distance_settings(config)})
+
+    def distance_settings(self, config: Config) -> Dict[str, Any]:
+        """
+        Settings that affect a district's distance and duration matrices.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            Distance source (API endpoint and routing profile, or none) and
+            the ``DISTANCE_SETTINGS`` of the optimization settings
+        """
+        use_api = bool(config.api.api_key)
+        optimization = asdict(config.optimization)
+        return {
+            'use_api': use_api,
+            'openrouteservice_base_url': config.api.openrouteservice_base_url if use_api else None,
+            'profile': DistanceCalculator.PROFILE if use_api else None,
+            **{key: optimization[key] for key in DISTANCE_SETTINGS}
+        }
+
+    def settings(self, config: Config) -> Dict[str, Any]:
+        """
+        Settings that affect a district's solved route for given matrices.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            Every optimization setting except ``SPEED_ONLY_SETTINGS`` and
+            ``DISTANCE_SETTINGS``
+        """
+        return {
+            key: value for key, value in asdict(config.optimization).items()
+            if key not in SPEED_ONLY_SETTINGS + DISTANCE_SETTINGS
+        }
+
+    def load(self, district_name: str, district_data: pd.DataFrame,
+             config: Config) -> Optional[Dict[str, Any]]:
+        """
+        Load a district's checkpoint if it matches the current input.
+
+        Args:
+            district_name: Name of the district
+            district_data: Current district data
+            config: Current configuration
+
+        Returns:
+            Dictionary with "distance_matrix" and "duration_matrix" (None
+            if not stored) and "result" (None until the district was
+            solved under the current ``settings``), or None if there is no
+            checkpoint for the same boards and ``distance_settings``
+        """
+        stored = self._read(district_name)
+        if stored is None:
+            return None
+        header = stored['header']
+        if header.get('fingerprint') != self.fingerprint(district_data, config):
+            return None
+        finished = header.get('settings') == self._digest(self.settings(config))
+        return {
+            'distance_matrix': stored['distance_matrix'],
+            'duration_matrix': stored['duration_matrix'],
+            'result': header.get('result') if finished else None
+        }
+
+    def load_previous(self, district_name: str, config: Config) -> Optional[Dict[str, Any]]:
+        """
+        Load a district's last solved route, even if its boards changed since.
+
+        Args:
+            district_name: Name of the district
+            config: Current configuration; the checkpoint must have been
+                written under the same ``distance_settings`` and ``settings``
+
+        Returns:
+            Result dictionary with "data" (board numbers and coordinates in
+            matrix order), "route", "distance_matrix" and "duration_matrix",
+            or None if no solved checkpoint with matrices is available
+        """
+        stored = self._read(district_name)
+        if stored is None or stored['distance_matrix'] is None:
+            return None
+        header = stored['header']
+        if (header.get('distance_settings') != self._digest(self.distance_settings(config))
+                or header.get('settings') != self._digest(self.settings(config))
+                or not header.get('result') or not header.get('boards')):
+            return None
+        coordinates = np.asarray(header['coordinates'], dtype=float).reshape(-1, 2)
+        result = dict(header['result'])
+        result.update({
+            'data': pd.DataFrame({
+                '掲示板番号': header['boards'],
+                '経度': coordinates[:, 0],
+                '緯度': coordinates[:, 1]
+            }),
+            'distance_matrix': stored['distance_matrix'],
+            'duration_matrix': stored['duration_matrix']
+        })
+        return result
+
+    def save(self, district_name: str, district_data: pd.DataFrame, config: Config,
+             matrices: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+             result: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Write a district's checkpoint, replacing any previous one.
+
+        Args:
+            district_name: Name of the district
+            district_data: District data in matrix order
+            config: Configuration the district is solved under
+            matrices: (distance_matrix, duration_matrix), if computed
+            result: District result; only ``RESULT_KEYS`` are stored
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        header = {
+            'district': district_name,
+            'fingerprint': self.fingerprint(district_data, config),
+            'distance_settings': self._digest(self.distance_settings(config)),
+            'settings': self._digest(self.settings(config)),
+            **self._boards(district_data),
+            'result': None if result is None else {
+                key: self._plain(result[key]) for key in RESULT_KEYS if key in result
+            }
+        }
+        arrays = {'header': np.array(json.dumps(header, ensure_ascii=False))}
+        if matrices is not None:
+            arrays['distance_matrix'] = np.asarray(matrices[0], dtype=float)
+            arrays['duration_matrix'] = np.asarray(matrices[1], dtype=float)
+
+        path = self._path(district_name)
+        temporary = path.with_name(path.name + '.tmp')
+        with open(temporary, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(temporary, path)
+
+    def _read(self, district_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a district's checkpoint file.
+
+        Args:
+            district_name: Name of the district
+
+        Returns:
+            Dictionary with "header", "distance_matrix" and
+            "duration_matrix" (None if not stored), or None if there is no
+            readable checkpoint
+        """
+        path = self._path(district_name)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                return {
+                    'header': json.loads(str(stored['header'])),
+                    'distance_matrix': stored['distance_matrix'] if 'distance_matrix' in stored else None,
+                    'duration_matrix': stored['duration_matrix'] if 'duration_matrix' in stored else None
+                }
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  Ignoring unreadable checkpoint {path}: {e}")
+            return None
+
+    def _boards(self, district_data: pd.DataFrame) -> Dict[str, Any]:
+        """Board numbers and coordinates of a district, in matrix order."""
+        return {
+            'boards': (
+                district_data['掲示板番号'].astype(str).tolist()
+                if '掲示板番号' in district_data.columns else []
+            ),
+            'coordinates': district_data[['経度', '緯度']].astype(float).values.tolist()
+        }
+
+    def _digest(self, payload: Dict[str, Any]) -> str:
+        """Hex digest of a JSON-serialisable payload."""
+        text = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _path(self, district_name: str) -> Path:
+        """Checkpoint file of a district."""
+        return self.directory / (re.sub(r'[\\/:*?"<>|\s]', '_', district_name) + '.npz')
+
+    def _plain(self, value: Any) -> Any:
+        """Convert NumPy scalars and arrays to JSON-serialisable values."""
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, (list, tuple)):
+            return [self._plain(item) for item in value]
+        return value
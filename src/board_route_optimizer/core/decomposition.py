@@ -0,0 +1,372 @@
+"""
+Spatial decomposition solver for instances too large for one dense matrix.
+"""
+
+import contextlib
+import copy
+import io
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+from ..config import Config
+from .tsp_solver import TSPSolver
+
+
+# Returns (distance_matrix, duration_matrix) for a list of point indices
+MatrixFunction = Callable[[List[int]], Tuple[np.ndarray, np.ndarray]]
+
+
+def _solve_part(config: Config, distances: np.ndarray, start: Optional[int],
+                end: Optional[int]) -> List[int]:
+    """
+    Solve one part as an open path between its entry and exit points.
+
+    Module-level so that process pool workers can run it.
+
+    Args:
+        config: Configuration used for the part solves
+        distances: Distance matrix of the part
+        start: Entry point of the part, or None for a free start
+        end: Exit point of the part, or None for a free end
+
+    Returns:
+        Route over the part's local indices
+    """
+    n = distances.shape[0]
+    if n == 1:
+        return [0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        route, _ = TSPSolver(config).solve_open_path(distances, start, end)
+    return route
+
+
+class DecompositionSolver:
+    """
+    Solves very large open-path instances part by part.
+
+    Points are partitioned spatially, the parts are ordered by an open path
+    through their centroids, and consecutive parts are joined at their
+    closest pair of points. Each part is solved as an open path from its
+    entry to its exit point, the pieces are concatenated, and a window
+    around every junction is re-optimised. Only part-sized and
+    window-sized matrices are ever requested, so the work grows roughly
+    linearly with the number of points.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialize decomposition solver.
+
+        Args:
+            config: Configuration object
+        """
+        self.config = config
+        # Parts are solved without lower bounds; those are per-part only
+        self.part_config = copy.deepcopy(config)
+        self.part_config.optimization.lower_bound = 'none'
+
+    def solve(self, coordinates: Sequence[Tuple[float, float]],
+              matrix_function: MatrixFunction) -> Tuple[List[int], float, float]:
+        """
+        Solve an open route over all points.
+
+        Args:
+            coordinates: (lon, lat) of every point
+            matrix_function: Returns (distance_matrix, duration_matrix) for
+                a list of point indices, e.g. a wrapper around
+                ``DistanceCalculator.calculate_matrix``
+
+        Returns:
+            Tuple of (route, total_distance, total_duration)
+        """
+        points = self._project(coordinates)
+        n = len(points)
+        parts = self._order_parts(points, self._partition(points))
+        print(f"  Decomposed {n} points into {len(parts)} parts")
+
+        entries, exits = self._junctions(points, parts)
+        matrices = [matrix_function(part.tolist()) for part in parts]
+        local_ends = [
+            (
+                None if entries[k] is None else int(np.flatnonzero(part == entries[k])[0]),
+                None if exits[k] is None else int(np.flatnonzero(part == exits[k])[0])
+            )
+            for k, part in enumerate(parts)
+        ]
+        part_routes = self._solve_parts([matrix[0] for matrix in matrices], local_ends)
+
+        route = []
+        junctions = []
+        distance = duration = 0.0
+        for part, (part_distances, part_durations), local in zip(parts, matrices, part_routes):
+            local = np.asarray(local)
+            distance += float(part_distances[local[:-1], local[1:]].sum())
+            duration += float(part_durations[local[:-1], local[1:]].sum())
+            if route:
+                junctions.append(len(route))
+            route.extend(part[local].tolist())
+
+        # One matrix per junction window gives both the edge joining the
+        # parts and the costs for re-optimising around it
+        repaired = 0
+        for k, (first, last) in enumerate(self._junction_windows(junctions, len(route))):
+            window_distances, window_durations = matrix_function(route[first:last])
+            link = junctions[k] - first
+            distance += float(window_distances[link - 1, link])
+            duration += float(window_durations[link - 1, link])
+            saved, duration_change = self._repair_window(route, first, window_distances, window_durations)
+            if saved > 0:
+                distance -= saved
+                duration += duration_change
+                repaired += 1
+
+        print(f"  Stitched {len(parts)} parts; {repaired} of {len(junctions)} junctions improved")
+        return route, distance, duration
+
+    def _project(self, coordinates: Sequence[Tuple[float, float]]) -> np.ndarray:
+        """
+        Project (lon, lat) to approximate planar metres.
+
+        Args:
+            coordinates: (lon, lat) of every point
+
+        Returns:
+            Array (n x 2) of x, y in metres
+        """
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        scale = np.cos(np.radians(coordinates[:, 1].mean()))
+        return np.column_stack((
+            coordinates[:, 0] * 111320.0 * scale,
+            coordinates[:, 1] * 110540.0
+        ))
+
+    def _partition(self, points: np.ndarray) -> List[np.ndarray]:
+        """
+        Split points into spatially compact parts.
+
+        "grid" splits the bounding box recursively at the median of its
+        longer side, giving rectangular cells of balanced size. "kmeans"
+        refines those cells' centroids with Lloyd iterations; clusters that
+        grow past the part size are split again like grid cells.
+
+        Args:
+            points: Projected points (n x 2)
+
+        Returns:
+            Index arrays, one per non-empty part
+        """
+        settings = self.config.optimization
+        size = max(settings.decomposition_part_size, 2)
+        method = settings.decomposition_method
+        if method not in ('grid', 'kmeans'):
+            raise ValueError(f"Unknown decomposition method: {method}")
+
+        cells = self._bisect(points, [np.arange(len(points))], size)
+        if method == 'grid':
+            return cells
+
+        centroids = np.array([points[cell].mean(axis=0) for cell in cells])
+        for _ in range(20):
+            labels = self._nearest_centroid(points, centroids)
+            counts = np.bincount(labels, minlength=len(centroids))
+            sums = np.column_stack([
+                np.bincount(labels, weights=points[:, axis], minlength=len(centroids))
+                for axis in range(2)
+            ])
+            moved = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centroids)
+            if np.allclose(moved, centroids):
+                break
+            centroids = moved
+        labels = self._nearest_centroid(points, centroids)
+        order = np.argsort(labels, kind='stable')
+        clusters = [cluster for cluster in np.split(order, np.cumsum(np.bincount(labels))[:-1]) if len(cluster)]
+        return self._bisect(points, clusters, size)
+
+    def _bisect(self, points: np.ndarray, cells: List[np.ndarray], size: int) -> List[np.ndarray]:
+        """
+        Split cells at the median of their longer side until none exceeds size.
+
+        Args:
+            points: Projected points (n x 2)
+            cells: Index arrays to split
+            size: Maximum points per cell
+
+        Returns:
+            Index arrays of at most ``size`` points each
+        """
+        while any(len(cell) > size for cell in cells):
+            split = []
+            for cell in cells:
+                if len(cell) <= size:
+                    split.append(cell)
+                    continue
+                spread = points[cell].max(axis=0) - points[cell].min(axis=0)
+                axis = int(np.argmax(spread))
+                order = cell[np.argsort(points[cell, axis], kind='stable')]
+                half = len(order) // 2
+                split.extend((order[:half], order[half:]))
+            cells = split
+        return cells
+
+    def _nearest_centroid(self, points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """
+        Label every point with its nearest centroid, in blocks of points.
+
+        Args:
+            points: Projected points (n x 2)
+            centroids: Centroids (k x 2)
+
+        Returns:
+            Centroid index per point
+        """
+        labels = np.empty(len(points), dtype=np.intp)
+        block = max(1, 2_000_000 // max(len(centroids), 1))
+        for first in range(0, len(points), block):
+            chunk = points[first:first + block]
+            squared = ((chunk[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+            labels[first:first + block] = np.argmin(squared, axis=1)
+        return labels
+
+    def _order_parts(self, points: np.ndarray, parts: List[np.ndarray]) -> List[np.ndarray]:
+        """
+        Order parts along an open path through their centroids.
+
+        Args:
+            points: Projected points (n x 2)
+            parts: Index arrays, one per part
+
+        Returns:
+            Parts in visiting order
+        """
+        if len(parts) <= 2:
+            return parts
+        centroids = np.array([points[part].mean(axis=0) for part in parts])
+        centroid_distances = np.sqrt(
+            ((centroids[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            order, _ = TSPSolver(self.part_config).solve_open_path(centroid_distances)
+        return [parts[k] for k in order]
+
+    def _junctions(self, points: np.ndarray,
+                   parts: List[np.ndarray]) -> Tuple[List[Optional[int]], List[Optional[int]]]:
+        """
+        Choose where the route leaves each part and enters the next.
+
+        Consecutive parts are joined at their closest pair of points. A
+        part's exit may not be its own entry unless it has a single point.
+
+        Args:
+            points: Projected points (n x 2)
+            parts: Parts in visiting order
+
+        Returns:
+            Tuple of (entries, exits) as global point indices; the first
+            entry and the last exit are None (free)
+        """
+        entries: List[Optional[int]] = [None] * len(parts)
+        exits: List[Optional[int]] = [None] * len(parts)
+        for k in range(len(parts) - 1):
+            here, there = parts[k], parts[k + 1]
+            gaps = ((points[here][:, None, :] - points[there][None, :, :]) ** 2).sum(axis=2)
+            if entries[k] is not None and len(here) > 1:
+                gaps[here == entries[k]] = np.inf
+            i, j = np.unravel_index(int(np.argmin(gaps)), gaps.shape)
+            exits[k] = int(here[i])
+            entries[k + 1] = int(there[j])
+        return entries, exits
+
+    def _solve_parts(self, matrices: List[np.ndarray],
+                     ends: List[Tuple[Optional[int], Optional[int]]]) -> List[List[int]]:
+        """
+        Solve every part, on a worker pool when configured.
+
+        Args:
+            matrices: Distance matrix per part
+            ends: (entry, exit) per part as local indices
+
+        Returns:
+            Route per part over its local indices, in part order
+        """
+        workers = self.config.optimization.parallel_workers
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(matrices))
+        arguments = (
+            [self.part_config] * len(matrices), matrices,
+            [start for start, _ in ends], [end for _, end in ends]
+        )
+
+        if workers <= 1:
+            return list(map(_solve_part, *arguments))
+        if self.config.optimization.parallel_backend == 'thread':
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(_solve_part, *arguments))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_solve_part, *arguments))
+
+    def _junction_windows(self, junctions: List[int], length: int) -> List[Tuple[int, int]]:
+        """
+        Route slices re-optimised around each junction.
+
+        Each window reaches ``decomposition_repair_window`` points to both
+        sides of its junction, but stops halfway to the neighbouring
+        junctions. Neighbouring windows then share at most one point, which
+        both keep fixed, so each window's matrix stays valid while the
+        others are repaired.
+
+        Args:
+            junctions: Index in the route of the first point of every part
+                but the first, in increasing order
+            length: Number of points in the route
+
+        Returns:
+            (first, last) slice bounds per junction; every window contains
+            at least the two points of its junction edge
+        """
+        width = max(self.config.optimization.decomposition_repair_window, 1)
+        bounds = [0] + [(a + b) // 2 for a, b in zip(junctions, junctions[1:])] + [length - 1]
+        return [
+            (max(position - width, bounds[k]), min(position + width, bounds[k + 1] + 1))
+            for k, position in enumerate(junctions)
+        ]
+
+    def _repair_window(self, route: List[int], first: int, distances: np.ndarray,
+                       durations: np.ndarray) -> Tuple[float, float]:
+        """
+        Re-optimise a window of the route around a junction, in place.
+
+        The window keeps its first and last point, so the rest of the
+        route is unaffected.
+
+        Args:
+            route: Stitched route
+            first: Index in ``route`` of the window's first point
+            distances: Distance matrix over the window, in route order
+            durations: Duration matrix over the window
+
+        Returns:
+            Tuple of (distance saved, change in duration); (0, 0) when the
+            window was left unchanged
+        """
+        size = distances.shape[0]
+        if size < 4:
+            return 0.0, 0.0
+
+        window = route[first:first + size]
+        identity = list(range(size))
+        with contextlib.redirect_stdout(io.StringIO()):
+            local, _ = TSPSolver(self.part_config).improve_route(
+                distances, identity, start=0, end=size - 1
+            )
+
+        before = np.asarray(identity)
+        after = np.asarray(local)
+        saved = float(distances[before[:-1], before[1:]].sum() - distances[after[:-1], after[1:]].sum())
+        if saved <= 1e-9:
+            return 0.0, 0.0
+
+        route[first:first + size] = [window[k] for k in local]
+        change = float(durations[after[:-1], after[1:]].sum() - durations[before[:-1], before[1:]].sum())
+        return saved, change
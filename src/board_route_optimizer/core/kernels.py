@@ -0,0 +1,238 @@
+"""
+Compiled kernels for the TSP hot loops.
+
+The functions are compiled with Numba when it is installed
+(``pip install numba``). Without Numba they still run, as plain Python
+over the same arrays; ``TSPSolver`` then keeps its own NumPy and
+``Tour``-based implementations, which these kernels mirror move for move.
+"""
+
+import numpy as np
+from typing import Tuple
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for ``numba.njit`` that leaves functions uncompiled."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda function: function
+
+
+@njit(cache=True)
+def route_distance(route: np.ndarray, distances: np.ndarray) -> float:
+    """
+    Sum of the edge lengths along a route.
+
+    Args:
+        route: Point indices in visiting order
+        distances: Distance matrix
+
+    Returns:
+        Total route distance
+    """
+    total = 0.0
+    for i in range(len(route) - 1):
+        total += distances[route[i], route[i + 1]]
+    return total
+
+
+@njit(cache=True)
+def nearest_neighbor(start: int, distances: np.ndarray) -> np.ndarray:
+    """
+    Nearest-neighbour route from ``start``.
+
+    Ties go to the lowest index, as with ``np.argmin``.
+
+    Args:
+        start: Starting point index
+        distances: Distance matrix
+
+    Returns:
+        Route as an index array
+    """
+    n = distances.shape[0]
+    visited = np.zeros(n, dtype=np.bool_)
+    route = np.empty(n, dtype=np.int64)
+    current = start
+    route[0] = current
+    visited[current] = True
+
+    for step in range(1, n):
+        best = 0
+        best_value = np.inf if visited[0] else distances[current, 0]
+        for j in range(1, n):
+            value = np.inf if visited[j] else distances[current, j]
+            if value < best_value:
+                best_value = value
+                best = j
+        current = best
+        route[step] = current
+        visited[current] = True
+
+    return route
+
+
+@njit(cache=True)
+def _reverse(order: np.ndarray, position: np.ndarray, a: int, b: int) -> None:
+    """Reverse the forward path a..b, or its complement if that is shorter."""
+    n = len(order)
+    i = position[a]
+    j = position[b]
+    length = (j - i) % n + 1
+    if 2 * length > n:
+        i, j = (j + 1) % n, (i - 1) % n
+        length = n - length
+    for k in range(length // 2):
+        p = (i + k) % n
+        q = (j - k) % n
+        order[p], order[q] = order[q], order[p]
+        position[order[p]] = p
+        position[order[q]] = q
+
+
+@njit(cache=True)
+def two_opt_candidates(order: np.ndarray, position: np.ndarray, distances: np.ndarray,
+                       neighbours: np.ndarray, dont_look: np.ndarray, queue: np.ndarray,
+                       head: int, count: int, threshold: float, best_improvement: bool,
+                       max_moves: int) -> Tuple[int, int, int]:
+    """
+    Candidate-list 2-opt with don't-look bits on a cyclic tour, in place.
+
+    Mirrors ``TSPSolver._two_opt_search`` on a ``Tour``: the same points
+    are examined in the same order and the same moves are applied.
+
+    Args:
+        order: Tour order (modified)
+        position: Position of every point in ``order`` (modified)
+        distances: Symmetric distance matrix matching the tour's points
+        neighbours: Candidate neighbours per point, nearest first, padded
+            with -1
+        dont_look: Don't-look bit per point (modified)
+        queue: Ring buffer of awake points, one slot per point (modified)
+        head: Index of the first queued point in ``queue``
+        count: Number of queued points
+        threshold: Minimum gain for a move to count as improving
+        best_improvement: Apply each point's best move instead of its first
+        max_moves: Maximum number of moves to apply
+
+    Returns:
+        Tuple of (moves applied, queue head, queue count)
+    """
+    n = len(order)
+    moves = 0
+    while moves < max_moves:
+        a = -1
+        while count > 0:
+            point = queue[head]
+            head = (head + 1) % n
+            count -= 1
+            if not dont_look[point]:
+                dont_look[point] = True
+                a = point
+                break
+        if a < 0:
+            break
+
+        best_gain = threshold
+        found = False
+        m0 = m1 = m2 = m3 = -1
+        for direction in range(2):
+            forward = direction == 0
+            if forward:
+                b = order[(position[a] + 1) % n]
+            else:
+                b = order[position[a] - 1]
+            d_ab = distances[a, b]
+
+            stop = False
+            for k in range(neighbours.shape[1]):
+                c = neighbours[a, k]
+                if c < 0:
+                    break
+                g1 = d_ab - distances[a, c]
+                if g1 <= 0:
+                    break
+                if forward:
+                    d = order[(position[c] + 1) % n]
+                else:
+                    d = order[position[c] - 1]
+                if c == b or d == a:
+                    continue
+                gain = g1 + distances[c, d] - distances[b, d]
+                if gain > best_gain:
+                    best_gain = gain
+                    found = True
+                    if forward:
+                        m0, m1, m2, m3 = a, b, c, d
+                    else:
+                        m0, m1, m2, m3 = b, a, d, c
+                    if not best_improvement:
+                        stop = True
+                        break
+            if stop:
+                break
+
+        if found:
+            if order[(position[m0] + 1) % n] == m1:
+                _reverse(order, position, m1, m2)
+            else:
+                _reverse(order, position, m0, m3)
+            for point in (m0, m1, m2, m3):
+                if dont_look[point]:
+                    dont_look[point] = False
+                    queue[(head + count) % n] = point
+                    count += 1
+            moves += 1
+
+    return moves, head, count
+
+
+@njit(cache=True)
+def minimum_spanning_tree(costs: np.ndarray, penalties: np.ndarray) -> Tuple[float, np.ndarray]:
+    """
+    Prim's minimum spanning tree under node penalties.
+
+    Mirrors ``LowerBoundCalculator._spanning_tree``, including its
+    tie-breaking, so both give the same tree.
+
+    Args:
+        costs: Symmetric cost matrix
+        penalties: Penalty per point, added to both ends of every edge
+
+    Returns:
+        Tuple of (penalised tree length, degree of every point)
+    """
+    n = costs.shape[0]
+    degree = np.zeros(n, dtype=np.int64)
+    in_tree = np.zeros(n, dtype=np.bool_)
+    in_tree[0] = True
+    best = np.empty(n)
+    for j in range(n):
+        best[j] = costs[0, j] + penalties[0] + penalties[j]
+    best[0] = np.inf
+    parent = np.zeros(n, dtype=np.int64)
+    total = 0.0
+
+    for _ in range(n - 1):
+        point = 0
+        for j in range(1, n):
+            if best[j] < best[point]:
+                point = j
+        total += best[point]
+        degree[point] += 1
+        degree[parent[point]] += 1
+        in_tree[point] = True
+        best[point] = np.inf
+        for j in range(n):
+            if not in_tree[j]:
+                value = costs[point, j] + penalties[point] + penalties[j]
+                if value < best[j]:
+                    best[j] = value
+                    parent[j] = point
+
+    return total, degree
@@ -0,0 +1,212 @@
+"""
+Lower bounds on the length of the optimal open walking route.
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+from ..config import Config
+from . import kernels
+
+
+class LowerBoundCalculator:
+    """
+    Computes 1-tree and Held-Karp (subgradient) lower bounds.
+
+    Routes are open paths, so the bounds are taken on the closed tour
+    through a dummy node that is free to reach from every point, exactly
+    the tour ``TSPSolver`` searches. The dummy is the special node of the
+    1-tree: a minimum spanning tree over the real points plus the dummy's
+    two cheapest edges, or its edges to the fixed endpoints. Asymmetric
+    matrices are bounded through ``min(D, D.T)``, which never exceeds the
+    length of a route walked in either direction.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Initialize lower bound calculator.
+
+        Args:
+            config: Configuration object
+        """
+        self.config = config
+        # Compiled spanning tree, or None to use the NumPy loop
+        self.kernels = kernels if kernels.NUMBA_AVAILABLE and config.optimization.use_numba else None
+
+    def compute(self, distances: np.ndarray, upper_bound: float,
+                start: Optional[int] = None, end: Optional[int] = None) -> Optional[float]:
+        """
+        Compute the lower bound selected by ``OptimizationConfig.lower_bound``.
+
+        With "auto", the subgradient Held-Karp bound is only computed when a
+        ``target_gap`` can stop the search early; otherwise the bound is just
+        reported, and a single 1-tree is enough for that.
+
+        Args:
+            distances: Distance matrix (n x n)
+            upper_bound: Length of a known route, used to size subgradient steps
+            start: Fixed start, if any
+            end: Fixed end, if any
+
+        Returns:
+            Lower bound in the units of ``distances``, or None if disabled
+        """
+        method = self.config.optimization.lower_bound
+        if method == 'auto':
+            method = 'held_karp' if self.config.optimization.target_gap > 0 else 'one_tree'
+        if method == 'none':
+            return None
+        if method == 'one_tree':
+            return self.one_tree_bound(distances, start, end)
+        if method == 'held_karp':
+            return self.held_karp_bound(distances, upper_bound, start, end)
+        raise ValueError(f"Unknown lower bound: {method}")
+
+    def one_tree_bound(self, distances: np.ndarray, start: Optional[int] = None,
+                       end: Optional[int] = None) -> float:
+        """
+        Length of the minimum 1-tree without node penalties.
+
+        Args:
+            distances: Distance matrix (n x n)
+            start: Fixed start, if any
+            end: Fixed end, if any
+
+        Returns:
+            Lower bound on the shortest open route
+        """
+        costs = self._symmetric(distances)
+        if costs.shape[0] <= 1:
+            return 0.0
+        bound, _ = self._one_tree(costs, np.zeros(costs.shape[0]), start, end)
+        return max(bound, 0.0)
+
+    def held_karp_bound(self, distances: np.ndarray, upper_bound: float,
+                        start: Optional[int] = None, end: Optional[int] = None) -> float:
+        """
+        Held-Karp bound by subgradient optimisation of node penalties.
+
+        Each iteration adds ``step * (degree - 2)`` to the penalties, with
+        the Polyak step ``scale * (upper_bound - bound) / |degree - 2|^2``.
+        The scale halves whenever the bound has not improved for a few
+        iterations. Every iterate is a valid bound; the best one is returned.
+
+        Args:
+            distances: Distance matrix (n x n)
+            upper_bound: Length of a known route
+            start: Fixed start, if any
+            end: Fixed end, if any
+
+        Returns:
+            Lower bound on the shortest open route
+        """
+        costs = self._symmetric(distances)
+        n = costs.shape[0]
+        if n <= 1:
+            return 0.0
+
+        penalties = np.zeros(n)
+        best = -np.inf
+        scale = 2.0
+        stall = 0
+        patience = max(5, self.config.optimization.lower_bound_iterations // 10)
+
+        for _ in range(self.config.optimization.lower_bound_iterations):
+            bound, degree = self._one_tree(costs, penalties, start, end)
+            if bound > best + 1e-9:
+                best = bound
+                stall = 0
+            else:
+                stall += 1
+                if stall >= patience:
+                    scale /= 2
+                    stall = 0
+
+            excess = degree - 2
+            norm = float((excess * excess).sum())
+            # A 1-tree with every degree 2 is a route: the bound is tight
+            if norm == 0 or bound >= upper_bound or scale < 1e-4:
+                break
+            penalties += scale * (upper_bound - bound) / norm * excess
+
+        return max(best, 0.0)
+
+    def _one_tree(self, costs: np.ndarray, penalties: np.ndarray,
+                  start: Optional[int], end: Optional[int]) -> Tuple[float, np.ndarray]:
+        """
+        Minimum 1-tree under node penalties.
+
+        Args:
+            costs: Symmetric distance matrix over the real points
+            penalties: Penalty per real point
+            start: Fixed start, if any
+            end: Fixed end, if any
+
+        Returns:
+            Tuple of (Lagrangian bound, degree of every real point)
+        """
+        if self.kernels is not None:
+            total, degree = self.kernels.minimum_spanning_tree(costs, penalties)
+            total = float(total)
+        else:
+            total, degree = self._spanning_tree(costs, penalties)
+
+        # The dummy reaches points at no cost; fixed endpoints are forced
+        forced = [p for p in (start, end) if p is not None]
+        dummy_edges = list(dict.fromkeys(forced))
+        if len(dummy_edges) < 2:
+            free = np.argsort(penalties, kind='stable')
+            dummy_edges += [int(p) for p in free if p not in dummy_edges][:2 - len(dummy_edges)]
+        for point in dummy_edges:
+            total += penalties[point]
+            degree[point] += 1
+
+        return float(total - 2 * penalties.sum()), degree
+
+    def _spanning_tree(self, costs: np.ndarray, penalties: np.ndarray) -> Tuple[float, np.ndarray]:
+        """
+        Minimum spanning tree under node penalties, by Prim's algorithm.
+
+        Penalised rows are formed one at a time rather than as a full matrix.
+
+        Args:
+            costs: Symmetric cost matrix
+            penalties: Penalty per point, added to both ends of every edge
+
+        Returns:
+            Tuple of (penalised tree length, degree of every point)
+        """
+        n = costs.shape[0]
+        # Prim's algorithm, one vectorised row update per added point
+        degree = np.zeros(n, dtype=np.int64)
+        in_tree = np.zeros(n, dtype=bool)
+        in_tree[0] = True
+        best = costs[0] + penalties[0] + penalties
+        best[0] = np.inf
+        parent = np.zeros(n, dtype=np.intp)
+        total = 0.0
+        for _ in range(n - 1):
+            point = int(np.argmin(best))
+            total += best[point]
+            degree[point] += 1
+            degree[parent[point]] += 1
+            in_tree[point] = True
+            best[point] = np.inf
+            row = costs[point] + penalties[point] + penalties
+            closer = (row < best) & ~in_tree
+            best[closer] = row[closer]
+            parent[closer] = point
+
+        return total, degree
+
+    def _symmetric(self, distances: np.ndarray) -> np.ndarray:
+        """
+        Symmetric matrix whose route lengths never exceed those of ``distances``.
+
+        Args:
+            distances: Distance matrix
+
+        Returns:
+            ``min(D, D.T)``
+        """
+        distances = np.asarray(distances, dtype=float)
+        return np.minimum(distances, distances.T)
@@ -5,13 +5,17 @@ Main route optimizer implementation.
 import pandas as pd
 import numpy as np
 import json
-from typing import Dict, List, Tuple, Any
+import time
+from typing import Dict, List, Optional, Tuple, Any, Union
 from pathlib import Path
 
 from ..config import Config
 from ..data.loader import DataLoader
 from ..utils.distance import DistanceCalculator
 from .tsp_solver import TSPSolver
+from .backends import create_backend
+from .checkpoint import CheckpointStore
+from .decomposition import DecompositionSolver
 from ..export.geojson_exporter import GeoJSONExporter
 
 
@@ -29,12 +33,19 @@ class RouteOptimizer:
         self.data_loader = DataLoader(self.config)
         self.distance_calculator = DistanceCalculator(self.config)
         self.tsp_solver = TSPSolver(self.config)
+        # Solves full districts; warm starts and updates use tsp_solver
+        self.solver_backend = create_backend(self.config)
         self.geojson_exporter = GeoJSONExporter(self.config)
+        # Per-district checkpoints of optimize_all_districts, if enabled
+        checkpoint_directory = self.config.data.checkpoint_directory
+        self.checkpoints = CheckpointStore(checkpoint_directory) if checkpoint_directory else None
         
         # Data storage
         self.poster_boards_df: pd.DataFrame = None
         self.voting_offices: Dict = None
         self.optimization_results: Dict = {}
+        # Previous visiting order per district as board numbers (warm start)
+        self.previous_routes: Dict[str, List[str]] = {}
     
     def load_data(self) -> Tuple[DataLoader, Dict]:
         """Load and preprocess data."""
@@ -44,10 +55,18 @@ class RouteOptimizer:
         print(f"Loaded {len(self.voting_offices)} voting offices")
         return self.data_loader, self.voting_offices
     
-    def optimize_all_districts(self) -> Dict[str, Any]:
+    def optimize_all_districts(self, resume: bool = False) -> Dict[str, Any]:
         """
         Optimize routes for all districts.
         
+        With ``DataConfig.checkpoint_directory`` set, every district's
+        matrices and route are checkpointed as soon as they are computed.
+        
+        Args:
+            resume: Reuse checkpoints of an earlier, interrupted run: solved
+                districts are skipped and stored matrices are not requested
+                again
+            
         Returns:
             Dictionary containing optimization results for all districts
         """
@@ -60,16 +79,43 @@ class RouteOptimizer:
         print(f"\\nOptimizing routes for {len(districts)} districts...")
         print("=" * 60)
         
+        resumed = self._resume_districts(districts) if resume else {}
+        pending = [name for name in districts if name not in resumed]
+        self._prefetch_road_distances(pending)
+        
+        batched = {}
+        if self.config.optimization.batch_max_points > 0:
+            batched = self._optimize_districts_batch(pending)
+        
+        # Share the time budget by size among districts that can use it
+        remaining_budget = self.config.optimization.time_budget
+        weights = self._budget_weights([name for name in pending if name not in batched])
+        remaining_weight = sum(weights.values())
+        
         for district_name in districts:
             print(f"\\n【{district_name}】Optimizing...")
             
             try:
-                district_result = self._optimize_district(district_name)
+                if district_name in resumed:
+                    district_result = resumed[district_name]
+                    print("  Resumed from checkpoint")
+                elif district_name in batched:
+                    district_result = batched[district_name]
+                else:
+                    weight = weights.get(district_name, 0)
+                    share = remaining_budget * weight / remaining_weight if weight else 0.0
+                    remaining_weight -= weight
+                    district_result = self._optimize_district(district_name, share, resume)
+                    remaining_budget = max(remaining_budget - district_result['solve_seconds'], 0.0)
                 results[district_name] = district_result
+                if district_name not in resumed:
+                    self._save_checkpoint(district_name, district_result['data'], result=district_result)
                 
                 print(f"  Optimization complete: {len(district_result['locations'])} points")
                 print(f"  Total distance: {district_result['distance']/1000:.2f}km")
                 print(f"  Estimated time: {district_result['duration']/3600:.1f}hours")
+                if district_result.get('optimality_gap') is not None:
+                    print(f"  Optimality gap: {district_result['optimality_gap']:.2%}")
                 
             except Exception as e:
                 print(f"  Error optimizing {district_name}: {e}")
@@ -115,16 +161,29 @@ class RouteOptimizer:
         print(f"\\nRe-optimizing {len(district_names)} specific districts...")
         print("=" * 60)
         
+        previous_results = self.optimization_results
+        
         for district_name in district_names:
             print(f"\\n【{district_name}】Re-optimizing...")
             
             try:
-                district_result = self._optimize_district(district_name)
+                district_result = None
+                previous = previous_results.get(district_name)
+                if not previous or previous.get('preserved'):
+                    # A fresh run: the last solve of the district is checkpointed
+                    previous = self._load_previous_result(district_name)
+                if previous:
+                    district_result = self._update_district(district_name, previous)
+                if district_result is None:
+                    district_result = self._optimize_district(district_name)
                 results[district_name] = district_result
+                self._save_checkpoint(district_name, district_result['data'], result=district_result)
                 
                 print(f"  Optimization complete: {len(district_result['locations'])} points")
                 print(f"  Total distance: {district_result['distance']/1000:.2f}km")
                 print(f"  Estimated time: {district_result['duration']/3600:.1f}hours")
+                if district_result.get('optimality_gap') is not None:
+                    print(f"  Optimality gap: {district_result['optimality_gap']:.2%}")
                 
             except Exception as e:
                 print(f"  Error optimizing {district_name}: {e}")
@@ -133,12 +192,64 @@ class RouteOptimizer:
         self.optimization_results = results
         return results
     
-    def _optimize_district(self, district_name: str) -> Dict[str, Any]:
+    def _prefetch_road_distances(self, district_names: List[str]) -> None:
+        """
+        Fetch the road distances of several districts in one concurrent pass.
+        
+        The matrices land in the road distance cache, so the district
+        passes that follow read them without waiting on the API. Districts
+        left to the decomposition solver are not prefetched, as they never
+        build a full matrix.
+        
+        Args:
+            district_names: Districts about to be optimized
+        """
+        if not self.config.api.api_key or not self.config.data.road_cache:
+            return
+        
+        threshold = self.config.optimization.decomposition_min_points
+        location_lists = []
+        for district_name in district_names:
+            district_data = self.data_loader.get_district_data(district_name)
+            if len(district_data) <= 1 or 0 < threshold < len(district_data):
+                continue
+            location_lists.append(list(zip(district_data['経度'], district_data['緯度'])))
+        
+        try:
+            self.distance_calculator.prefetch_road_distances(location_lists)
+        except Exception as e:
+            print(f"Road distance prefetch failed, continuing per district: {e}")
+    
+    def _budget_weights(self, district_names: List[str]) -> Dict[str, int]:
+        """
+        Weight districts for sharing the global time budget.
+        
+        Districts small enough for the exact solver never use extra time, so
+        only larger ones get a share, in proportion to their board count.
+        
+        Args:
+            district_names: Names of the districts to weight
+            
+        Returns:
+            Weight per district name (0 for districts that need no budget)
+        """
+        if self.config.optimization.time_budget <= 0:
+            return {}
+        weights = {}
+        for district_name in district_names:
+            size = len(self.data_loader.get_district_data(district_name))
+            weights[district_name] = size if size > self.config.optimization.exact_max_points else 0
+        return weights
+    
+    def _optimize_district(self, district_name: str, time_budget: float = 0.0,
+                           resume: bool = False) -> Dict[str, Any]:
         """
         Optimize route for a single district.
         
         Args:
             district_name: Name of the district to optimize
+            time_budget: Seconds the solver may spend on this district
+            resume: Reuse checkpointed matrices of the district
             
         Returns:
             Dictionary containing optimization results
@@ -158,7 +269,11 @@ class RouteOptimizer:
                 'duration': 0,  # No duration for single location
                 'locations': [district_data.iloc[0]],
                 'distance_matrix': [[0]],
-                'duration_matrix': [[0]]
+                'duration_matrix': [[0]],
+                'lower_bound': 0,
+                'optimality_gap': 0.0,
+                'strategy': 'trivial',
+                'solve_seconds': 0.0
             }
         
         # Prepare coordinates (lon, lat format)
@@ -167,34 +282,475 @@ class RouteOptimizer:
             for _, row in district_data.iterrows()
         ]
         
-        # Calculate distance matrix
-        distance_matrix, duration_matrix = self.distance_calculator.calculate_matrix(
-            locations, use_api=bool(self.config.api.api_key)
+        # Very large districts never build the full matrix
+        threshold = self.config.optimization.decomposition_min_points
+        if 0 < threshold < len(district_data):
+            return self._optimize_district_decomposed(district_data, locations)
+        
+        # Calculate distance matrix, unless an interrupted run already did
+        checkpoint = self._load_checkpoint(district_name, district_data) if resume else None
+        if checkpoint is not None and checkpoint['distance_matrix'] is not None:
+            print("  Distance matrix loaded from checkpoint")
+            distance_matrix = checkpoint['distance_matrix']
+            duration_matrix = checkpoint['duration_matrix']
+        else:
+            distance_matrix, duration_matrix = self.distance_calculator.calculate_matrix(
+                locations, use_api=bool(self.config.api.api_key)
+            )
+            self._save_checkpoint(
+                district_name, district_data, matrices=(distance_matrix, duration_matrix)
+            )
+        
+        # Solve TSP, warm-starting from the previous route when available
+        warm_route = self._warm_start_route(district_name, district_data)
+        if warm_route is not None:
+            started = time.perf_counter()
+            optimized_route, optimized_distance = self.tsp_solver.improve_route(
+                distance_matrix, warm_route
+            )
+            return self._district_result(
+                district_data, optimized_route, optimized_distance,
+                distance_matrix, duration_matrix, warm_started=True,
+                strategy='warm_start', solve_seconds=time.perf_counter() - started
+            )
+        
+        optimized_route, optimized_distance = self._solve_route(
+            distance_matrix, locations, time_budget
+        )
+        return self._district_result(
+            district_data, optimized_route, optimized_distance,
+            distance_matrix, duration_matrix, stats=self.solver_backend.stats
         )
+    
+    def _optimize_district_decomposed(self, district_data: pd.DataFrame,
+                                      locations: List[Tuple[float, float]]) -> Dict[str, Any]:
+        """
+        Optimize a very large district with the spatial decomposition solver.
         
-        # Solve TSP
-        optimized_route, optimized_distance = self.tsp_solver.solve_with_optimal_start(
-            distance_matrix
+        Only part- and window-sized matrices are computed, so the result
+        carries no distance or duration matrices (and is always re-solved
+        rather than updated incrementally).
+        
+        Args:
+            district_data: DataFrame containing the district's boards
+            locations: List of (lon, lat) coordinates
+            
+        Returns:
+            Dictionary containing optimization results
+        """
+        use_api = bool(self.config.api.api_key)
+        
+        def matrix_function(indices):
+            return self.distance_calculator.calculate_matrix(
+                [locations[i] for i in indices], use_api=use_api
+            )
+        
+        started = time.perf_counter()
+        route, distance, duration = DecompositionSolver(self.config).solve(
+            locations, matrix_function
         )
         
+        return {
+            'data': district_data,
+            'route': route,
+            'distance': distance,
+            'duration': duration,
+            'locations': [district_data.iloc[i] for i in route],
+            'warm_started': False,
+            'decomposed': True,
+            'lower_bound': None,
+            'optimality_gap': None,
+            'strategy': 'decomposition',
+            'solve_seconds': time.perf_counter() - started
+        }
+    
+    def _optimize_districts_batch(self, district_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Optimize all small districts together in one batched solve.
+        
+        Districts with 2 to ``OptimizationConfig.batch_max_points`` boards
+        and no previous route are solved by ``TSPSolver.solve_batch``, which
+        handles them all in a single vectorised pass. Other districts, and
+        any whose distance matrix fails, are left to ``_optimize_district``.
+        
+        Args:
+            district_names: Names of the districts to consider
+            
+        Returns:
+            Results of the batched districts, keyed by district name
+        """
+        limit = self.config.optimization.batch_max_points
+        prepared = []
+        for district_name in district_names:
+            try:
+                district_data = self.data_loader.get_district_data(district_name)
+                if not 2 <= len(district_data) <= limit:
+                    continue
+                if self._warm_start_route(district_name, district_data) is not None:
+                    continue
+                locations = [
+                    (row['経度'], row['緯度'])
+                    for _, row in district_data.iterrows()
+                ]
+                distance_matrix, duration_matrix = self.distance_calculator.calculate_matrix(
+                    locations, use_api=bool(self.config.api.api_key)
+                )
+                prepared.append((district_name, district_data, distance_matrix, duration_matrix))
+            except Exception as e:
+                print(f"  Could not prepare {district_name} for batch solving: {e}")
+        
+        if not prepared:
+            return {}
+        
+        print(f"\\nSolving {len(prepared)} small districts in one batch...")
+        started = time.perf_counter()
+        solutions = self.tsp_solver.solve_batch([item[2] for item in prepared])
+        # The batch runs as one solve; each district is charged an equal share
+        seconds = (time.perf_counter() - started) / len(prepared)
+        stats = self.tsp_solver.stats
+        
+        results = {}
+        for k, (district_name, district_data, distance_matrix, duration_matrix) in enumerate(prepared):
+            route, distance = solutions[k]
+            results[district_name] = self._district_result(
+                district_data, route, distance, distance_matrix, duration_matrix,
+                lower_bound=stats['lower_bounds'][k],
+                optimality_gap=stats['optimality_gaps'][k],
+                strategy='batch', solve_seconds=seconds
+            )
+        return results
+    
+    def _district_result(self, district_data: pd.DataFrame, route: List[int], distance: float,
+                         distance_matrix: np.ndarray, duration_matrix: np.ndarray,
+                         warm_started: bool = False, lower_bound: Optional[float] = None,
+                         optimality_gap: Optional[float] = None, strategy: Optional[str] = None,
+                         solve_seconds: Optional[float] = None,
+                         stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Assemble the result dictionary of a solved district.
+        
+        Args:
+            district_data: District data in matrix order
+            route: Visiting order as indices into ``district_data``
+            distance: Route length
+            distance_matrix: Distance matrix between district locations
+            duration_matrix: Duration matrix between district locations
+            warm_started: Whether the route was seeded from a previous one
+            lower_bound: Lower bound on the route length. If None, taken
+                from the solver's statistics together with the gap.
+            optimality_gap: Gap between the route and the lower bound
+            strategy: Solver strategy that produced the route. If None,
+                taken from the solver's statistics together with its time.
+            solve_seconds: Time spent solving
+            stats: Statistics of the solve that produced the route;
+                defaults to those of ``tsp_solver``
+            
+        Returns:
+            Dictionary containing optimization results
+        """
+        if stats is None:
+            stats = self.tsp_solver.stats
+        if lower_bound is None:
+            lower_bound = stats.get('lower_bound')
+            optimality_gap = stats.get('optimality_gap')
+        if strategy is None:
+            strategy = stats.get('strategy')
+            solve_seconds = stats.get('seconds')
+        
         # Calculate total duration
         total_duration = sum(
-            duration_matrix[optimized_route[i]][optimized_route[i+1]]
-            for i in range(len(optimized_route) - 1)
+            duration_matrix[route[i]][route[i+1]]
+            for i in range(len(route) - 1)
         )
         
         # Prepare result (no route segments needed for points-only system)
-        result = {
+        return {
             'data': district_data,
-            'route': optimized_route,
-            'distance': optimized_distance,
+            'route': route,
+            'distance': distance,
             'duration': total_duration,
-            'locations': [district_data.iloc[i] for i in optimized_route],
-            'distance_matrix': distance_matrix.tolist(),
-            'duration_matrix': duration_matrix.tolist()
+            'locations': [district_data.iloc[i] for i in route],
+            'distance_matrix': np.asarray(distance_matrix).tolist(),
+            'duration_matrix': np.asarray(duration_matrix).tolist(),
+            'warm_started': warm_started,
+            'lower_bound': lower_bound,
+            'optimality_gap': optimality_gap,
+            'strategy': strategy,
+            'solve_seconds': solve_seconds
         }
+    
+    def _resume_districts(self, district_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Restore the results of districts solved by an earlier run.
         
-        return result
+        Args:
+            district_names: Names of the districts to look up
+            
+        Returns:
+            Results of the districts with a matching, finished checkpoint
+        """
+        if self.checkpoints is None:
+            print("No checkpoint directory configured; nothing to resume")
+            return {}
+        
+        resumed = {}
+        for district_name in district_names:
+            district_data = self.data_loader.get_district_data(district_name)
+            checkpoint = self._load_checkpoint(district_name, district_data)
+            if checkpoint is None or checkpoint['result'] is None:
+                continue
+            
+            result = dict(checkpoint['result'])
+            result['data'] = district_data
+            result['locations'] = [district_data.iloc[i] for i in result['route']]
+            if checkpoint['distance_matrix'] is not None:
+                result['distance_matrix'] = checkpoint['distance_matrix'].tolist()
+                result['duration_matrix'] = checkpoint['duration_matrix'].tolist()
+            resumed[district_name] = result
+        
+        print(f"Resuming {len(resumed)} of {len(district_names)} districts from checkpoints")
+        return resumed
+    
+    def _load_checkpoint(self, district_name: str, district_data: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Load a district's checkpoint if it matches the current data.
+        
+        Args:
+            district_name: Name of the district
+            district_data: Current district data
+            
+        Returns:
+            Checkpoint dictionary (see ``CheckpointStore.load``), or None
+        """
+        if self.checkpoints is None:
+            return None
+        return self.checkpoints.load(district_name, district_data, self.config)
+    
+    def _load_previous_result(self, district_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a district's last solved route and matrices from its checkpoint.
+        
+        Unlike ``_load_checkpoint``, the district's boards may have changed
+        since; only the settings must match.
+        
+        Args:
+            district_name: Name of the district
+            
+        Returns:
+            Previous result for ``_update_district``, or None
+        """
+        if self.checkpoints is None:
+            return None
+        return self.checkpoints.load_previous(district_name, self.config)
+    
+    def _save_checkpoint(self, district_name: str, district_data: pd.DataFrame,
+                         matrices: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+                         result: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Checkpoint a district's matrices and, once solved, its result.
+        
+        Failures are reported but never abort the run.
+        
+        Args:
+            district_name: Name of the district
+            district_data: District data in matrix order
+            matrices: (distance_matrix, duration_matrix), if computed
+            result: District result; its matrices are stored with it
+        """
+        if self.checkpoints is None:
+            return
+        if result is not None and matrices is None and 'distance_matrix' in result:
+            matrices = (result['distance_matrix'], result['duration_matrix'])
+        try:
+            self.checkpoints.save(district_name, district_data, self.config, matrices, result)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"  Could not checkpoint {district_name}: {e}")
+    
+    def _update_district(self, district_name: str, previous: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Update a previous district result for added, removed or moved boards.
+        
+        Boards still present at the same place keep their matrix entries;
+        only the rows and columns of added and moved boards are computed.
+        Those boards are then inserted into the previous route at their
+        cheapest positions, followed by a local repair instead of a full
+        re-solve.
+        
+        Args:
+            district_name: Name of the district
+            previous: Result of an earlier optimization of the district
+            
+        Returns:
+            Updated result, or None if the district needs a full solve
+            (no board numbers, or fewer than two unchanged boards left)
+        """
+        district_data = self.data_loader.get_district_data(district_name)
+        old_data = previous.get('data')
+        if (old_data is None or 'distance_matrix' not in previous
+                or '掲示板番号' not in district_data.columns
+                or '掲示板番号' not in old_data.columns):
+            return None
+        
+        old_boards = [str(board) for board in old_data['掲示板番号']]
+        current = {str(board): idx for idx, board in enumerate(district_data['掲示板番号'])}
+        if len(current) != len(district_data) or len(set(old_boards)) != len(old_boards):
+            return None
+        
+        kept = [idx for idx, board in enumerate(old_boards) if board in current]
+        # Positions in ``kept`` of boards whose coordinates were corrected
+        moved = []
+        for position, idx in enumerate(kept):
+            old_row = old_data.iloc[idx]
+            new_row = district_data.iloc[current[old_boards[idx]]]
+            if (old_row['経度'], old_row['緯度']) != (new_row['経度'], new_row['緯度']):
+                moved.append(position)
+        if len(kept) - len(moved) < 2:
+            return None
+        
+        # Kept boards first (previous order), then the added ones
+        old_board_set = set(old_boards)
+        added = [board for board in current if board not in old_board_set]
+        order = [current[old_boards[idx]] for idx in kept] + [current[board] for board in added]
+        district_data = district_data.iloc[order].reset_index(drop=True)
+        
+        locations = [
+            (row['経度'], row['緯度'])
+            for _, row in district_data.iterrows()
+        ]
+        distance_matrix, duration_matrix = self.distance_calculator.update_matrix(
+            locations,
+            np.asarray(previous['distance_matrix'])[np.ix_(kept, kept)],
+            np.asarray(previous['duration_matrix'])[np.ix_(kept, kept)],
+            changed=moved,
+            use_api=bool(self.config.api.api_key)
+        )
+        
+        # Moved boards leave the route and are inserted again like added ones
+        new_index = {old: new for new, old in enumerate(kept)}
+        moved_set = set(moved)
+        route = [
+            new_index[idx] for idx in previous['route']
+            if idx in new_index and new_index[idx] not in moved_set
+        ]
+        print(f"  Incremental update: {len(added)} added, {len(moved)} moved, "
+              f"{len(old_boards) - len(kept)} removed boards")
+        started = time.perf_counter()
+        optimized_route, optimized_distance = self.tsp_solver.insert_points(
+            distance_matrix, route, moved + list(range(len(kept), len(district_data)))
+        )
+        solve_seconds = time.perf_counter() - started
+        
+        return self._district_result(
+            district_data, optimized_route, optimized_distance,
+            distance_matrix, duration_matrix, warm_started=True,
+            strategy='incremental', solve_seconds=solve_seconds
+        )
+    
+    def load_previous_routes(self, source: Union[str, Path, Dict[str, Any], None] = None) -> Dict[str, List[str]]:
+        """
+        Load previous visiting orders to warm-start re-optimization.
+        
+        Args:
+            source: Path to a previously exported GeoJSON file, or a results
+                dictionary from an earlier optimization run. If None, uses
+                the configured output file.
+            
+        Returns:
+            Dictionary mapping district name to board numbers in visiting order
+        """
+        routes: Dict[str, List[str]] = {}
+        
+        if isinstance(source, dict):
+            for district, result in source.items():
+                if 'locations' in result:
+                    routes[district] = [
+                        str(location.get('掲示板番号', '')) for location in result['locations']
+                    ]
+        else:
+            if source is None:
+                source = Path(self.config.data.output_directory) / self.config.data.output_filename
+            path = Path(source)
+            if not path.exists():
+                print(f"No previous routes found at {path}")
+                return {}
+            
+            with open(path, 'r', encoding='utf-8') as f:
+                geojson = json.load(f)
+            
+            ordered: Dict[str, List[Tuple[int, str]]] = {}
+            for feature in geojson.get('features', []):
+                props = feature.get('properties', {})
+                # Done boards are exported with order 0 and are not part of a route
+                if props.get('order', 0) <= 0 or not props.get('district'):
+                    continue
+                ordered.setdefault(props['district'], []).append(
+                    (props['order'], str(props.get('board_number', '')))
+                )
+            for district, entries in ordered.items():
+                routes[district] = [board for _, board in sorted(entries)]
+        
+        self.previous_routes = routes
+        print(f"Loaded previous routes for {len(routes)} districts")
+        return routes
+    
+    def _warm_start_route(self, district_name: str, district_data: pd.DataFrame) -> Optional[List[int]]:
+        """
+        Map the previous route of a district onto its current data.
+        
+        Boards that are no longer in the data (e.g. now done) are dropped.
+        Boards that were not on the previous route are appended at the end.
+        
+        Args:
+            district_name: Name of the district
+            district_data: Current district data
+            
+        Returns:
+            Seed route as row indices of district_data, or None if the
+            district has no usable previous route
+        """
+        previous = self.previous_routes.get(district_name)
+        if not previous or '掲示板番号' not in district_data.columns:
+            return None
+        
+        index_by_board = {
+            str(board): idx for idx, board in enumerate(district_data['掲示板番号'])
+        }
+        if len(index_by_board) != len(district_data):
+            return None  # board numbers are not unique; cannot map reliably
+        
+        route = [index_by_board[board] for board in previous if board in index_by_board]
+        if not route:
+            return None
+        
+        # Guard against repeated board numbers in the previous route
+        route = list(dict.fromkeys(route))
+        visited = set(route)
+        route.extend(idx for idx in range(len(district_data)) if idx not in visited)
+        
+        print(f"  Warm start: {len(route) - len(visited)} new, "
+              f"{len(previous) - len(visited)} dropped boards")
+        return route
+    
+    def _solve_route(self, distance_matrix: np.ndarray, locations: List[Tuple[float, float]],
+                     time_budget: float = 0.0) -> Tuple[List[int], float]:
+        """
+        Solve the open walking route for a distance matrix.
+        
+        The configured solver backend picks its strategy from the district
+        size and budget.
+        
+        Args:
+            distance_matrix: Distance matrix between district locations
+            locations: List of (lon, lat) coordinates
+            time_budget: Seconds the solver may spend
+            
+        Returns:
+            Tuple of (route, total_distance)
+        """
+        return self.solver_backend.solve(
+            distance_matrix, time_budget=time_budget,
+            coordinates=np.array(locations, dtype=float)
+        )
     
     def optimize_district(self, district_data: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -218,7 +774,11 @@ class RouteOptimizer:
                 'duration': 0,  # No duration for single location
                 'locations': [district_data.iloc[0]],
                 'distance_matrix': [[0]],
-                'duration_matrix': [[0]]
+                'duration_matrix': [[0]],
+                'lower_bound': 0,
+                'optimality_gap': 0.0,
+                'strategy': 'trivial',
+                'solve_seconds': 0.0
             }
         
         # Prepare coordinates (lon, lat format)
@@ -233,9 +793,7 @@ class RouteOptimizer:
         )
         
         # Solve TSP
-        optimized_route, optimized_distance = self.tsp_solver.solve_with_optimal_start(
-            distance_matrix
-        )
+        optimized_route, optimized_distance = self._solve_route(distance_matrix, locations)
         
         # Calculate total duration
         total_duration = sum(
@@ -251,7 +809,11 @@ class RouteOptimizer:
             'duration': total_duration,
             'locations': [district_data.iloc[i] for i in optimized_route],
             'distance_matrix': distance_matrix.tolist(),
-            'duration_matrix': duration_matrix.tolist()
+            'duration_matrix': duration_matrix.tolist(),
+            'lower_bound': self.solver_backend.stats.get('lower_bound'),
+            'optimality_gap': self.solver_backend.stats.get('optimality_gap'),
+            'strategy': self.solver_backend.stats.get('strategy'),
+            'solve_seconds': self.solver_backend.stats.get('seconds')
         }
         
         return result
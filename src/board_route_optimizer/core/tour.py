@@ -0,0 +1,210 @@
+"""
+Array-based tour representation used by the local search operators.
+"""
+
+import numpy as np
+from collections import deque
+from typing import List, Optional, Sequence
+
+
+class Tour:
+    """
+    Cyclic tour stored as an order array plus a position index.
+
+    Operators address points rather than positions: ``order[k]`` is the point
+    visited k-th and ``position[point]`` is its index in ``order``. Segment
+    reversals flip whichever side of the cycle is shorter, so the orientation
+    of the tour may change after a move; always re-read ``succ``/``pred``.
+
+    Don't-look bits track which points still need to be examined. A point
+    goes to sleep when it is taken off the queue and is woken again only
+    when an edge next to it changes.
+    """
+
+    def __init__(self, order: Sequence[int], active: Optional[Sequence[int]] = None):
+        """
+        Initialize tour.
+
+        Args:
+            order: Visiting order containing every point exactly once
+            active: Points to examine first. If None, every point is awake.
+        """
+        self.order = np.array(order, dtype=np.intp)
+        self.n = len(self.order)
+        self.position = np.empty(self.n, dtype=np.intp)
+        self.position[self.order] = np.arange(self.n)
+
+        self.dont_look = np.ones(self.n, dtype=bool)
+        self._active = deque()
+        self.wake(*(self.order.tolist() if active is None else active))
+
+    def succ(self, point: int) -> int:
+        """Point visited after ``point``."""
+        idx = self.position[point] + 1
+        return int(self.order[idx if idx < self.n else 0])
+
+    def pred(self, point: int) -> int:
+        """Point visited before ``point``."""
+        return int(self.order[self.position[point] - 1])
+
+    def between(self, a: int, b: int, c: int) -> bool:
+        """
+        Check whether ``b`` lies on the forward path from ``a`` to ``c``.
+
+        Args:
+            a: Path start
+            b: Point to test
+            c: Path end
+
+        Returns:
+            True if b is reached when walking forward from a before passing c
+        """
+        pa, pb, pc = self.position[a], self.position[b], self.position[c]
+        if pa <= pc:
+            return pa <= pb <= pc
+        return pb >= pa or pb <= pc
+
+    def reverse(self, a: int, b: int) -> None:
+        """
+        Reverse the forward path from ``a`` to ``b``.
+
+        The complementary path is reversed instead when it is shorter, which
+        yields the same cycle with the opposite orientation.
+
+        Args:
+            a: First point of the path to reverse
+            b: Last point of the path to reverse
+        """
+        i = int(self.position[a])
+        j = int(self.position[b])
+        length = (j - i) % self.n + 1
+
+        if 2 * length > self.n:
+            # Reverse the complement: from succ(b) forward to pred(a)
+            i, j = (j + 1) % self.n, (i - 1) % self.n
+            length = self.n - length
+        if length < 2:
+            return
+
+        if i <= j:
+            segment = self.order[i:j + 1]
+            segment[:] = segment[::-1]
+            self.position[segment] = np.arange(i, j + 1)
+        else:
+            idx = np.arange(i, i + length) % self.n
+            self.order[idx] = self.order[idx[::-1]]
+            self.position[self.order[idx]] = idx
+
+    def two_opt_move(self, a: int, b: int, c: int, d: int) -> None:
+        """
+        Replace edges (a, b) and (c, d) with (a, c) and (b, d).
+
+        The move is given in either orientation: b is the successor of a and
+        d the successor of c, or b the predecessor of a and d of c.
+
+        Args:
+            a: Endpoint of the first removed edge
+            b: Neighbour of a
+            c: Endpoint of the second removed edge
+            d: Neighbour of c
+        """
+        if self.succ(a) == b:
+            self.reverse(b, c)
+        else:
+            self.reverse(a, d)
+
+    def move_segment(self, first: int, last: int, a: int, b: int,
+                     reverse: bool = False) -> None:
+        """
+        Move the forward path ``first``..``last`` between adjacent points.
+
+        Afterwards ``a`` is adjacent to ``first`` and ``b`` to ``last``, or
+        the other way round when ``reverse`` is set.
+
+        Args:
+            first: First point of the segment
+            last: Last point of the segment
+            a: Point next to the insertion edge, outside the segment
+            b: Neighbour of a, outside the segment
+            reverse: Insert the segment reversed
+        """
+        offset = int(self.position[first])
+        length = (int(self.position[last]) - offset) % self.n + 1
+        sequence = np.roll(self.order, -offset)
+        segment, rest = sequence[:length], sequence[length:]
+
+        ia = (int(self.position[a]) - offset) % self.n - length
+        ib = (int(self.position[b]) - offset) % self.n - length
+        if ib == ia + 1:
+            # rest reads a, b: a must touch the head of the inserted piece
+            cut = ib
+            piece = segment[::-1] if reverse else segment
+        else:
+            # rest reads b, a: a must touch the tail of the inserted piece
+            cut = ia
+            piece = segment if reverse else segment[::-1]
+
+        self.order = np.concatenate((rest[:cut], piece, rest[cut:]))
+        self.position[self.order] = np.arange(self.n)
+
+    def length(self, distances: np.ndarray) -> float:
+        """
+        Total length of the closed tour.
+
+        Args:
+            distances: Distance matrix
+
+        Returns:
+            Sum of all edge lengths including the closing edge
+        """
+        return float(distances[self.order, np.roll(self.order, -1)].sum())
+
+    def path_after(self, point: int) -> List[int]:
+        """
+        Open the cycle at ``point`` and return the remaining points in order.
+
+        Args:
+            point: Point to cut out of the cycle (typically a dummy node)
+
+        Returns:
+            Points visited after ``point`` in the current orientation
+        """
+        idx = int(self.position[point])
+        return np.concatenate((self.order[idx + 1:], self.order[:idx])).tolist()
+
+    def wake(self, *points: int) -> None:
+        """Clear the don't-look bits of ``points`` and queue them."""
+        for point in points:
+            if self.dont_look[point]:
+                self.dont_look[point] = False
+                self._active.append(point)
+
+    def queued_points(self) -> List[int]:
+        """Points waiting in the don't-look queue, in queue order."""
+        return list(self._active)
+
+    def set_queue(self, points: Sequence[int]) -> None:
+        """
+        Replace the don't-look queue, e.g. after a compiled kernel ran.
+
+        Args:
+            points: Awake points in queue order; their bits must be clear
+        """
+        self._active = deque(points)
+
+    def next_active(self) -> Optional[int]:
+        """
+        Pop the next point whose don't-look bit is clear.
+
+        The point is put back to sleep as it is returned; operators wake it
+        again (together with the other endpoints) when they apply a move.
+
+        Returns:
+            Point index, or None once every point is asleep
+        """
+        while self._active:
+            point = self._active.popleft()
+            if not self.dont_look[point]:
+                self.dont_look[point] = True
+                return point
+        return None
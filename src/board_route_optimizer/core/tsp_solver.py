@@ -2,13 +2,133 @@
 Traveling Salesman Problem (TSP) solver implementation.
 """
 
+import itertools
+import os
+import time
 import numpy as np
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
 from ..config import Config
+from . import kernels
+from .lower_bound import LowerBoundCalculator
+from .tour import Tour
+
+
+# Per-process state of multi-start workers, set up once by _init_start_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_start_worker(config: Config, arrays: Dict[str, Tuple[str, tuple, str]]) -> None:
+    """
+    Attach a process pool worker to the shared solver inputs.
+    
+    Args:
+        config: Configuration object
+        arrays: Mapping of array name to (shared memory name, shape, dtype)
+    """
+    _worker_state['solver'] = TSPSolver(config)
+    _worker_state['memory'] = []
+    for key, (name, shape, dtype) in arrays.items():
+        memory = shared_memory.SharedMemory(name=name)
+        _worker_state['memory'].append(memory)
+        _worker_state[key] = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+def _solve_start_chunk(starts: List[int]) -> List[Tuple[int, List[int], float]]:
+    """
+    Solve a chunk of start points inside a process pool worker.
+    
+    Args:
+        starts: Start point indices
+        
+    Returns:
+        List of (start_idx, route, total_distance)
+    """
+    solver = _worker_state['solver']
+    results = []
+    for start_idx in starts:
+        route, distance = solver._solve_from_start(
+            start_idx, _worker_state['distances'],
+            _worker_state['search_distances'], _worker_state['candidates']
+        )
+        results.append((start_idx, route, distance))
+    return results
+
+
+class _OnDemandDistances:
+    """
+    Closed search distances of ``TSPSolver._path_tour``, entry by entry.
+    
+    Indexing with ``[a, b]`` gives the symmetrised distance, with the
+    dummy node n free to reach except for the bonus edges of fixed
+    endpoints, without building the (n + 1) x (n + 1) matrix.
+    """
+    
+    def __init__(self, distances: np.ndarray, start: Optional[int], end: Optional[int],
+                 bonus: float):
+        """
+        Initialize on-demand distances.
+        
+        Args:
+            distances: Original (possibly asymmetric) distance matrix
+            start: Fixed start, if any
+            end: Fixed end, if any
+            bonus: Cost of the dummy edge of a fixed endpoint
+        """
+        self.distances = distances
+        self.n = distances.shape[0]
+        self.fixed = {point for point in (start, end) if point is not None}
+        self.bonus = bonus
+    
+    def __getitem__(self, index: Tuple[int, int]) -> float:
+        a, b = index
+        if a == self.n or b == self.n:
+            other = b if a == self.n else a
+            return self.bonus if other in self.fixed else 0.0
+        return 0.5 * (float(self.distances[a, b]) + float(self.distances[b, a]))
+    
+    def row(self, a: int) -> np.ndarray:
+        """Symmetrised distances from ``a`` to every real point."""
+        return 0.5 * (self.distances[a, :] + self.distances[:, a])
+
+
+class _OnDemandNeighbours:
+    """
+    Candidate lists of ``TSPSolver._path_tour``, built per point when first read.
+    
+    Each list is the dummy node followed by the k nearest points, ordered
+    like ``TSPSolver._candidate_lists``; only points the local search
+    actually examines pay the O(n) row scan.
+    """
+    
+    def __init__(self, distances: _OnDemandDistances, k: int):
+        """
+        Initialize on-demand candidate lists.
+        
+        Args:
+            distances: On-demand closed distances
+            k: Number of neighbours per point
+        """
+        self.distances = distances
+        self.k = max(0, min(k, distances.n - 1))
+        self._rows: Dict[int, List[int]] = {}
+    
+    def __getitem__(self, a: int) -> List[int]:
+        n = self.distances.n
+        if a == n:
+            return []
+        if a not in self._rows:
+            row = self.distances.row(a)
+            row[a] = np.inf
+            nearest = np.argpartition(row, self.k - 1)[:self.k] if 0 < self.k < n - 1 else np.arange(n)
+            nearest = nearest[np.argsort(row[nearest], kind='stable')][:self.k]
+            self._rows[a] = [n] + nearest.tolist()
+        return self._rows[a]
 
 
 class TSPSolver:
-    """Solves TSP using nearest neighbor heuristic with 2-opt improvement."""
+    """Solves TSP using nearest neighbor heuristic with 2-opt and Or-opt improvement."""
     
     def __init__(self, config: Config):
         """
@@ -18,6 +138,251 @@ class TSPSolver:
             config: Configuration object
         """
         self.config = config
+        self.lower_bound = LowerBoundCalculator(config)
+        # Compiled hot loops, or None to use the NumPy/Tour implementations
+        self.kernels = kernels if kernels.NUMBA_AVAILABLE and config.optimization.use_numba else None
+        self._neighbour_cache: Optional[Tuple[List[List[int]], np.ndarray]] = None
+        # Statistics of the most recent public solve call
+        self.stats: Dict[str, Any] = {}
+    
+    def solve(self, distances: np.ndarray, coordinates: Optional[np.ndarray] = None,
+              time_budget: float = 0.0) -> Tuple[List[int], float]:
+        """
+        Solve an open route with the strategy that suits the instance.
+        
+        The portfolio, cheapest first:
+        
+        - "trivial": up to 3 points, every order is checked directly
+        - "exact": up to ``exact_max_points``, Held-Karp
+        - "local_search": construction and local search, as a single open
+          path solve or over every start (``OptimizationConfig.open_path``)
+        - "metaheuristic": from ``metaheuristic_min_points``, local search
+          followed by iterated local search for whatever is left of
+          ``time_budget``, unless the route is already within the target
+          gap of the lower bound
+        
+        The chosen strategy and its run time are recorded in
+        ``self.stats['strategy']`` and ``self.stats['seconds']``.
+        
+        Args:
+            distances: Distance matrix (n x n)
+            coordinates: Point coordinates (n x 2), used by the
+                space-filling curve construction
+            time_budget: Seconds this instance may use in total
+            
+        Returns:
+            Tuple of (route, total_distance)
+        """
+        started = time.perf_counter()
+        n = distances.shape[0]
+        
+        if n <= 3:
+            strategy = 'trivial'
+            route, distance = min(
+                ((list(order), self._calculate_route_distance(list(order), distances))
+                 for order in itertools.permutations(range(n))),
+                key=lambda item: item[1]
+            )
+            self.stats = {'lower_bound': distance, 'optimality_gap': 0.0}
+        elif self._use_exact(n):
+            strategy = 'exact'
+            self.stats = {}
+            print(f"  Solving {n} points exactly...")
+            route, distance = self._held_karp_path(distances)
+        else:
+            strategy = 'local_search'
+            if self.config.optimization.open_path:
+                route, distance = self.solve_open_path(distances, coordinates=coordinates)
+            else:
+                route, distance = self.solve_with_optimal_start(distances)
+            
+            remaining = time_budget - (time.perf_counter() - started)
+            bound = self._record_gap(distance, distances)
+            if remaining > 0 and self._use_metaheuristic(n) and not self._gap_reached(distance, bound):
+                strategy = 'metaheuristic'
+                search_distances = self._search_matrix(distances)
+                route, distance = self._iterated_local_search(
+                    route, distances, search_distances, self._candidate_lists(search_distances),
+                    bound=bound, time_budget=remaining
+                )
+                self._record_gap(distance, distances)
+        
+        self.stats['strategy'] = strategy
+        self.stats['seconds'] = time.perf_counter() - started
+        print(f"  Strategy: {strategy} ({self.stats['seconds']:.2f}s)")
+        return route, distance
+    
+    def solve_open_path(self, distances: np.ndarray, start: Optional[int] = None,
+                        end: Optional[int] = None,
+                        coordinates: Optional[np.ndarray] = None) -> Tuple[List[int], float]:
+        """
+        Solve the open-path TSP in a single run.
+        
+        The path is closed through a zero-cost dummy node and the resulting
+        tour is cut there, so the best start point falls out of one solve
+        instead of one solve per candidate start.
+        
+        Args:
+            distances: Distance matrix (n x n)
+            start: Point the route must start at, or None to choose freely
+            end: Point the route must end at, or None to choose freely
+            coordinates: Point coordinates (n x 2), used by the
+                space-filling curve construction
+            
+        Returns:
+            Tuple of (route, total_distance)
+        """
+        self.stats = {}
+        n = distances.shape[0]
+        if n <= 1:
+            return list(range(n)), 0.0
+        if start is not None and start == end:
+            raise ValueError("Start and end of an open path must differ")
+        
+        search_distances = self._search_matrix(distances)
+        candidates = self._candidate_lists(search_distances)
+        
+        if self._use_exact(n):
+            print(f"  Solving open path over {n} points exactly...")
+            route, distance = self._held_karp_path(distances, start, end)
+            print(f"  Starting point: {route[0] + 1}")
+            return route, distance
+        
+        print(f"  Optimizing open path over {n} points...")
+        
+        route = self._open_path_construction(
+            search_distances, start, end, candidates, coordinates
+        )
+        route = self._local_search(route, search_distances, candidates, start, end)
+        route = self._oriented(route, distances, start, end)
+        distance = self._calculate_route_distance(route, distances)
+        
+        route, distance = self._refine(
+            route, distance, distances, search_distances, candidates, start, end
+        )
+        
+        print(f"  Starting point: {route[0] + 1}")
+        return route, distance
+    
+    def improve_route(self, distances: np.ndarray, route: List[int],
+                      start: Optional[int] = None,
+                      end: Optional[int] = None) -> Tuple[List[int], float]:
+        """
+        Re-optimise an existing route with local search only (warm start).
+        
+        No construction or exact solve runs, so the result stays close to
+        the given route and is cheap to compute.
+        
+        Args:
+            distances: Distance matrix (n x n)
+            route: Route visiting every point exactly once
+            start: Point the route must start at, or None to choose freely
+            end: Point the route must end at, or None to choose freely
+            
+        Returns:
+            Tuple of (route, total_distance)
+        """
+        self.stats = {}
+        n = distances.shape[0]
+        if sorted(route) != list(range(n)):
+            raise ValueError("Warm-start route must visit every point exactly once")
+        if n <= 2:
+            route = self._oriented(list(route), distances, start, end)
+            return route, self._calculate_route_distance(route, distances)
+        
+        search_distances = self._search_matrix(distances)
+        candidates = self._candidate_lists(search_distances)
+        
+        print(f"  Warm-starting from previous route over {n} points...")
+        
+        improved = self._local_search(list(route), search_distances, candidates, start, end)
+        improved = self._oriented(
+            self._keep_direction(improved, route, start, end), distances, start, end
+        )
+        distance = self._calculate_route_distance(improved, distances)
+        
+        improved, distance = self._refine(
+            improved, distance, distances, search_distances, candidates, start, end
+        )
+        
+        return improved, distance
+    
+    def insert_points(self, distances: np.ndarray, route: List[int], new_points: List[int],
+                      start: Optional[int] = None, end: Optional[int] = None,
+                      compute_bound: bool = False) -> Tuple[List[int], float]:
+        """
+        Add points to an existing route without re-solving it.
+        
+        Each new point goes to its cheapest position in the current route,
+        which only reads the new point's row and column of ``distances``.
+        A local search then repairs the route, starting only from the
+        inserted points and their neighbours. It reads distances entry by
+        entry and builds candidate lists only for the points it examines,
+        so no n x n matrix is formed: the cost is O(k n) for k new points
+        and the few points the repair spreads to, plus O(n) to rebuild the
+        route. The lower bound, an O(n^2) computation, is skipped unless
+        requested.
+        
+        Args:
+            distances: Distance matrix over existing and new points
+            route: Existing route (without the new points)
+            new_points: Indices of the points to add
+            start: Point the route must start at, or None to choose freely
+            end: Point the route must end at, or None to choose freely
+            compute_bound: Record the lower bound and optimality gap
+            
+        Returns:
+            Tuple of (route, total_distance)
+        """
+        self.stats = {}
+        route = list(route)
+        if sorted(route + list(new_points)) != list(range(distances.shape[0])):
+            raise ValueError("Route and new points must cover every point exactly once")
+        
+        for point in new_points:
+            if not route:
+                route.append(point)
+                continue
+            path = np.asarray(route)
+            # costs[k] is the added length when inserting before route[k]
+            costs = np.empty(len(route) + 1)
+            costs[0] = distances[point, path[0]] if start is None else np.inf
+            costs[-1] = distances[path[-1], point] if end is None else np.inf
+            costs[1:-1] = (
+                distances[path[:-1], point] + distances[point, path[1:]]
+                - distances[path[:-1], path[1:]]
+            )
+            route.insert(int(np.argmin(costs)), point)
+        
+        if len(route) >= 3 and new_points:
+            affected = set(new_points)
+            for point in new_points:
+                idx = route.index(point)
+                affected.update(route[max(idx - 1, 0):idx + 2])
+            
+            path = np.asarray(route)
+            length = float(
+                distances[path[:-1], path[1:]].sum() + distances[path[1:], path[:-1]].sum()
+            ) / 2
+            # Worth more than any gain a move can make on a route this long
+            bonus = -(3.0 * length + 1.0)
+            search_distances = _OnDemandDistances(distances, start, end, bonus)
+            neighbours = _OnDemandNeighbours(search_distances, self.config.optimization.candidate_neighbors)
+            
+            tour = Tour(route + [len(path)], sorted(affected))
+            self._improve_tour(tour, search_distances, neighbours, sorted(affected), dense=False)
+            repaired = self._tour_to_route(tour, start, end)
+            route = self._oriented(
+                self._keep_direction(repaired, route, start, end), distances, start, end
+            )
+        
+        print(f"  Inserted {len(new_points)} new points into the existing route")
+        distance = self._calculate_route_distance(route, distances)
+        if compute_bound:
+            self._record_gap(distance, distances, start, end)
+        else:
+            self.stats.update(lower_bound=None, optimality_gap=None)
+        return route, distance
     
     def solve_with_optimal_start(self, distances: np.ndarray) -> Tuple[List[int], float]:
         """
@@ -29,28 +394,233 @@ class TSPSolver:
         Returns:
             Tuple of (optimal_route, total_distance)
         """
+        self.stats = {}
         n = distances.shape[0]
         if n <= 1:
             return list(range(n)), 0.0
         
+        if self._use_exact(n):
+            # The exact open path with a free start is optimal over all starts
+            print(f"  Solving {n} points exactly...")
+            best_route, best_distance = self._held_karp_path(distances)
+            print(f"  Optimal starting point: {best_route[0] + 1}")
+            return best_route, best_distance
+        
         best_route = None
         best_distance = float('inf')
         best_start = 0
+        search_distances = self._search_matrix(distances)
+        candidates = self._candidate_lists(search_distances)
         
         print(f"  Optimizing with {n} points as starting candidates...")
         
-        # Try all starting points
-        for start_idx in range(n):
-            route, distance = self.solve_from_start(start_idx, distances)
-            
+        workers = self._parallel_workers(n)
+        if workers > 1:
+            start_results = self._solve_starts_parallel(
+                distances, search_distances, candidates, workers
+            )
+        else:
+            start_results = (
+                (start_idx,) + self._solve_from_start(
+                    start_idx, distances, search_distances, candidates
+                )
+                for start_idx in range(n)
+            )
+        
+        # Try all starting points; ties go to the lowest start index
+        for start_idx, route, distance in start_results:
             if distance < best_distance:
                 best_distance = distance
                 best_route = route
                 best_start = start_idx
+            if workers == 1 and self.config.optimization.target_gap > 0:
+                # The bound is for a free start, so it holds for every start
+                if 'lower_bound' not in self.stats:
+                    self.stats['lower_bound'] = self.lower_bound.compute(distances, best_distance)
+                if self._gap_reached(best_distance, self.stats['lower_bound']):
+                    print(f"  Optimality gap reached after {start_idx + 1} starting points")
+                    break
         
         print(f"  Optimal starting point: {best_start + 1}")
+        
+        if 'lower_bound' not in self.stats:
+            self.stats['lower_bound'] = self.lower_bound.compute(distances, best_distance)
+        best_route, best_distance = self._refine(
+            best_route, best_distance, distances, search_distances, candidates,
+            start=best_route[0]
+        )
+        
         return best_route, best_distance
     
+    def _use_exact(self, n: int) -> bool:
+        """
+        Check whether an instance is small enough for the exact solver.
+        
+        Args:
+            n: Number of points
+            
+        Returns:
+            True if Held-Karp should be used
+        """
+        return 2 <= n <= self.config.optimization.exact_max_points
+    
+    def _use_metaheuristic(self, n: int) -> bool:
+        """
+        Check whether an instance is large enough for iterated local search.
+        
+        Below ``metaheuristic_min_points`` local search alone leaves little
+        to gain; a double-bridge kick needs at least 4 points regardless.
+        
+        Args:
+            n: Number of points
+            
+        Returns:
+            True if iterated local search may run
+        """
+        return n >= max(self.config.optimization.metaheuristic_min_points, 4)
+    
+    def _held_karp_path(self, distances: np.ndarray, start: Optional[int] = None,
+                        end: Optional[int] = None) -> Tuple[List[int], float]:
+        """
+        Solve the open-path TSP exactly with Held-Karp dynamic programming.
+        
+        ``cost[S, j]`` is the length of the shortest path that visits the
+        point set S (a bitmask) and ends at j. Subsets are processed in order
+        of size, and for each end point all subsets of that size are relaxed
+        at once with NumPy, so Python only loops O(n^2) times over O(2^n n^2)
+        work. The original matrix is used as is, so asymmetric distances are
+        handled exactly.
+        
+        Args:
+            distances: Distance matrix (n x n)
+            start: Point the route must start at, or None to choose freely
+            end: Point the route must end at, or None to choose freely
+            
+        Returns:
+            Tuple of (optimal_route, total_distance)
+        """
+        distances = np.asarray(distances, dtype=float)
+        n = distances.shape[0]
+        full = (1 << n) - 1
+        
+        masks = np.arange(1 << n)
+        sizes = np.zeros(1 << n, dtype=np.intp)
+        for bit in range(n):
+            sizes += (masks >> bit) & 1
+        
+        cost = np.full((1 << n, n), np.inf)
+        parent = np.full((1 << n, n), -1, dtype=np.intp)
+        for j in ([start] if start is not None else range(n)):
+            cost[1 << j, j] = 0.0
+        
+        for size in range(2, n + 1):
+            layer = masks[sizes == size]
+            for j in range(n):
+                if j == start or (j == end and size < n):
+                    continue
+                bit = 1 << j
+                subsets = layer[(layer & bit) != 0]
+                totals = cost[subsets ^ bit] + distances[:, j]
+                best = np.argmin(totals, axis=1)
+                cost[subsets, j] = totals[np.arange(len(subsets)), best]
+                parent[subsets, j] = best
+        
+        last = end if end is not None else int(np.argmin(cost[full]))
+        total = float(cost[full, last])
+        
+        route = []
+        mask, j = full, last
+        while j >= 0:
+            route.append(int(j))
+            mask, j = mask ^ (1 << j), parent[mask, j]
+        route.reverse()
+        
+        self.stats['lower_bound'] = total
+        self.stats['optimality_gap'] = 0.0
+        return route, total
+    
+    def _parallel_workers(self, n: int) -> int:
+        """
+        Number of workers to use for a multi-start solve of n points.
+        
+        Args:
+            n: Number of points
+            
+        Returns:
+            Worker count; 1 means the serial path
+        """
+        workers = self.config.optimization.parallel_workers
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        if n < self.config.optimization.parallel_min_points:
+            return 1
+        return min(workers, n)
+    
+    def _solve_starts_parallel(self, distances: np.ndarray, search_distances: np.ndarray,
+                               candidates: np.ndarray, 
+                               workers: int) -> List[Tuple[int, List[int], float]]:
+        """
+        Solve every start point on a worker pool.
+        
+        Process workers read the matrices from shared memory that is filled
+        once, so nothing of size n x n is pickled per task. Results are
+        returned in start order, so the reduction matches the serial path.
+        
+        Args:
+            distances: Distance matrix used to report route lengths
+            search_distances: Symmetric matrix used for move evaluation
+            candidates: Candidate neighbour lists
+            workers: Number of workers
+            
+        Returns:
+            List of (start_idx, route, total_distance) sorted by start_idx
+        """
+        n = distances.shape[0]
+        chunks = [chunk.tolist() for chunk in np.array_split(np.arange(n), workers * 4) if len(chunk)]
+        results = []
+        
+        if self.config.optimization.parallel_backend == 'thread':
+            def solve_chunk(starts):
+                return [
+                    (start_idx,) + self._solve_from_start(
+                        start_idx, distances, search_distances, candidates
+                    )
+                    for start_idx in starts
+                ]
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for chunk_results in executor.map(solve_chunk, chunks):
+                    results.extend(chunk_results)
+            return results
+        
+        inputs = {
+            'distances': np.ascontiguousarray(distances, dtype=float),
+            'search_distances': np.ascontiguousarray(search_distances, dtype=float),
+            'candidates': np.ascontiguousarray(candidates)
+        }
+        memory = []
+        try:
+            arrays = {}
+            for key, array in inputs.items():
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                memory.append(block)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+                arrays[key] = (block.name, array.shape, array.dtype.str)
+            
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_start_worker,
+                initargs=(self.config, arrays)
+            ) as executor:
+                for chunk_results in executor.map(_solve_start_chunk, chunks):
+                    results.extend(chunk_results)
+        finally:
+            for block in memory:
+                block.close()
+                block.unlink()
+        
+        return results
+    
     def solve_from_start(self, start_idx: int, distances: np.ndarray) -> Tuple[List[int], float]:
         """
         Solve TSP from a specific starting point.
@@ -62,21 +632,201 @@ class TSPSolver:
         Returns:
             Tuple of (route, total_distance)
         """
-        n = distances.shape[0]
+        self.stats = {}
+        if self._use_exact(distances.shape[0]):
+            return self._held_karp_path(distances, start=start_idx)
+        
+        search_distances = self._search_matrix(distances)
+        candidates = self._candidate_lists(search_distances)
+        route, distance = self._solve_from_start(
+            start_idx, distances, search_distances, candidates
+        )
+        
+        route, distance = self._refine(
+            route, distance, distances, search_distances, candidates, start=start_idx
+        )
+        
+        return route, distance
+    
+    def solve_batch(self, matrices: List[np.ndarray]) -> List[Tuple[List[int], float]]:
+        """
+        Solve many small open-path instances in one vectorised pass.
+        
+        The matrices are padded into one (B x m x m) array. Nearest-neighbour
+        construction and best-improvement 2-opt then run for every instance
+        at once with NumPy broadcasting, so the Python-level work depends on
+        the largest instance rather than on the number of instances. Routes
+        are not polished with Or-opt or solved exactly; this trades a little
+        route length for throughput on cities with many tiny districts.
+        
+        Args:
+            matrices: Distance matrices, one per instance
+            
+        Returns:
+            List of (route, total_distance), in the order of ``matrices``
+        """
+        self.stats = {}
+        if not matrices:
+            return []
+        
+        sizes = np.array([len(matrix) for matrix in matrices])
+        batch, m = len(matrices), int(sizes.max())
+        padded = np.zeros((batch, m, m))
+        for b, matrix in enumerate(matrices):
+            padded[b, :sizes[b], :sizes[b]] = matrix
+        search = (padded + padded.transpose(0, 2, 1)) / 2
+        
+        print(f"  Optimizing {batch} instances of up to {m} points in one batch...")
+        
+        routes = self._batched_construction(search, sizes)
+        moves = self._batched_two_opt(search, sizes, routes)
+        
+        # Pick the cheaper walking direction on the original matrices
+        rows = np.arange(batch)[:, None]
+        steps = np.arange(m - 1)[None, :] < (sizes - 1)[:, None]
+        forward = np.where(steps, padded[rows, routes[:, :-1], routes[:, 1:]], 0).sum(axis=1)
+        backward = np.where(steps, padded[rows, routes[:, 1:], routes[:, :-1]], 0).sum(axis=1)
+        
+        results = []
+        lower_bounds, gaps = [], []
+        for b, matrix in enumerate(matrices):
+            route = routes[b, :sizes[b]].tolist()
+            distance = float(forward[b])
+            if backward[b] < forward[b]:
+                route, distance = route[::-1], float(backward[b])
+            results.append((route, distance))
+            
+            bound = self.lower_bound.compute(matrix, distance) if sizes[b] > 1 else 0.0
+            lower_bounds.append(bound)
+            gaps.append(None if not bound else max((distance - bound) / bound, 0.0))
+        
+        self.stats['batch'] = {'instances': batch, 'max_points': m, 'two_opt_moves': moves}
+        self.stats['lower_bounds'] = lower_bounds
+        self.stats['optimality_gaps'] = gaps
+        return results
+    
+    def _batched_construction(self, distances: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        """
+        Nearest-neighbour open paths for a padded batch of instances.
+        
+        Each path starts at the point farthest from the others, as in
+        ``_open_path_construction``.
+        
+        Args:
+            distances: Padded distance matrices (B x m x m)
+            sizes: Number of real points per instance
+            
+        Returns:
+            Routes (B x m); entries past an instance's size are its padding
+        """
+        batch, m, _ = distances.shape
+        rows = np.arange(batch)
+        valid = np.arange(m)[None, :] < sizes[:, None]
+        
+        routes = np.tile(np.arange(m), (batch, 1))
+        spread = np.where(valid, distances.sum(axis=2), -np.inf)
+        current = np.argmax(spread, axis=1)
+        routes[:, 0] = current
+        visited = ~valid
+        visited[rows, current] = True
+        
+        for k in range(1, m):
+            active = k < sizes
+            step = np.where(visited, np.inf, distances[rows, current])
+            following = np.argmin(step, axis=1)
+            current = np.where(active, following, current)
+            routes[active, k] = following[active]
+            visited[rows[active], following[active]] = True
+        
+        return routes
+    
+    def _batched_two_opt(self, distances: np.ndarray, sizes: np.ndarray,
+                         routes: np.ndarray) -> int:
+        """
+        Best-improvement 2-opt on a padded batch of open paths, in place.
         
+        Every round evaluates all segment reversals of every instance as
+        one (B x m x m) delta array. Reversing positions i..j of an open
+        path replaces the edges (i-1, i) and (j, j+1), either of which is
+        missing at the path ends. Each improving instance applies its best
+        move; the round repeats until no instance improves.
+        
+        Args:
+            distances: Padded symmetric distance matrices (B x m x m)
+            sizes: Number of real points per instance
+            routes: Routes (B x m), modified in place
+            
+        Returns:
+            Number of moves applied across all instances
+        """
+        batch, m, _ = distances.shape
+        rows = np.arange(batch)[:, None, None]
+        i = np.arange(m)[None, :, None]
+        j = np.arange(m)[None, None, :]
+        last = (sizes - 1)[:, None, None]
+        allowed = (i < j) & (j <= last)
+        has_left = np.broadcast_to(i > 0, allowed.shape)
+        has_right = j < last
+        positions = np.arange(m)[None, :]
+        threshold = self.config.optimization.tsp_improvement_threshold
+        
+        moves = 0
+        for _ in range(self.config.optimization.max_tsp_iterations * m):
+            before = np.roll(routes, 1, axis=1)[:, :, None]
+            after = np.roll(routes, -1, axis=1)[:, None, :]
+            at_i = routes[:, :, None]
+            at_j = routes[:, None, :]
+            
+            delta = (
+                np.where(has_left, distances[rows, before, at_j] - distances[rows, before, at_i], 0)
+                + np.where(has_right, distances[rows, at_i, after] - distances[rows, at_j, after], 0)
+            )
+            delta = np.where(allowed, delta, np.inf).reshape(batch, -1)
+            best = np.argmin(delta, axis=1)
+            improving = delta[np.arange(batch), best] < -threshold
+            if not improving.any():
+                break
+            
+            # Reverse positions i..j of every improving instance at once
+            first = np.where(improving, best // m, 0)[:, None]
+            final = np.where(improving, best % m, -1)[:, None]
+            inside = (positions >= first) & (positions <= final)
+            source = np.where(inside, first + final - positions, positions)
+            routes[:] = np.take_along_axis(routes, source, axis=1)
+            moves += int(improving.sum())
+        
+        return moves
+    
+    def _solve_from_start(self, start_idx: int, distances: np.ndarray,
+                          search_distances: np.ndarray,
+                          candidates: np.ndarray) -> Tuple[List[int], float]:
+        """
+        Solve TSP from a specific starting point with prepared search data.
+        
+        Args:
+            start_idx: Starting point index
+            distances: Distance matrix used to report the route length
+            search_distances: Symmetric matrix used for move evaluation
+            candidates: Candidate neighbour lists for ``search_distances``
+            
+        Returns:
+            Tuple of (route, total_distance)
+        """
         # Nearest neighbor construction
-        route = self._nearest_neighbor_construction(start_idx, distances)
-        total_distance = self._calculate_route_distance(route, distances)
+        route = self._nearest_neighbor_construction(start_idx, search_distances)
         
-        # 2-opt improvement
-        route, total_distance = self._two_opt_improvement(route, distances, total_distance)
+        # 2-opt and Or-opt improvement
+        route = self._local_search(route, search_distances, candidates, start=start_idx)
         
-        return route, total_distance
+        return route, self._calculate_route_distance(route, distances)
     
     def _nearest_neighbor_construction(self, start_idx: int, distances: np.ndarray) -> List[int]:
         """
         Construct initial route using nearest neighbor heuristic.
         
+        Each step takes a masked argmin over the current point's row, so the
+        O(n^2) work runs in NumPy rather than in a Python ``min``.
+        
         Args:
             start_idx: Starting point index
             distances: Distance matrix
@@ -84,67 +834,1209 @@ class TSPSolver:
         Returns:
             Initial route
         """
+        if self.kernels is not None:
+            return self.kernels.nearest_neighbor(start_idx, np.asarray(distances, dtype=float)).tolist()
+        
         n = distances.shape[0]
-        unvisited = set(range(n))
+        visited = np.zeros(n, dtype=bool)
         current = start_idx
         route = [current]
-        unvisited.remove(current)
+        visited[current] = True
         
-        while unvisited:
-            nearest = min(unvisited, key=lambda x: distances[current][x])
-            current = nearest
+        for _ in range(n - 1):
+            row = np.where(visited, np.inf, distances[current])
+            current = int(np.argmin(row))
             route.append(current)
-            unvisited.remove(current)
+            visited[current] = True
         
         return route
     
-    def _two_opt_improvement(self, route: List[int], distances: np.ndarray, 
-                           initial_distance: float) -> Tuple[List[int], float]:
+    def _space_filling_curve_construction(self, coordinates: np.ndarray) -> List[int]:
         """
-        Improve route using 2-opt algorithm.
+        Construct a closed tour by sorting points along a Hilbert curve.
         
         Args:
-            route: Initial route
-            distances: Distance matrix
-            initial_distance: Initial route distance
+            coordinates: Array (n x 2) of point coordinates, e.g. (lon, lat)
             
         Returns:
-            Tuple of (improved_route, improved_distance)
+            Points in Hilbert curve order (read as a cycle)
         """
-        current_route = route.copy()
-        current_distance = initial_distance
+        coordinates = np.asarray(coordinates, dtype=float)
+        order_bits = 16
+        side = 1 << order_bits
         
-        improved = True
-        iteration = 0
-        max_iterations = min(
-            self.config.optimization.max_tsp_iterations,
-            len(route) * 2
-        )
+        low = coordinates.min(axis=0)
+        span = float((coordinates.max(axis=0) - low).max()) or 1.0
+        grid = ((coordinates - low) / span * (side - 1)).astype(np.int64)
+        x, y = grid[:, 0], grid[:, 1]
+        
+        index = np.zeros(len(coordinates), dtype=np.int64)
+        s = side >> 1
+        while s > 0:
+            rx = (x & s) > 0
+            ry = (y & s) > 0
+            index += s * s * ((3 * rx.astype(np.int64)) ^ ry.astype(np.int64))
+            # Rotate the quadrant so the sub-curve has the canonical orientation
+            flip = ~ry & rx
+            x = np.where(flip, side - 1 - x, x)
+            y = np.where(flip, side - 1 - y, y)
+            x, y = np.where(~ry, y, x), np.where(~ry, x, y)
+            s >>= 1
+        
+        return np.argsort(index, kind='stable').tolist()
+    
+    def _greedy_edge_construction(self, distances: np.ndarray, 
+                                  candidates: np.ndarray) -> List[int]:
+        """
+        Construct a closed tour by greedy matching of candidate edges.
+        
+        Candidate edges are taken shortest first whenever both endpoints
+        still have degree < 2 and no cycle is closed. The resulting path
+        fragments are chained together by nearest free endpoint.
         
-        while improved and iteration < max_iterations:
-            improved = False
-            iteration += 1
+        Args:
+            distances: Distance matrix
+            candidates: Candidate neighbour lists
             
-            for i in range(1, len(current_route) - 1):
-                for j in range(i + 1, len(current_route)):
-                    if j - i == 1:
-                        continue
-                    
-                    new_route = current_route.copy()
-                    new_route[i:j] = reversed(new_route[i:j])
-                    new_distance = self._calculate_route_distance(new_route, distances)
-                    
-                    improvement = current_distance - new_distance
-                    if improvement > self.config.optimization.tsp_improvement_threshold:
-                        current_route = new_route
-                        current_distance = new_distance
-                        improved = True
-                        break
-                
-                if improved:
+        Returns:
+            Points in tour order (read as a cycle)
+        """
+        n = distances.shape[0]
+        rows = np.repeat(np.arange(n), candidates.shape[1])
+        cols = candidates.ravel()
+        keep = rows < cols
+        rows, cols = rows[keep], cols[keep]
+        by_length = np.argsort(distances[rows, cols], kind='stable')
+        
+        component = list(range(n))
+        
+        def find(point):
+            while component[point] != point:
+                component[point] = component[component[point]]
+                point = component[point]
+            return point
+        
+        degree = [0] * n
+        adjacent = [[] for _ in range(n)]
+        for edge in by_length.tolist():
+            a, b = int(rows[edge]), int(cols[edge])
+            if degree[a] >= 2 or degree[b] >= 2:
+                continue
+            root_a, root_b = find(a), find(b)
+            if root_a == root_b:
+                continue
+            component[root_a] = root_b
+            degree[a] += 1
+            degree[b] += 1
+            adjacent[a].append(b)
+            adjacent[b].append(a)
+        
+        # Walk each fragment from one of its ends
+        fragments = []
+        seen = [False] * n
+        for point in range(n):
+            if seen[point] or degree[point] == 2:
+                continue
+            fragment = [point]
+            seen[point] = True
+            previous, current = None, point
+            while True:
+                following = [p for p in adjacent[current] if p != previous]
+                if not following:
                     break
+                previous, current = current, following[0]
+                fragment.append(current)
+                seen[current] = True
+            fragments.append(fragment)
+        
+        # Chain fragments by joining the nearest free endpoint
+        tour = fragments.pop(0)
+        while fragments:
+            heads = np.array([fragment[0] for fragment in fragments])
+            tails = np.array([fragment[-1] for fragment in fragments])
+            to_head = distances[tour[-1], heads]
+            to_tail = distances[tour[-1], tails]
+            if to_head.min() <= to_tail.min():
+                tour.extend(fragments.pop(int(np.argmin(to_head))))
+            else:
+                tour.extend(reversed(fragments.pop(int(np.argmin(to_tail)))))
+        
+        return tour
+    
+    def _insertion_construction(self, distances: np.ndarray, farthest: bool = True) -> List[int]:
+        """
+        Construct a closed tour by insertion.
+        
+        Farthest insertion adds the point farthest from the tour next;
+        cheapest insertion adds the point whose best insertion costs least.
+        Either way the point goes where it lengthens the tour least. Insertion
+        costs are kept per outside point and only refreshed for points whose
+        best edge was just split, so each step is O(n) in NumPy.
+        
+        Args:
+            distances: Distance matrix
+            farthest: Use farthest insertion; otherwise cheapest insertion
+            
+        Returns:
+            Points in tour order (read as a cycle)
+        """
+        n = distances.shape[0]
+        if n <= 2:
+            return list(range(n))
+        
+        # Start from the two mutually farthest points
+        a, b = np.unravel_index(int(np.argmax(distances)), distances.shape)
+        a, b = int(a), int(b)
+        following = np.full(n, -1, dtype=np.intp)
+        following[a], following[b] = b, a
+        in_tour = np.zeros(n, dtype=bool)
+        in_tour[[a, b]] = True
+        
+        nearest = np.minimum(distances[a], distances[b])
+        # Best insertion of every point: after best_after[p], at best_cost[p]
+        best_after = np.full(n, a, dtype=np.intp)
+        best_cost = distances[a] + distances[:, b] - distances[a, b]
+        swap = distances[b] + distances[:, a] - distances[b, a] < best_cost
+        best_after[swap] = b
+        best_cost = np.where(swap, distances[b] + distances[:, a] - distances[b, a], best_cost)
+        
+        for _ in range(n - 2):
+            outside = np.flatnonzero(~in_tour)
+            if farthest:
+                point = int(outside[np.argmax(nearest[outside])])
+            else:
+                point = int(outside[np.argmin(best_cost[outside])])
+            
+            after = int(best_after[point])
+            before = int(following[after])
+            following[point] = before
+            following[after] = point
+            in_tour[point] = True
+            nearest = np.minimum(nearest, distances[point])
+            
+            outside = np.flatnonzero(~in_tour)
+            if len(outside) == 0:
+                break
+            
+            # Points whose best edge was split need a full refresh
+            stale = outside[best_after[outside] == after]
+            if len(stale):
+                tour_points = np.flatnonzero(in_tour)
+                nexts = following[tour_points]
+                costs = (
+                    distances[np.ix_(stale, tour_points)] + distances[np.ix_(stale, nexts)]
+                    - distances[tour_points, nexts]
+                )
+                choice = np.argmin(costs, axis=1)
+                best_after[stale] = tour_points[choice]
+                best_cost[stale] = costs[np.arange(len(stale)), choice]
+            
+            # Everyone else only compares against the two new edges
+            fresh = outside[best_after[outside] != after]
+            for u, v in ((after, point), (point, before)):
+                costs = distances[u, fresh] + distances[fresh, v] - distances[u, v]
+                better = costs < best_cost[fresh]
+                best_after[fresh[better]] = u
+                best_cost[fresh[better]] = costs[better]
+        
+        tour = [a]
+        for _ in range(n - 1):
+            tour.append(int(following[tour[-1]]))
+        return tour
+    
+    def _cycle_to_path(self, cycle: List[int], distances: np.ndarray,
+                       start: Optional[int] = None, end: Optional[int] = None) -> List[int]:
+        """
+        Open a closed tour into a route honouring fixed endpoints.
+        
+        Without a fixed start the tour is cut at its longest edge; with one,
+        at the longer of the start's two edges. A fixed end is moved to the
+        back; local search repairs the damage.
+        
+        Args:
+            cycle: Points in tour order
+            distances: Distance matrix
+            start: Fixed start, if any
+            end: Fixed end, if any
+            
+        Returns:
+            Open route
+        """
+        n = len(cycle)
+        order = np.asarray(cycle)
+        edge_lengths = distances[order, np.roll(order, -1)]
+        
+        if start is None:
+            cut = int(np.argmax(edge_lengths))
+            route = np.roll(order, -(cut + 1)).tolist()
+        else:
+            idx = cycle.index(start)
+            route = np.roll(order, -idx).tolist()
+            # Drop the longer of the two edges at the start
+            if edge_lengths[idx] > edge_lengths[idx - 1]:
+                route = [route[0]] + route[1:][::-1]
+        
+        if end is not None and route[-1] != end:
+            route.remove(end)
+            route.append(end)
+        if start is None and end is not None and route[0] == end:
+            route = route[1:] + [end]
+        
+        return route
+    
+    def _open_path_construction(self, distances: np.ndarray, start: Optional[int] = None,
+                                end: Optional[int] = None,
+                                candidates: Optional[np.ndarray] = None,
+                                coordinates: Optional[np.ndarray] = None) -> List[int]:
+        """
+        Construct an initial open route honouring fixed endpoints.
+        
+        The heuristic comes from ``OptimizationConfig.construction``. Tour
+        constructions are opened with ``_cycle_to_path``. For nearest
+        neighbour without a fixed start the walk begins at the point
+        farthest from the others (or from the fixed end), since open routes
+        tend to start on the edge of the area.
+        
+        Args:
+            distances: Distance matrix
+            start: Fixed start, if any
+            end: Fixed end, if any
+            candidates: Candidate neighbour lists (for greedy edge)
+            coordinates: Point coordinates (for the space-filling curve)
+            
+        Returns:
+            Initial route
+        """
+        n = distances.shape[0]
+        method = self.config.optimization.construction
+        
+        if method == 'space_filling_curve' and coordinates is None:
+            print("  No coordinates for space-filling curve; using nearest neighbour")
+            method = 'nearest_neighbor'
+        
+        if method == 'space_filling_curve':
+            cycle = self._space_filling_curve_construction(coordinates)
+        elif method == 'greedy':
+            if candidates is None:
+                candidates = self._candidate_lists(distances)
+            cycle = self._greedy_edge_construction(distances, candidates)
+        elif method in ('farthest_insertion', 'cheapest_insertion'):
+            cycle = self._insertion_construction(distances, farthest=method == 'farthest_insertion')
+        elif method == 'nearest_neighbor':
+            cycle = None
+        else:
+            raise ValueError(f"Unknown construction heuristic: {method}")
+        
+        if cycle is not None:
+            return self._cycle_to_path(cycle, distances, start, end)
+        
+        if start is None:
+            spread = distances[end].copy() if end is not None else distances.sum(axis=1)
+            if end is not None:
+                spread[end] = -np.inf
+            start = int(np.argmax(spread))
+        
+        if end is None:
+            return self._nearest_neighbor_construction(start, distances)
+        
+        # Walk over every point but the end, then append it
+        keep = [i for i in range(n) if i != end]
+        walk = self._nearest_neighbor_construction(
+            keep.index(start), distances[np.ix_(keep, keep)]
+        )
+        return [keep[i] for i in walk] + [end]
+    
+    def _local_search(self, route: List[int], distances: np.ndarray,
+                      candidates: np.ndarray, start: Optional[int] = None,
+                      end: Optional[int] = None,
+                      active: Optional[List[int]] = None) -> List[int]:
+        """
+        Improve an open route with 2-opt followed by Or-opt.
+        
+        Both phases share one ``Tour``. Or-opt runs as a second phase once
+        2-opt has converged; when it relocates segments, 2-opt gets another
+        turn on the changed tour.
+        
+        Args:
+            route: Initial route
+            distances: Symmetric distance matrix
+            candidates: Candidate neighbour lists for ``distances``
+            start: Point that must stay first, or None for a free start
+            end: Point that must stay last, or None for a free end
+            active: Points each phase starts from. If None, every point;
+                otherwise the search only spreads from these points to the
+                endpoints of the moves it applies.
+            
+        Returns:
+            Improved route
+        """
+        if len(route) < 3:
+            return list(route)
+        
+        tour, closed_distances, neighbours = self._path_tour(
+            route, distances, candidates, start, end, active
+        )
+        self._improve_tour(tour, closed_distances, neighbours, active)
+        
+        return self._tour_to_route(tour, start, end)
+    
+    def _improve_tour(self, tour: Tour, distances: np.ndarray, neighbours: List[List[int]],
+                      active: Optional[List[int]] = None, dense: bool = True) -> None:
+        """
+        Run the 2-opt and Or-opt phases on a tour until neither improves.
+        
+        Args:
+            tour: Tour to improve in place
+            distances: Closed distance matrix of the tour
+            neighbours: Candidate neighbour lists per point
+            active: Points each phase starts from, or None for every point
+            dense: False when ``distances`` and ``neighbours`` are computed on
+                demand; the compiled and whole-neighbourhood 2-opt engines,
+                which need full arrays, are then not used
+        """
+        phase_points = range(tour.n) if active is None else active
+        
+        for _ in range(self.config.optimization.max_tsp_iterations):
+            if dense:
+                self._run_two_opt(tour, distances, neighbours)
+            else:
+                self._two_opt_search(tour, distances, neighbours, compiled=False)
+            if not self.config.optimization.use_or_opt:
+                break
+            tour.wake(*phase_points)
+            if self._or_opt_search(tour, distances, neighbours) == 0:
+                break
+            tour.wake(*phase_points)
+    
+    def _two_opt_improvement(self, route: List[int], distances: np.ndarray, 
+                           initial_distance: float,
+                           candidates: Optional[np.ndarray] = None) -> Tuple[List[int], float]:
+        """
+        Improve route using 2-opt algorithm.
+        
+        The route is held in a ``Tour`` closed through a dummy node so that
+        segment reversals can flip the shorter side; the first point stays
+        fixed as the route start. Only moves that join a point to one of its
+        candidate neighbours are examined, each scored from the four edges
+        it touches, and don't-look bits restrict the search to points next
+        to a recent change. Deltas assume a symmetric matrix; see
+        ``_search_matrix``.
+        
+        Args:
+            route: Initial route
+            distances: Distance matrix
+            initial_distance: Initial route distance
+            candidates: Candidate neighbour lists. Built from ``distances``
+                if not provided.
+            
+        Returns:
+            Tuple of (improved_route, improved_distance)
+        """
+        n = len(route)
+        if n < 3:
+            return list(route), initial_distance
+        
+        if candidates is None:
+            candidates = self._candidate_lists(distances)
+        
+        tour, closed_distances, neighbours = self._path_tour(
+            route, distances, candidates, start=route[0]
+        )
+        
+        self._run_two_opt(tour, closed_distances, neighbours)
+        
+        improved_route = self._tour_to_route(tour, start=route[0])
+        return improved_route, self._calculate_route_distance(improved_route, distances)
+    
+    def _run_two_opt(self, tour: Tour, distances: np.ndarray,
+                     neighbours: List[List[int]]) -> int:
+        """
+        Run the 2-opt engine selected by ``OptimizationConfig.two_opt_engine``.
+        
+        Args:
+            tour: Tour to improve in place
+            distances: Distance matrix matching the tour's points
+            neighbours: Candidate neighbour lists per point
+            
+        Returns:
+            Number of improving moves applied
+        """
+        if self.config.optimization.two_opt_engine == 'vectorized':
+            return self._vectorized_two_opt_search(tour, distances)
+        return self._two_opt_search(tour, distances, neighbours)
+    
+    def _vectorized_two_opt_search(self, tour: Tour, distances: np.ndarray) -> int:
+        """
+        Run best-improvement 2-opt scoring the whole neighbourhood in NumPy.
+        
+        Each iteration gathers the distances between tour positions with one
+        fancy-indexing call and computes the gain of every move (i, j) as an
+        array, then applies the argmax. The O(n^2) scan runs in C, which
+        suits instances of a few hundred points; memory grows with n^2.
+        
+        Args:
+            tour: Tour to improve in place
+            distances: Distance matrix matching the tour's points
+            
+        Returns:
+            Number of improving moves applied
+        """
+        threshold = self.config.optimization.tsp_improvement_threshold
+        max_moves = self.config.optimization.max_tsp_iterations * tour.n
+        m = tour.n
+        if m < 4:
+            return 0
+        
+        # Moves (i, j) remove edges at positions i and j; adjacent edges
+        # (including the pair that wraps around the cycle) are not moves
+        valid = np.triu(np.ones((m, m), dtype=bool), k=2)
+        valid[0, m - 1] = False
+        
+        moves = 0
+        while moves < max_moves:
+            order = tour.order
+            between = distances[np.ix_(order, order)]
+            edges = np.diagonal(np.roll(between, -1, axis=1)).copy()
+            # gain[i, j] = d(a_i, b_i) + d(a_j, b_j) - d(a_i, a_j) - d(b_i, b_j)
+            # with a_k = order[k] and b_k = order[k + 1]
+            gain = edges[:, None] + edges[None, :] - between - np.roll(between, -1, axis=(0, 1))
+            gain[~valid] = -np.inf
+            
+            best = int(np.argmax(gain))
+            i, j = divmod(best, m)
+            if gain[i, j] <= threshold:
+                break
+            
+            a, b, c, d = order[i], order[(i + 1) % m], order[j], order[(j + 1) % m]
+            tour.two_opt_move(int(a), int(b), int(c), int(d))
+            moves += 1
+        
+        return moves
+    
+    def _two_opt_search(self, tour: Tour, distances: np.ndarray,
+                        neighbours: List[List[int]], compiled: bool = True) -> int:
+        """
+        Run 2-opt on a tour until every don't-look bit is set.
+        
+        Args:
+            tour: Tour to improve in place
+            distances: Distance matrix matching the tour's points
+            neighbours: Candidate neighbour lists per point
+            compiled: Use the compiled kernel when available
+            
+        Returns:
+            Number of improving moves applied
+        """
+        threshold = self.config.optimization.tsp_improvement_threshold
+        best_improvement = self.config.optimization.two_opt_strategy == 'best'
+        max_moves = self.config.optimization.max_tsp_iterations * tour.n
+        
+        if compiled and self.kernels is not None:
+            queue = np.zeros(tour.n, dtype=np.int64)
+            pending = tour.queued_points()
+            queue[:len(pending)] = pending
+            moves, head, count = self.kernels.two_opt_candidates(
+                tour.order, tour.position, distances, self._neighbour_array(neighbours),
+                tour.dont_look, queue, 0, len(pending), threshold, best_improvement, max_moves
+            )
+            tour.set_queue(queue[(head + np.arange(count)) % tour.n].tolist())
+            return int(moves)
+        
+        moves = 0
+        while moves < max_moves:
+            a = tour.next_active()
+            if a is None:
+                break
+            
+            move = self._find_two_opt_move(
+                tour, a, distances, neighbours[a], threshold, best_improvement
+            )
+            if move is not None:
+                tour.two_opt_move(*move)
+                tour.wake(*move)
+                moves += 1
+        
+        return moves
+    
+    def _neighbour_array(self, neighbours: List[List[int]]) -> np.ndarray:
+        """
+        Candidate lists as a 2-D array padded with -1, for the kernels.
+        
+        The last conversion is cached, since local search phases reuse the
+        same lists many times.
+        
+        Args:
+            neighbours: Candidate neighbour lists per point
+            
+        Returns:
+            Integer array (points x longest list)
+        """
+        if self._neighbour_cache is not None and self._neighbour_cache[0] is neighbours:
+            return self._neighbour_cache[1]
+        width = max(len(row) for row in neighbours)
+        array = np.full((len(neighbours), max(width, 1)), -1, dtype=np.int64)
+        for point, row in enumerate(neighbours):
+            array[point, :len(row)] = row
+        self._neighbour_cache = (neighbours, array)
+        return array
+    
+    def _find_two_opt_move(self, tour: Tour, a: int, distances: np.ndarray,
+                           neighbours: List[int], threshold: float,
+                           best_improvement: bool) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Find an improving 2-opt move that joins ``a`` to a candidate neighbour.
+        
+        Args:
+            tour: Current tour
+            a: Point to start the move from
+            distances: Distance matrix
+            neighbours: Candidate neighbours of ``a``, nearest first
+            threshold: Minimum gain for a move to count as improving
+            best_improvement: Return the best move instead of the first
+            
+        Returns:
+            Arguments for ``Tour.two_opt_move``, or None if no move improves
+        """
+        best_gain = threshold
+        best_move = None
+        
+        for forward in (True, False):
+            b = tour.succ(a) if forward else tour.pred(a)
+            d_ab = distances[a, b]
+            
+            for c in neighbours:
+                # The new edge (a, c) must be shorter than the removed (a, b)
+                g1 = d_ab - distances[a, c]
+                if g1 <= 0:
+                    break
+                
+                d = tour.succ(c) if forward else tour.pred(c)
+                if c == b or d == a:
+                    continue
+                
+                gain = g1 + distances[c, d] - distances[b, d]
+                if gain > best_gain:
+                    best_gain = gain
+                    best_move = (a, b, c, d) if forward else (b, a, d, c)
+                    if not best_improvement:
+                        return best_move
+        
+        return best_move
+    
+    def _or_opt_search(self, tour: Tour, distances: np.ndarray,
+                       neighbours: List[List[int]]) -> int:
+        """
+        Run Or-opt on a tour until every don't-look bit is set.
+        
+        Args:
+            tour: Tour to improve in place
+            distances: Distance matrix matching the tour's points
+            neighbours: Candidate neighbour lists per point
+            
+        Returns:
+            Number of improving moves applied
+        """
+        threshold = self.config.optimization.tsp_improvement_threshold
+        max_moves = self.config.optimization.max_tsp_iterations * tour.n
+        
+        moves = 0
+        while moves < max_moves:
+            a = tour.next_active()
+            if a is None:
+                break
+            
+            move = self._find_or_opt_move(tour, a, distances, neighbours, threshold)
+            if move is not None:
+                first, last, x, y, reverse = move
+                touched = (tour.pred(first), tour.succ(last), first, last, x, y)
+                tour.move_segment(first, last, x, y, reverse)
+                tour.wake(*touched)
+                moves += 1
+        
+        return moves
+    
+    def _find_or_opt_move(self, tour: Tour, a: int, distances: np.ndarray,
+                          neighbours: List[List[int]], 
+                          threshold: float) -> Optional[Tuple[int, int, int, int, bool]]:
+        """
+        Find an improving relocation of a 1-3 point segment at ``a``.
+        
+        Segments start or end at ``a`` and are reinserted next to a
+        candidate neighbour of either segment end, in both orientations.
+        
+        Args:
+            tour: Current tour
+            a: Point the segment must contain as an endpoint
+            distances: Distance matrix
+            neighbours: Candidate neighbour lists per point
+            threshold: Minimum gain for a move to count as improving
+            
+        Returns:
+            Arguments for ``Tour.move_segment``, or None if no move improves
+        """
+        forward = [a]
+        backward = [a]
+        segments = [[a]]
+        for _ in range(min(3, tour.n - 3) - 1):
+            forward = forward + [tour.succ(forward[-1])]
+            backward = [tour.pred(backward[0])] + backward
+            segments.extend((forward, backward))
+        
+        for segment in segments:
+            first, last = segment[0], segment[-1]
+            p, nx = tour.pred(first), tour.succ(last)
+            removal_gain = distances[p, first] + distances[last, nx] - distances[p, nx]
+            if removal_gain <= threshold:
+                continue
+            
+            inside = set(segment)
+            for end, other, reverse in ((first, last, False), (last, first, True)):
+                for c in neighbours[end]:
+                    # The new edge at c must leave some gain to spend
+                    if distances[c, end] >= removal_gain:
+                        break
+                    if c in inside:
+                        continue
+                    
+                    for e in (tour.succ(c), tour.pred(c)):
+                        if e in inside:
+                            continue
+                        gain = removal_gain - (
+                            distances[c, end] + distances[other, e] - distances[c, e]
+                        )
+                        if gain > threshold:
+                            return first, last, c, e, reverse
+        
+        return None
+    
+    def _refine(self, route: List[int], distance: float, distances: np.ndarray,
+                search_distances: np.ndarray, candidates: np.ndarray,
+                start: Optional[int] = None,
+                end: Optional[int] = None) -> Tuple[List[int], float]:
+        """
+        Apply the optional anytime refinements to a locally optimal route.
+        
+        Iterated local search runs first when it has a time budget, then the
+        Lin-Kernighan style engine when enabled. Both are skipped once the
+        route is within ``OptimizationConfig.target_gap`` of the lower
+        bound, and the final gap is recorded in ``self.stats``.
+        
+        Args:
+            route: Locally optimal route
+            distance: Length of ``route`` on ``distances``
+            distances: Distance matrix used to report the route length
+            search_distances: Symmetric matrix used for move evaluation
+            candidates: Candidate neighbour lists for ``search_distances``
+            start: Point that must stay first, or None for a free start
+            end: Point that must stay last, or None for a free end
+            
+        Returns:
+            Tuple of (route, total_distance)
+        """
+        bound = self._record_gap(distance, distances, start, end)
+        if self._gap_reached(distance, bound):
+            print(f"  Within {self.stats['optimality_gap']:.2%} of the lower bound; "
+                  f"skipping refinement")
+            return route, distance
+        
+        if self.config.optimization.ils_time_budget > 0:
+            route, distance = self._iterated_local_search(
+                route, distances, search_distances, candidates, start, end, bound
+            )
+        if self.config.optimization.lin_kernighan:
+            route, distance = self._lin_kernighan_improvement(
+                route, distances, search_distances, candidates, start, end
+            )
+        self._record_gap(distance, distances, start, end)
+        return route, distance
+    
+    def _record_gap(self, distance: float, distances: np.ndarray,
+                    start: Optional[int] = None, end: Optional[int] = None) -> Optional[float]:
+        """
+        Record the lower bound and optimality gap of a route in ``self.stats``.
+        
+        The bound is computed once per solve; later calls reuse it. The gap
+        is ``(distance - bound) / bound``.
+        
+        Args:
+            distance: Route length
+            distances: Distance matrix
+            start: Fixed start, if any
+            end: Fixed end, if any
+            
+        Returns:
+            Lower bound, or None if bounds are disabled
+        """
+        if 'lower_bound' not in self.stats:
+            self.stats['lower_bound'] = self.lower_bound.compute(distances, distance, start, end)
+        bound = self.stats['lower_bound']
+        
+        if bound is None:
+            gap = None
+        elif bound > 0:
+            gap = max(float(distance - bound) / bound, 0.0)
+        else:
+            gap = 0.0 if distance <= 0 else None
+        self.stats['optimality_gap'] = gap
+        return bound
+    
+    def _gap_reached(self, distance: float, bound: Optional[float]) -> bool:
+        """
+        Check whether a route is within the target gap of the lower bound.
+        
+        Args:
+            distance: Route length
+            bound: Lower bound, or None if unknown
+            
+        Returns:
+            True if further search is not worthwhile
+        """
+        if bound is None:
+            return False
+        return distance <= bound * (1 + self.config.optimization.target_gap) + 1e-9
+    
+    def _iterated_local_search(self, route: List[int], distances: np.ndarray,
+                               search_distances: np.ndarray, candidates: np.ndarray,
+                               start: Optional[int] = None, end: Optional[int] = None,
+                               bound: Optional[float] = None,
+                               time_budget: Optional[float] = None) -> Tuple[List[int], float]:
+        """
+        Refine a route with iterated local search until the time budget ends.
+        
+        Each iteration applies a double-bridge kick and repairs it with a
+        local search that only starts from the points next to the cuts. The
+        kicked route replaces the current one according to
+        ``OptimizationConfig.ils_acceptance``: "better" keeps it if it is no
+        longer, "annealing" also takes longer routes with a probability
+        that falls as the budget runs out. The search stops early once the
+        best route is within the target gap of ``bound``. The best route
+        seen is returned.
+        
+        Args:
+            route: Locally optimal route
+            distances: Distance matrix used to report the route length
+            search_distances: Symmetric matrix used for move evaluation
+            candidates: Candidate neighbour lists for ``search_distances``
+            start: Point that must stay first, or None for a free start
+            end: Point that must stay last, or None for a free end
+            bound: Lower bound on the route length, or None if unknown
+            time_budget: Seconds to search; defaults to
+                ``OptimizationConfig.ils_time_budget``
+            
+        Returns:
+            Tuple of (route, total_distance)
+        """
+        settings = self.config.optimization
+        if time_budget is None:
+            time_budget = settings.ils_time_budget
+        if settings.ils_acceptance not in ('better', 'annealing'):
+            raise ValueError(f"Unknown ILS acceptance criterion: {settings.ils_acceptance}")
+        
+        started = time.perf_counter()
+        deadline = started + time_budget
+        rng = np.random.default_rng(settings.ils_seed)
+        initial_distance = self._calculate_route_distance(route, distances)
+        n = len(route)
+        
+        def length(path):
+            path = np.asarray(path)
+            return float(search_distances[path[:-1], path[1:]].sum())
+        
+        current = best = list(route)
+        current_length = best_length = length(route)
+        # Annealing temperature: a fraction of the mean edge, cooled linearly
+        temperature = 0.1 * current_length / max(n - 1, 1)
+        iterations = accepted = 0
+        # The closed matrix and neighbour lists are built once and shared
+        # by every repair; only the tour itself is rebuilt per kick
+        _, closed_distances, neighbours = self._path_tour(
+            route, search_distances, candidates, start, end
+        )
+        
+        while self._use_metaheuristic(n) and time.perf_counter() < deadline:
+            iterations += 1
+            kicked, touched = self._double_bridge(current, rng)
+            tour = Tour(kicked + [n], touched)
+            self._improve_tour(tour, closed_distances, neighbours, touched)
+            kicked = self._tour_to_route(tour, start, end)
+            kicked_length = length(kicked)
+            
+            delta = kicked_length - current_length
+            if delta <= 0:
+                take = True
+            elif settings.ils_acceptance == 'annealing':
+                remaining = max(deadline - time.perf_counter(), 0.0) / time_budget
+                take = remaining > 0 and rng.random() < np.exp(-delta / (temperature * remaining))
+            else:
+                take = False
+            
+            if take:
+                accepted += 1
+                current, current_length = kicked, kicked_length
+                if current_length < best_length - 1e-9:
+                    best, best_length = current, current_length
+                    if self._gap_reached(best_length, bound):
+                        break
+        
+        refined = self._oriented(self._keep_direction(best, route, start, end),
+                                 distances, start, end)
+        # The search optimises the symmetrised matrix; keep the input route
+        # if that does not carry over to the original one
+        if self._calculate_route_distance(refined, distances) < initial_distance:
+            route = refined
+        
+        distance = self._calculate_route_distance(route, distances)
+        elapsed = time.perf_counter() - started
+        improvement = float(initial_distance - distance)
+        self.stats['iterated_local_search'] = {
+            'iterations': iterations,
+            'accepted': accepted,
+            'improvement': improvement,
+            'improvement_ratio': float(improvement / initial_distance) if initial_distance > 0 else 0.0,
+            'seconds': elapsed
+        }
+        print(f"  Iterated local search: {iterations} kicks, "
+              f"{improvement:.1f}m shorter in {elapsed:.2f}s")
+        
+        return route, distance
+    
+    def _double_bridge(self, route: List[int],
+                       rng: np.random.Generator) -> Tuple[List[int], List[int]]:
+        """
+        Perturb a route with a segment-limited double-bridge move.
+        
+        The route A B C D becomes A C B D. A and D are never empty, so the
+        first and last points stay in place. Segments B and C are at most
+        ``ils_segment_length`` points long, which keeps the kick local and
+        the repair cheap on long routes.
+        
+        Args:
+            route: Route with at least 4 points
+            rng: Random number generator
+            
+        Returns:
+            Tuple of (kicked route, points next to the cuts)
+        """
+        n = len(route)
+        limit = max(1, min(self.config.optimization.ils_segment_length, (n - 2) // 2))
+        while True:
+            i = int(rng.integers(1, n - 2))
+            j = i + int(rng.integers(1, limit + 1))
+            k = j + int(rng.integers(1, limit + 1))
+            if k <= n - 1:
+                break
+        
+        kicked = route[:i] + route[j:k] + route[i:j] + route[k:]
+        touched = {route[i - 1], route[i], route[j - 1], route[j], route[k - 1], route[k]}
+        return kicked, sorted(touched)
+    
+    def _lin_kernighan_improvement(self, route: List[int], distances: np.ndarray,
+                                   search_distances: np.ndarray, candidates: np.ndarray,
+                                   start: Optional[int] = None,
+                                   end: Optional[int] = None) -> Tuple[List[int], float]:
+        """
+        Refine a route with the variable-depth (Lin-Kernighan style) engine.
+        
+        Runs until every point is exhausted or
+        ``OptimizationConfig.lk_time_budget`` seconds have passed, then
+        records the achieved improvement in ``self.stats``.
+        
+        Args:
+            route: Route to refine
+            distances: Distance matrix used to report the route length
+            search_distances: Symmetric matrix used for move evaluation
+            candidates: Candidate neighbour lists for ``search_distances``
+            start: Point that must stay first, or None for a free start
+            end: Point that must stay last, or None for a free end
+            
+        Returns:
+            Tuple of (route, total_distance)
+        """
+        started = time.perf_counter()
+        initial_distance = self._calculate_route_distance(route, distances)
+        
+        if len(route) >= 4:
+            tour, closed_distances, neighbours = self._path_tour(
+                route, search_distances, candidates, start, end
+            )
+            self._lin_kernighan_search(
+                tour, closed_distances, neighbours,
+                started + self.config.optimization.lk_time_budget
+            )
+            refined = self._oriented(self._tour_to_route(tour, start, end), distances, start, end)
+            refined_distance = self._calculate_route_distance(refined, distances)
+            # The search optimises the symmetrised matrix; keep the input
+            # route if that does not carry over to the original one
+            if refined_distance < initial_distance:
+                route = refined
+        
+        distance = self._calculate_route_distance(route, distances)
+        elapsed = time.perf_counter() - started
+        improvement = float(initial_distance - distance)
+        self.stats['lin_kernighan'] = {
+            'improvement': improvement,
+            'improvement_ratio': improvement / initial_distance if initial_distance > 0 else 0.0,
+            'seconds': elapsed
+        }
+        print(f"  Lin-Kernighan: {improvement:.1f}m shorter in {elapsed:.2f}s")
+        
+        return route, distance
+    
+    def _lin_kernighan_search(self, tour: Tour, distances: np.ndarray,
+                              neighbours: List[List[int]], deadline: float) -> int:
+        """
+        Run variable-depth moves on a tour until converged or out of time.
+        
+        Args:
+            tour: Tour to improve in place
+            distances: Distance matrix matching the tour's points
+            neighbours: Candidate neighbour lists per point
+            deadline: ``time.perf_counter()`` value at which to stop
+            
+        Returns:
+            Number of improving moves applied
+        """
+        threshold = self.config.optimization.tsp_improvement_threshold
+        max_depth = self.config.optimization.lk_max_depth
+        
+        moves = 0
+        while time.perf_counter() < deadline:
+            t1 = tour.next_active()
+            if t1 is None:
+                break
+            if self._lin_kernighan_move(tour, t1, distances, neighbours, threshold, max_depth):
+                moves += 1
+        
+        return moves
+    
+    def _lin_kernighan_move(self, tour: Tour, t1: int, distances: np.ndarray,
+                            neighbours: List[List[int]], threshold: float,
+                            max_depth: int) -> bool:
+        """
+        Apply the best improving variable-depth move anchored at ``t1``.
+        
+        The move is built as a chain of 2-opt moves that all keep ``t1`` as
+        an endpoint of the closing edge (t1, t2). Each step adds an edge from
+        the loose end t2 to a candidate neighbour t3 and removes (t3, t4),
+        choosing the step with the largest partial gain, and the chain stops
+        when the cumulative gain would turn non-positive. Edges added in a
+        chain are never removed again within it. The chain is rolled back to
+        the prefix with the best closed-tour gain.
+        
+        Args:
+            tour: Tour to modify in place
+            t1: Anchor point
+            distances: Distance matrix
+            neighbours: Candidate neighbour lists per point
+            threshold: Minimum gain for a move to count as improving
+            max_depth: Maximum number of 2-opt steps per chain
+            
+        Returns:
+            True if the tour was improved
+        """
+        for t2 in (tour.succ(t1), tour.pred(t1)):
+            gain = distances[t1, t2]
+            applied = []
+            added = set()
+            best_gain = threshold
+            best_depth = 0
+            
+            for _ in range(max_depth):
+                forward = tour.succ(t1) == t2
+                best_step = None
+                best_score = -np.inf
+                
+                for t3 in neighbours[t2]:
+                    g1 = gain - distances[t2, t3]
+                    if g1 <= 0:
+                        break
+                    t4 = tour.pred(t3) if forward else tour.succ(t3)
+                    if t3 == t1 or t4 == t2 or (min(t3, t4), max(t3, t4)) in added:
+                        continue
+                    score = distances[t3, t4] - distances[t2, t3]
+                    if score > best_score:
+                        best_score = score
+                        best_step = (t3, t4)
+                
+                if best_step is None:
+                    break
+                
+                t3, t4 = best_step
+                tour.two_opt_move(t1, t2, t4, t3)
+                applied.append((t1, t2, t4, t3))
+                added.add((min(t2, t3), max(t2, t3)))
+                gain += distances[t3, t4] - distances[t2, t3]
+                
+                closed_gain = gain - distances[t4, t1]
+                if closed_gain > best_gain:
+                    best_gain = closed_gain
+                    best_depth = len(applied)
+                t2 = t4
+            
+            # Undo the steps past the best closed tour, newest first
+            for a, b, c, d in reversed(applied[best_depth:]):
+                tour.two_opt_move(a, c, b, d)
+            
+            if best_depth:
+                for move in applied[:best_depth]:
+                    tour.wake(*move)
+                return True
+        
+        return False
+    
+    def _path_tour(self, route: List[int], distances: np.ndarray, candidates: np.ndarray,
+                   start: Optional[int] = None, end: Optional[int] = None,
+                   active: Optional[List[int]] = None) -> Tuple[Tour, np.ndarray, List[List[int]]]:
+        """
+        Close an open route into a cyclic ``Tour`` through a dummy node.
+        
+        The dummy node is appended as index n and costs nothing to reach
+        from any point, so cutting the optimal tour at the dummy yields the
+        optimal open path. A fixed start or end gets a bonus edge to the
+        dummy worth more than any route, so no improving move detaches it.
+        
+        Args:
+            route: Open route
+            distances: Distance matrix (n x n)
+            candidates: Candidate neighbour lists for ``distances``
+            start: Point that must stay first, or None for a free start
+            end: Point that must stay last, or None for a free end
+            active: Points to wake initially. If None, every point.
+            
+        Returns:
+            Tuple of (tour, closed_distances, neighbours) where
+            closed_distances is (n + 1) x (n + 1) and neighbours lists the
+            dummy first for every point
+        """
+        n = distances.shape[0]
+        bonus = -(float(np.abs(distances).max()) * (n + 1) + 1.0)
+        
+        closed = np.zeros((n + 1, n + 1))
+        closed[:n, :n] = distances
+        for fixed in (start, end):
+            if fixed is not None:
+                closed[n, fixed] = closed[fixed, n] = bonus
+        
+        # The dummy is every point's cheapest neighbour, which lets 2-opt
+        # and Or-opt move the free ends. It needs no candidates of its own.
+        neighbours = [[n] + row for row in candidates.tolist()] + [[]]
+        
+        return Tour(list(route) + [n], active), closed, neighbours
+    
+    def _tour_to_route(self, tour: Tour, start: Optional[int] = None,
+                       end: Optional[int] = None) -> List[int]:
+        """
+        Cut a tour built by ``_path_tour`` back into an open route.
+        
+        Args:
+            tour: Tour containing the dummy node n
+            start: Point that must come first, if fixed
+            end: Point that must come last, if fixed
+            
+        Returns:
+            Open route without the dummy node
+        """
+        route = tour.path_after(tour.n - 1)
+        if (start is not None and route[0] != start) or (
+                start is None and end is not None and route[-1] != end):
+            route.reverse()
+        return route
+    
+    def _keep_direction(self, route: List[int], reference: List[int],
+                        start: Optional[int] = None, end: Optional[int] = None) -> List[int]:
+        """
+        Orient a re-optimised route like the route it was derived from.
+        
+        Local search may return a route with free endpoints reversed; keeping
+        the previous walking direction makes updates easier to follow.
+        
+        Args:
+            route: Re-optimised route
+            reference: Route it was derived from
+            start: Fixed start, if any
+            end: Fixed end, if any
+            
+        Returns:
+            Route or its reverse
+        """
+        if start is not None or end is not None or not reference:
+            return route
+        if route.index(reference[0]) > len(route) // 2:
+            return route[::-1]
+        return route
+    
+    def _oriented(self, route: List[int], distances: np.ndarray,
+                  start: Optional[int] = None, end: Optional[int] = None) -> List[int]:
+        """
+        Pick the cheaper walking direction of a route with free endpoints.
+        
+        Args:
+            route: Open route
+            distances: Original (possibly asymmetric) distance matrix
+            start: Fixed start, if any
+            end: Fixed end, if any
+            
+        Returns:
+            Route or its reverse
+        """
+        if start is not None or end is not None:
+            return route
+        reverse = route[::-1]
+        # Only switch for a strictly shorter direction so ties keep the input
+        if self._calculate_route_distance(reverse, distances) < self._calculate_route_distance(route, distances):
+            return reverse
+        return route
+    
+    def _search_matrix(self, distances: np.ndarray) -> np.ndarray:
+        """
+        Matrix used for move evaluation during local search.
+        
+        Road distance matrices are slightly asymmetric, which breaks the
+        edge-only delta of a segment reversal. The search runs on the
+        symmetrised matrix in that case; callers report route lengths on the
+        original matrix.
+        
+        Args:
+            distances: Distance matrix
+            
+        Returns:
+            Symmetric float matrix
+        """
+        distances = np.asarray(distances, dtype=float)
+        if np.array_equal(distances, distances.T):
+            return distances
+        return (distances + distances.T) / 2
+    
+    def _candidate_lists(self, distances: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+        """
+        Build k-nearest candidate neighbour lists for local search.
+        
+        Args:
+            distances: Distance matrix
+            k: Number of neighbours per point. Defaults to
+                ``OptimizationConfig.candidate_neighbors``.
+            
+        Returns:
+            Integer array (n x k) of neighbour indices, nearest first
+        """
+        n = distances.shape[0]
+        if k is None:
+            k = self.config.optimization.candidate_neighbors
+        k = max(0, min(k, n - 1))
+        if k == 0:
+            return np.empty((n, 0), dtype=np.intp)
+        
+        masked = np.array(distances, dtype=float)
+        np.fill_diagonal(masked, np.inf)
+        
+        if k < n - 1:
+            nearest = np.argpartition(masked, k - 1, axis=1)[:, :k]
+        else:
+            nearest = np.tile(np.arange(n), (n, 1))
         
-        return current_route, current_distance
+        rows = np.arange(n)[:, None]
+        order = np.argsort(masked[rows, nearest], axis=1, kind='stable')
+        return nearest[rows, order][:, :k]
     
     def _calculate_route_distance(self, route: List[int], distances: np.ndarray) -> float:
         """
@@ -159,6 +2051,8 @@ class TSPSolver:
         """
         if len(route) <= 1:
             return 0.0
+        if self.kernels is not None and isinstance(distances, np.ndarray):
+            return float(self.kernels.route_distance(np.asarray(route, dtype=np.int64), distances))
         
         total = 0.0
         for i in range(len(route) - 1):
@@ -81,7 +81,15 @@ class GeoJSONExporter:
                 "last_updated": datetime.now().isoformat(),
                 "total_districts": len(results),
                 "total_optimization_points": sum(len(result['locations']) for result in results.values()),
-                "total_completed_points": len(done_boards) if not done_boards.empty else 0
+                "total_completed_points": len(done_boards) if not done_boards.empty else 0,
+                # (distance - lower bound) / lower bound per district; None if unknown
+                "optimality_gaps": {
+                    district_name: (
+                        round(result['optimality_gap'], 4)
+                        if result.get('optimality_gap') is not None else None
+                    )
+                    for district_name, result in results.items()
+                }
             }
         }
     
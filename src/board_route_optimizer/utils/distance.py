@@ -2,18 +2,206 @@
 Distance calculation utilities.
 """
 
+import random
+import sqlite3
+import threading
 import numpy as np
 import requests
 import time
-from typing import List, Tuple
-from geopy.distance import geodesic
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
 
 from ..config import Config
+from .rate_limit import TokenBucket
+from .road_cache import RoadDistanceCache
+
+
+# WGS-84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+# Mean Earth radius for the spherical formulas
+EARTH_RADIUS = 6371008.8
+
+STRAIGHT_LINE_METHODS = ('ellipsoidal', 'haversine', 'equirectangular')
+
+# File of the persistent road distance cache in DataConfig.cache_directory
+ROAD_CACHE_FILENAME = "road_distances.sqlite"
+# Token bucket state shared by all runs, in DataConfig.cache_directory
+RATE_LIMIT_FILENAME = "openrouteservice.ratelimit"
+
+# One matrix tile: (locations, source indices, destination indices)
+TileRequest = Tuple[Sequence[Tuple[float, float]], List[int], List[int]]
+
+# Point pairs evaluated per NumPy pass, to bound temporary memory
+PAIR_CHUNK = 1_000_000
+
+
+def straight_line_distances(origins: np.ndarray, destinations: np.ndarray,
+                            method: str = 'ellipsoidal') -> np.ndarray:
+    """
+    Straight-line distances from every origin to every destination.
+    
+    "ellipsoidal" is Vincenty's inverse formula on the WGS-84 ellipsoid,
+    iterated for all pairs at once; it agrees with ``geopy``'s geodesic to
+    well under a millimetre at city scale. "haversine" uses a sphere
+    (error up to about 0.5%), computed from the chord between unit
+    vectors. "equirectangular" projects all points onto one plane at
+    their mean latitude, which is fastest and accurate to a fraction of a
+    percent across a city. The spherical and planar methods do their
+    trigonometry once per point, not once per pair.
+    
+    Args:
+        origins: Array (m x 2) of (lon, lat) in degrees
+        destinations: Array (k x 2) of (lon, lat) in degrees
+        method: One of ``STRAIGHT_LINE_METHODS``
+        
+    Returns:
+        Distance matrix (m x k) in meters
+    """
+    origins = np.asarray(origins, dtype=float).reshape(-1, 2)
+    destinations = np.asarray(destinations, dtype=float).reshape(-1, 2)
+    if method not in STRAIGHT_LINE_METHODS:
+        raise ValueError(f"Unknown straight-line method: {method}")
+    
+    if method == 'equirectangular':
+        reference = np.radians(np.concatenate((origins[:, 1], destinations[:, 1])).mean())
+        scale = EARTH_RADIUS * np.array([np.cos(reference), 1.0])
+        origin_points = np.radians(origins) * scale
+        destination_points = np.radians(destinations) * scale
+    elif method == 'haversine':
+        origin_points, destination_points = _unit_vectors(origins), _unit_vectors(destinations)
+    
+    distances = np.empty((len(origins), len(destinations)))
+    rows = max(1, PAIR_CHUNK // max(len(destinations), 1))
+    for first in range(0, len(origins), rows):
+        block = slice(first, first + rows)
+        if method == 'ellipsoidal':
+            distances[block] = vincenty_distances(
+                origins[block, 0, None], origins[block, 1, None],
+                destinations[None, :, 0], destinations[None, :, 1]
+            )
+            continue
+        # Squared differences summed one axis at a time, in place
+        length = distances[block]
+        length[:] = 0.0
+        for axis in range(origin_points.shape[1]):
+            difference = np.subtract.outer(origin_points[block, axis], destination_points[:, axis])
+            difference *= difference
+            length += difference
+        np.sqrt(length, out=length)
+        if method == 'haversine':
+            # Great-circle arc subtending a chord of this length
+            np.minimum(length / 2, 1.0, out=length)
+            np.arcsin(length, out=length)
+            length *= 2 * EARTH_RADIUS
+    return distances
+
+
+def straight_line_matrix(coordinates: np.ndarray, method: str = 'ellipsoidal') -> np.ndarray:
+    """
+    Symmetric straight-line distance matrix with a zero diagonal.
+    
+    The ellipsoidal formula is evaluated on the upper triangle only.
+    
+    Args:
+        coordinates: Array (n x 2) of (lon, lat) in degrees
+        method: One of ``STRAIGHT_LINE_METHODS``
+        
+    Returns:
+        Distance matrix (n x n) in meters
+    """
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    if method != 'ellipsoidal':
+        distances = straight_line_distances(coordinates, coordinates, method)
+        np.fill_diagonal(distances, 0.0)
+        return distances
+    
+    n = len(coordinates)
+    first, second = np.triu_indices(n, k=1)
+    pair_distances = np.empty(len(first))
+    for start in range(0, len(first), PAIR_CHUNK):
+        i = first[start:start + PAIR_CHUNK]
+        j = second[start:start + PAIR_CHUNK]
+        pair_distances[start:start + PAIR_CHUNK] = vincenty_distances(
+            coordinates[i, 0], coordinates[i, 1], coordinates[j, 0], coordinates[j, 1]
+        )
+    distances = np.zeros((n, n))
+    distances[first, second] = pair_distances
+    distances[second, first] = pair_distances
+    return distances
+
+
+def vincenty_distances(lon1: np.ndarray, lat1: np.ndarray,
+                       lon2: np.ndarray, lat2: np.ndarray) -> np.ndarray:
+    """
+    Element-wise WGS-84 distances by Vincenty's inverse formula.
+    
+    The iteration runs on whole arrays until every pair has converged.
+    It may fail to converge for nearly antipodal points, which never
+    occur within one city.
+    
+    Args:
+        lon1: Longitudes of the first points (degrees)
+        lat1: Latitudes of the first points (degrees)
+        lon2: Longitudes of the second points (degrees)
+        lat2: Latitudes of the second points (degrees)
+        
+    Returns:
+        Distances in meters, broadcast over the inputs
+    """
+    a, f = WGS84_A, WGS84_F
+    b = (1 - f) * a
+    L = np.radians(lon2) - np.radians(lon1)
+    U1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    U2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+    sin_u1, cos_u1 = np.sin(U1), np.cos(U1)
+    sin_u2, cos_u2 = np.sin(U2), np.cos(U2)
+    
+    lam = L
+    for _ in range(100):
+        sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+        sin_sigma = np.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+        cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+        sigma = np.arctan2(sin_sigma, cos_sigma)
+        # Coincident points have sin_sigma = 0 and distance 0
+        sin_alpha = np.divide(cos_u1 * cos_u2 * sin_lam, sin_sigma,
+                              out=np.zeros_like(sin_sigma), where=sin_sigma > 0)
+        cos2_alpha = 1 - sin_alpha ** 2
+        # Lines along the equator have cos2_alpha = 0
+        cos_2sigma_m = cos_sigma - np.divide(2 * sin_u1 * sin_u2, cos2_alpha,
+                                             out=np.zeros_like(cos2_alpha), where=cos2_alpha > 0)
+        C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+        previous = lam
+        lam = L + (1 - C) * f * sin_alpha * (
+            sigma + C * sin_sigma * (cos_2sigma_m + C * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2))
+        )
+        if np.all(np.abs(lam - previous) < 1e-12):
+            break
+    
+    u2 = cos2_alpha * (a * a - b * b) / (b * b)
+    A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    delta_sigma = B * sin_sigma * (cos_2sigma_m + B / 4 * (
+        cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+        - B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+    ))
+    return b * A * (sigma - delta_sigma)
+
+
+def _unit_vectors(coordinates: np.ndarray) -> np.ndarray:
+    """Points on the unit sphere for (lon, lat) in degrees."""
+    lon, lat = np.radians(coordinates[:, 0]), np.radians(coordinates[:, 1])
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
 
 
 class DistanceCalculator:
     """Calculates distances between points using various methods."""
     
+    # OpenRouteService routing profile of every matrix request
+    PROFILE = 'foot-walking'
+    
     def __init__(self, config: Config):
         """
         Initialize distance calculator.
@@ -22,7 +210,17 @@ class DistanceCalculator:
             config: Configuration object
         """
         self.config = config
-        self.last_request_time = 0
+        # One request per request_delay, shared with other threads and runs
+        self.rate_limiter = TokenBucket(
+            rate=1.0 / config.api.request_delay if config.api.request_delay > 0 else 0.0,
+            burst=config.api.rate_limit_burst,
+            path=Path(config.data.cache_directory) / RATE_LIMIT_FILENAME
+        )
+        # Opened on the first road distance request
+        self._road_cache: Optional[RoadDistanceCache] = None
+        self._road_cache_failed = False
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
     
     def calculate_matrix(self, locations: List[Tuple[float, float]], 
                         use_api: bool = True) -> Tuple[np.ndarray, np.ndarray]:
@@ -47,45 +245,516 @@ class DistanceCalculator:
     
     
     
-    def _get_road_distance_matrix(self, locations: List[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    def extend_matrix(self, locations: List[Tuple[float, float]],
+                      distances: np.ndarray, durations: np.ndarray,
+                      use_api: bool = True) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Get road distance matrix using OpenRouteService API.
+        Extend known matrices to locations appended at the end of the list.
+        
+        Only the rows and columns of the new locations are computed, so the
+        cost grows with the number of new locations times the total.
+        
+        Args:
+            locations: List of (lon, lat) coordinates; the first
+                ``len(distances)`` entries must match the known matrices
+            distances: Known distance matrix of the leading locations
+            durations: Known duration matrix of the leading locations
+            use_api: Whether to use API for road distances
+            
+        Returns:
+            Tuple of (distance_matrix, duration_matrix) over all locations
+        """
+        return self.update_matrix(locations, distances, durations, use_api=use_api)
+    
+    def update_matrix(self, locations: List[Tuple[float, float]],
+                      distances: np.ndarray, durations: np.ndarray,
+                      changed: Sequence[int] = (),
+                      use_api: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Update known matrices for moved and appended locations.
+        
+        Entries between unchanged locations are kept. Only the rows of the
+        k changed locations and their columns towards the others are
+        computed, i.e. about 2kn pairs instead of n², requested from the
+        API as source/destination blocks or computed on the straight-line
+        path.
+        
+        Args:
+            locations: List of (lon, lat) coordinates, with the current
+                coordinates of moved locations; the first ``len(distances)``
+                entries are the locations of the known matrices
+            distances: Known distance matrix of the leading locations
+            durations: Known duration matrix of the leading locations
+            changed: Indices of leading locations whose coordinates changed;
+                appended locations are always computed
+            use_api: Whether to use API for road distances
+            
+        Returns:
+            Tuple of (distance_matrix, duration_matrix) over all locations
+        """
+        known = distances.shape[0]
+        n = len(locations)
+        changed_indices = sorted(set(int(i) for i in changed if i < known) | set(range(known, n)))
+        changed_set = set(changed_indices)
+        unchanged_indices = [i for i in range(n) if i not in changed_set]
+        
+        full_distances = np.zeros((n, n))
+        full_durations = np.zeros((n, n))
+        full_distances[:known, :known] = distances
+        full_durations[:known, :known] = durations
+        if not changed_indices:
+            return full_distances, full_durations
+        
+        def compute(block_function):
+            rows = block_function(locations, changed_indices, list(range(n)))
+            if not unchanged_indices:
+                empty = np.empty((0, len(changed_indices)))
+                return rows, (empty, empty)
+            return rows, block_function(locations, unchanged_indices, changed_indices)
+        
+        blocks = None
+        if use_api and self.config.api.api_key:
+            try:
+                blocks = compute(self._get_road_distance_block)
+            except Exception as e:
+                print(f"API error: {e}")
+                print("Falling back to straight-line distances.")
+        if blocks is None:
+            blocks = compute(self._calculate_straight_distance_block)
+        
+        (rows_distance, rows_duration), (cols_distance, cols_duration) = blocks
+        full_distances[changed_indices, :] = rows_distance
+        full_durations[changed_indices, :] = rows_duration
+        full_distances[np.ix_(unchanged_indices, changed_indices)] = cols_distance
+        full_durations[np.ix_(unchanged_indices, changed_indices)] = cols_duration
+        
+        return full_distances, full_durations
+    
+    def _get_road_distance_block(self, locations: List[Tuple[float, float]],
+                                 sources: List[int],
+                                 destinations: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get road distances from some locations to others.
+        
+        Pairs found in the persistent road distance cache are not requested
+        again; the missing ones are fetched from OpenRouteService and added
+        to the cache. When nothing is missing, no request is made at all.
         
         Args:
             locations: List of (lon, lat) coordinates
+            sources: Indices of origin locations
+            destinations: Indices of destination locations
             
         Returns:
-            Tuple of (distance_matrix, duration_matrix)
+            Tuple of (distance_block, duration_block) shaped
+            (len(sources), len(destinations))
+        """
+        sources, destinations = list(sources), list(destinations)
+        cache = self._get_road_cache()
+        if cache is None:
+            return self._request_road_block(locations, sources, destinations)
+        
+        distances, durations, blocks = self._cached_road_block(cache, locations, sources, destinations)
+        tiles = [
+            (rows[row_slice], columns[column_slice])
+            for rows, columns in blocks
+            for row_slice, column_slice in self._tiles(len(rows), len(columns))
+        ]
+        if len(tiles) > 1:
+            print(f"Requesting missing road distances in {len(tiles)} tiles")
+        results = self._fetch_tiles([
+            (locations, [sources[row] for row in rows], [destinations[column] for column in columns])
+            for rows, columns in tiles
+        ], cache)
+        for (rows, columns), (tile_distances, tile_durations) in zip(tiles, results):
+            distances[np.ix_(rows, columns)] = tile_distances
+            durations[np.ix_(rows, columns)] = tile_durations
+        
+        return distances, durations
+    
+    def prefetch_road_distances(self, location_lists: List[List[Tuple[float, float]]]) -> int:
         """
-        self._wait_for_rate_limit()
+        Fill the road distance cache for several matrices in one concurrent pass.
         
-        url = f"{self.config.api.openrouteservice_base_url}/matrix/foot-walking"
+        All missing tiles of all matrices are fetched together, so a
+        multi-district run keeps the API busy at its rate limit instead of
+        paying each district's latency in turn. Later ``calculate_matrix``
+        calls then read the matrices from the cache.
+        
+        Args:
+            location_lists: Locations of each matrix, e.g. one per district
+            
+        Returns:
+            Number of tiles requested (0 if there is no API key or cache)
+        """
+        cache = self._get_road_cache()
+        if cache is None or not self.config.api.api_key:
+            return 0
+        
+        requests_needed: List[TileRequest] = []
+        for locations in location_lists:
+            indices = list(range(len(locations)))
+            _, _, blocks = self._cached_road_block(cache, locations, indices, indices, verbose=False)
+            for rows, columns in blocks:
+                for row_slice, column_slice in self._tiles(len(rows), len(columns)):
+                    requests_needed.append(
+                        (locations, rows[row_slice].tolist(), columns[column_slice].tolist())
+                    )
+        
+        if requests_needed:
+            print(f"Prefetching road distances for {len(location_lists)} matrices "
+                  f"in {len(requests_needed)} requests...")
+            self._fetch_tiles(requests_needed, cache)
+        return len(requests_needed)
+    
+    def _cached_road_block(self, cache: RoadDistanceCache, locations: Sequence[Tuple[float, float]],
+                           sources: List[int], destinations: List[int],
+                           verbose: bool = True) -> Tuple[np.ndarray, np.ndarray, List[Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Read a block from the road distance cache.
+        
+        Args:
+            cache: Road distance cache
+            locations: List of (lon, lat) coordinates
+            sources: Indices of origin locations
+            destinations: Indices of destination locations
+            verbose: Report how much of the block was cached
+            
+        Returns:
+            Tuple of (distance_block, duration_block, missing_blocks); the
+            blocks are NaN where not cached or unreachable, and missing_blocks lists
+            (row_indices, column_indices) covering the gaps
+        """
+        keys = cache.keys(locations)
+        try:
+            distances, durations = cache.lookup(self.PROFILE, keys, sources, destinations)
+        except sqlite3.Error as e:
+            print(f"Road distance cache lookup failed: {e}")
+            distances = np.full((len(sources), len(destinations)), np.nan)
+            durations = np.full((len(sources), len(destinations)), np.nan)
+        # A place is at distance 0 from itself
+        same_place = np.equal.outer(keys[sources], keys[destinations])
+        distances[same_place] = 0.0
+        durations[same_place] = 0.0
+        
+        missing = np.isnan(distances)
+        if verbose:
+            print(f"Road distances: {missing.size - int(missing.sum())} of {missing.size} pairs from cache")
+        # Pairs cached as unreachable read as NaN, like a fresh API response
+        unreachable = np.isinf(distances)
+        distances[unreachable] = np.nan
+        durations[unreachable] = np.nan
+        return distances, durations, self._missing_blocks(missing)
+    
+    def _missing_blocks(self, missing: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Cover the missing pairs of a block with few, small rectangular requests.
+        
+        One rectangle spans every row and column with a missing pair. When
+        a few locations are missing almost everything (e.g. newly added
+        boards), their rows are requested in full and the other rows only
+        for the columns they lack, if that requests fewer pairs.
+        
+        Args:
+            missing: Boolean block, True where a pair is not known
+            
+        Returns:
+            List of (row_indices, column_indices) to request
+        """
+        rows = np.flatnonzero(missing.any(axis=1))
+        columns = np.flatnonzero(missing.any(axis=0))
+        if not len(rows):
+            return []
+        single = [(rows, columns)]
+        
+        dense = np.flatnonzero(missing.mean(axis=1) > 0.5)
+        if not len(dense) or len(dense) == len(rows):
+            return single
+        rest = np.setdiff1d(rows, dense)
+        split = [(dense, columns), (rest, np.flatnonzero(missing[rest].any(axis=0)))]
+        if sum(len(r) * len(c) for r, c in split) < len(rows) * len(columns):
+            return split
+        return single
+    
+    def _get_road_cache(self) -> Optional[RoadDistanceCache]:
+        """
+        Open the persistent road distance cache on first use.
+        
+        Returns:
+            The cache, or None if disabled or it cannot be opened
+        """
+        if self._road_cache is None and self.config.data.road_cache and not self._road_cache_failed:
+            try:
+                self._road_cache = RoadDistanceCache(
+                    Path(self.config.data.cache_directory) / ROAD_CACHE_FILENAME,
+                    ttl_days=self.config.data.road_cache_ttl_days,
+                    max_pairs=self.config.data.road_cache_max_pairs
+                )
+            except (sqlite3.Error, OSError) as e:
+                print(f"Road distance cache unavailable: {e}")
+                self._road_cache_failed = True
+        return self._road_cache
+    
+    def _request_road_block(self, locations: List[Tuple[float, float]],
+                            sources: List[int],
+                            destinations: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Request road distances from some locations to others, in tiles.
+        
+        The block is split into source x destination tiles within
+        ``APIConfig.matrix_max_elements`` (see ``_tiles``), which are
+        fetched concurrently and stitched back together.
+        
+        Args:
+            locations: List of (lon, lat) coordinates
+            sources: Indices of origin locations
+            destinations: Indices of destination locations
+            
+        Returns:
+            Tuple of (distance_block, duration_block) shaped
+            (len(sources), len(destinations)); NaN where no route exists
+        """
+        distances = np.empty((len(sources), len(destinations)))
+        durations = np.empty((len(sources), len(destinations)))
+        tiles = self._tiles(len(sources), len(destinations))
+        if len(tiles) > 1:
+            print(f"Requesting {len(sources)}x{len(destinations)} road distances in {len(tiles)} tiles")
+        
+        results = self._fetch_tiles(
+            [(locations, sources[rows], destinations[columns]) for rows, columns in tiles]
+        )
+        for (rows, columns), (tile_distances, tile_durations) in zip(tiles, results):
+            distances[rows, columns] = tile_distances
+            durations[rows, columns] = tile_durations
+        
+        return distances, durations
+    
+    def _fetch_tiles(self, tile_requests: List[TileRequest],
+                     cache: Optional[RoadDistanceCache] = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Fetch matrix tiles on up to ``APIConfig.max_concurrent_requests`` threads.
+        
+        Every request still takes a token from the shared rate limiter, so
+        concurrency only hides latency; it never raises the request rate.
+        Each tile is stored in the cache as soon as it arrives.
+        
+        Args:
+            tile_requests: Tiles to fetch
+            cache: Road distance cache to store the tiles in, if any
+            
+        Returns:
+            (distance_tile, duration_tile) per request, in request order
+        """
+        results: List[Optional[Tuple[np.ndarray, np.ndarray]]] = [None] * len(tile_requests)
+        
+        def finish(k: int, result: Tuple[np.ndarray, np.ndarray]) -> None:
+            results[k] = result
+            if cache is None:
+                return
+            locations, sources, destinations = tile_requests[k]
+            try:
+                cache.store(self.PROFILE, cache.keys(locations), sources, destinations, *result)
+            except sqlite3.Error as e:
+                print(f"Could not update road distance cache: {e}")
+        
+        workers = min(self.config.api.max_concurrent_requests, len(tile_requests))
+        if workers <= 1:
+            for k, request in enumerate(tile_requests):
+                finish(k, self._request_road_tile(*request))
+            return results
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._request_road_tile, *request): k
+                for k, request in enumerate(tile_requests)
+            }
+            try:
+                for future in as_completed(futures):
+                    finish(futures[future], future.result())
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return results
+    
+    def _tiles(self, n_sources: int, n_destinations: int) -> List[Tuple[slice, slice]]:
+        """
+        Split a block into tiles of at most ``APIConfig.matrix_max_elements`` pairs.
+        
+        Tiles span as many destinations as the limit allows and then as
+        many sources as still fit, which keeps the number of requests low.
+        
+        Args:
+            n_sources: Number of block rows
+            n_destinations: Number of block columns
+            
+        Returns:
+            List of (row_slice, column_slice)
+        """
+        limit = self.config.api.matrix_max_elements
+        if limit <= 0 or n_sources * n_destinations <= limit:
+            return [(slice(0, n_sources), slice(0, n_destinations))]
+        width = min(n_destinations, limit)
+        height = max(1, limit // width)
+        return [
+            (slice(row, row + height), slice(column, column + width))
+            for row in range(0, n_sources, height)
+            for column in range(0, n_destinations, width)
+        ]
+    
+    def _request_road_tile(self, locations: List[Tuple[float, float]],
+                           sources: List[int],
+                           destinations: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Request one matrix tile from OpenRouteService.
+        
+        Only the locations taking part are sent.
+        
+        Args:
+            locations: List of (lon, lat) coordinates
+            sources: Indices of origin locations
+            destinations: Indices of destination locations
+            
+        Returns:
+            Tuple of (distance_tile, duration_tile) shaped
+            (len(sources), len(destinations)); NaN where no route exists
+        """
+        url = f"{self.config.api.openrouteservice_base_url}/matrix/{self.PROFILE}"
         headers = {
             'Authorization': self.config.api.api_key,
             'Content-Type': 'application/json'
         }
         
-        coordinates = [[loc[0], loc[1]] for loc in locations]
+        involved = sorted(set(sources) | set(destinations))
+        position = {point: k for k, point in enumerate(involved)}
         data = {
-            'locations': coordinates,
+            'locations': [[locations[point][0], locations[point][1]] for point in involved],
+            'sources': [position[point] for point in sources],
+            'destinations': [position[point] for point in destinations],
             'metrics': ['distance', 'duration']
         }
         
-        response = requests.post(
-            url, 
-            json=data, 
-            headers=headers, 
-            timeout=self.config.api.timeout
+        retries = max(self.config.api.max_retries, 0)
+        for attempt in range(retries + 1):
+            self._wait_for_rate_limit()
+            try:
+                response = self._get_session().post(
+                    url,
+                    json=data,
+                    headers=headers,
+                    timeout=self.config.api.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error: Exception = e
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code == 200:
+                    result = response.json()
+                    return np.array(result['distances'], dtype=float), np.array(result['durations'], dtype=float)
+                error = Exception(f"HTTP {response.status_code}: {response.text}")
+                # Only rate limiting and server errors are worth retrying
+                if response.status_code != 429 and response.status_code < 500:
+                    raise error
+                delay = self._retry_delay(response, attempt)
+            
+            if attempt < retries:
+                print(f"  Matrix request failed ({error}); retry {attempt + 1}/{retries} in {delay:.1f}s")
+                time.sleep(delay)
+        
+        raise error
+    
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """
+        Seconds to wait before retrying a rejected request.
+        
+        Honours a Retry-After header (seconds or HTTP date), otherwise
+        falls back to exponential backoff.
+        
+        Args:
+            response: Rejected response
+            attempt: Number of the failed attempt, from 0
+            
+        Returns:
+            Delay in seconds
+        """
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+            try:
+                return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+        return self._backoff(attempt)
+    
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter, so that workers do not retry in step."""
+        return self.config.api.retry_backoff * 2 ** attempt * random.uniform(1.0, 1.25)
+    
+    def _get_session(self) -> requests.Session:
+        """
+        HTTP session shared by all request threads.
+        
+        Its connection pool keeps one keep-alive connection per concurrent
+        request, reused across tiles and districts.
+        
+        Returns:
+            The session, created on first use
+        """
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=max(self.config.api.max_concurrent_requests, 1)
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._session = session
+            return self._session
+    
+    def _calculate_straight_distance_block(self, locations: List[Tuple[float, float]],
+                                           sources: List[int],
+                                           destinations: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate straight-line distances from some locations to others.
+        
+        Args:
+            locations: List of (lon, lat) coordinates
+            sources: Indices of origin locations
+            destinations: Indices of destination locations
+            
+        Returns:
+            Tuple of (distance_block, duration_block) shaped
+            (len(sources), len(destinations))
+        """
+        coordinates = np.asarray(locations, dtype=float).reshape(-1, 2)
+        distances = straight_line_distances(
+            coordinates[list(sources)], coordinates[list(destinations)],
+            self.config.optimization.straight_line_method
         )
+        # A location is at distance 0 from itself
+        distances[np.equal.outer(np.asarray(sources), np.asarray(destinations))] = 0.0
         
-        if response.status_code == 200:
-            result = response.json()
-            distances = np.array(result['distances'])
-            durations = np.array(result['durations'])
-            print(f"Road distance matrix obtained ({len(locations)} points)")
-            return distances, durations
-        else:
-            raise Exception(f"HTTP {response.status_code}: {response.text}")
+        # Estimate duration based on walking speed
+        return distances, distances / self.config.optimization.walking_speed_ms
+    
+    def _get_road_distance_matrix(self, locations: List[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get road distance matrix using OpenRouteService API.
+        
+        Args:
+            locations: List of (lon, lat) coordinates
+            
+        Returns:
+            Tuple of (distance_matrix, duration_matrix)
+        """
+        indices = list(range(len(locations)))
+        distances, durations = self._get_road_distance_block(locations, indices, indices)
+        print(f"Road distance matrix obtained ({len(locations)} points)")
+        return distances, durations
     
     def _calculate_straight_distance_matrix(self, locations: List[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -97,29 +766,12 @@ class DistanceCalculator:
         Returns:
             Tuple of (distance_matrix, duration_matrix)
         """
-        n = len(locations)
-        distances = np.zeros((n, n))
-        durations = np.zeros((n, n))
-        
-        for i in range(n):
-            for j in range(i + 1, n):
-                coord1 = (locations[i][1], locations[i][0])  # (lat, lon)
-                coord2 = (locations[j][1], locations[j][0])  # (lat, lon)
-                
-                dist = geodesic(coord1, coord2).meters
-                # Estimate duration based on walking speed
-                duration = dist / self.config.optimization.walking_speed_ms
-                
-                distances[i][j] = dist
-                distances[j][i] = dist
-                durations[i][j] = duration
-                durations[j][i] = duration
+        distances = straight_line_matrix(locations, self.config.optimization.straight_line_method)
+        # Estimate duration based on walking speed, in the same pass
+        durations = distances / self.config.optimization.walking_speed_ms
         
         return distances, durations
     
     def _wait_for_rate_limit(self) -> None:
-        """Wait for rate limit if necessary."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.config.api.request_delay:
-            time.sleep(self.config.api.request_delay - elapsed)
-        self.last_request_time = time.time()
\ No newline at end of file
+        """Wait for a token from the shared rate limiter."""
+        self.rate_limiter.acquire()
\ No newline at end of file
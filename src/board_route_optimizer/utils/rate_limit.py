@@ -0,0 +1,109 @@
+"""
+Token-bucket rate limiting shared across threads and processes.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: the bucket is shared between threads only
+    fcntl = None
+
+
+class TokenBucket:
+    """
+    Token bucket that spaces requests to a steady rate with a small burst.
+
+    The bucket is kept in its "theoretical arrival time" form (GCRA): a
+    single timestamp after which the bucket is full again. Acquiring a
+    token advances it by one interval; a caller waits while it lies more
+    than ``burst`` intervals ahead. With a state file the timestamp is
+    read and written under an exclusive file lock, so every process using
+    the same file shares one bucket; threads share it through a lock.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, path: Optional[str] = None):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens per second (0 = unlimited)
+            burst: Tokens that may be taken at once after an idle period
+            path: State file shared between processes, or None for this
+                process only
+        """
+        self.rate = rate
+        self.burst = max(int(burst), 1)
+        self.path = Path(path) if path is not None and fcntl is not None else None
+        self._lock = threading.Lock()
+        self._full_at = 0.0
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until one is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            wait = self._try_acquire()
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def _try_acquire(self) -> float:
+        """
+        Take a token if one is available.
+
+        Returns:
+            0 if a token was taken, else seconds until the next one
+        """
+        interval = 1.0 / self.rate
+        with self._lock:
+            if self.path is None:
+                self._full_at, wait = self._advance(self._full_at, interval)
+                return wait
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a+') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    text = f.read().strip()
+                    full_at = float(text) if text else 0.0
+                    full_at, wait = self._advance(full_at, interval)
+                    if wait <= 0:
+                        f.seek(0)
+                        f.truncate()
+                        f.write(repr(full_at))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    return wait
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _advance(self, full_at: float, interval: float) -> Tuple[float, float]:
+        """
+        Apply one acquisition to the bucket state.
+
+        Args:
+            full_at: Time at which the bucket is full again
+            interval: Seconds per token
+
+        Returns:
+            Tuple of (new full_at, seconds to wait; 0 if the token was taken)
+        """
+        now = time.time()
+        full_at = max(full_at, now)
+        earliest = full_at - (self.burst - 1) * interval
+        if now + 1e-9 < earliest:
+            return full_at, earliest - now
+        return full_at + interval, 0.0
@@ -0,0 +1,232 @@
+"""
+Persistent cache of road distances between coordinate pairs.
+"""
+
+import contextlib
+import sqlite3
+import time
+import numpy as np
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+
+# Coordinates are rounded to this many decimals (about 0.1 m) for the key
+KEY_DECIMALS = 6
+
+# Access times are refreshed at most this often (seconds), to keep reads cheap
+ACCESS_RESOLUTION = 86400
+
+# Stored distance and duration of pairs the router found no route between
+UNREACHABLE = -1.0
+
+
+class RoadDistanceCache:
+    """
+    SQLite cache of road distance and duration per directed coordinate pair.
+
+    Pairs are keyed by routing profile and by the rounded (lon, lat) of
+    both ends, so a location is found again whichever district or matrix
+    it appears in. Pairs without a route are stored too, so they are not
+    requested again. Entries older than the TTL are ignored and purged;
+    when the cache grows past its size limit, the least recently used
+    pairs are evicted (access times are tracked to the day).
+
+    Every operation opens its own connection. SQLite's file locks (with a
+    busy timeout, in WAL mode) let concurrent runs read and write the same
+    cache file safely; each write is one immediate transaction.
+    """
+
+    def __init__(self, path: str, ttl_days: float = 0.0, max_pairs: int = 0,
+                 timeout: float = 30.0):
+        """
+        Initialize road distance cache.
+
+        Args:
+            path: SQLite database file (created if missing)
+            ttl_days: Age in days after which pairs are stale (0 = never)
+            max_pairs: Maximum number of stored pairs (0 = unlimited)
+            timeout: Seconds to wait for another process's lock
+        """
+        self.path = Path(path)
+        self.ttl_days = ttl_days
+        self.max_pairs = max_pairs
+        self.timeout = timeout
+        # Upper bound on the stored pairs, counted exactly only near max_pairs
+        self._size_estimate: Optional[int] = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS pairs ("
+                " profile TEXT NOT NULL, origin INTEGER NOT NULL, destination INTEGER NOT NULL,"
+                " distance REAL NOT NULL, duration REAL NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL,"
+                " PRIMARY KEY (profile, origin, destination)) WITHOUT ROWID"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS pairs_accessed ON pairs (accessed)")
+
+    @staticmethod
+    def keys(locations: List[Tuple[float, float]]) -> np.ndarray:
+        """
+        Integer key of every location's rounded coordinates.
+
+        Args:
+            locations: List of (lon, lat) coordinates
+
+        Returns:
+            One int64 key per location; equal keys mean the same place
+        """
+        coordinates = np.asarray(locations, dtype=float).reshape(-1, 2)
+        scale = 10 ** KEY_DECIMALS
+        lon = np.rint((coordinates[:, 0] + 180) * scale).astype(np.int64)
+        lat = np.rint((coordinates[:, 1] + 90) * scale).astype(np.int64)
+        return lon * (360 * scale + 1) + lat
+
+    def lookup(self, profile: str, keys: np.ndarray, sources: List[int],
+               destinations: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fetch cached pairs from some locations to others.
+
+        Args:
+            profile: Routing profile, e.g. "foot-walking"
+            keys: Key of every location (see ``keys``)
+            sources: Indices of origin locations
+            destinations: Indices of destination locations
+
+        Returns:
+            Tuple of (distance_block, duration_block) shaped
+            (len(sources), len(destinations)); NaN where not cached and
+            inf where the pair is known to have no route
+        """
+        distances = np.full((len(sources), len(destinations)), np.nan)
+        durations = np.full((len(sources), len(destinations)), np.nan)
+        if not len(sources) or not len(destinations):
+            return distances, durations
+
+        now = time.time()
+        with self._connect() as connection:
+            self._load_points(connection, 'sources', keys[sources])
+            self._load_points(connection, 'destinations', keys[destinations])
+            rows = connection.execute(
+                "SELECT s.position, d.position, p.distance, p.duration"
+                " FROM sources s, destinations d, pairs p"
+                " WHERE p.profile = ? AND p.origin = s.key AND p.destination = d.key"
+                " AND p.created >= ?",
+                (profile, self._cutoff(now))
+            ).fetchall()
+            if rows:
+                connection.execute(
+                    "UPDATE pairs SET accessed = ? WHERE profile = ? AND accessed < ?"
+                    " AND origin IN (SELECT key FROM sources)"
+                    " AND destination IN (SELECT key FROM destinations)",
+                    (now, profile, now - ACCESS_RESOLUTION)
+                )
+
+        if rows:
+            found = np.asarray(rows, dtype=float)
+            row, column = found[:, 0].astype(np.intp), found[:, 1].astype(np.intp)
+            distances[row, column] = found[:, 2]
+            durations[row, column] = found[:, 3]
+            distances[distances == UNREACHABLE] = np.inf
+            durations[durations == UNREACHABLE] = np.inf
+        return distances, durations
+
+    def store(self, profile: str, keys: np.ndarray, sources: List[int],
+              destinations: List[int], distances: np.ndarray, durations: np.ndarray) -> None:
+        """
+        Store a block of pairs, then purge stale and excess entries.
+
+        Args:
+            profile: Routing profile
+            keys: Key of every location
+            sources: Indices of origin locations (block rows)
+            destinations: Indices of destination locations (block columns)
+            distances: Distance block (len(sources) x len(destinations));
+                NaN or inf where there is no route
+            durations: Duration block of the same shape
+        """
+        distances = np.asarray(distances, dtype=float).ravel()
+        durations = np.asarray(durations, dtype=float).ravel()
+        unreachable = ~(np.isfinite(distances) & np.isfinite(durations))
+        distances = np.where(unreachable, UNREACHABLE, distances)
+        durations = np.where(unreachable, UNREACHABLE, durations)
+        origin = np.repeat(keys[sources], len(destinations))
+        destination = np.tile(keys[destinations], len(sources))
+        count = len(distances)
+        now = time.time()
+        rows = zip(
+            [profile] * count, origin.tolist(), destination.tolist(),
+            distances.tolist(), durations.tolist(), [now] * count, [now] * count
+        )
+
+        with self._connect() as connection, self._transaction(connection):
+            connection.executemany("INSERT OR REPLACE INTO pairs VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            if self.ttl_days > 0:
+                connection.execute("DELETE FROM pairs WHERE created < ?", (self._cutoff(now),))
+            if self.max_pairs > 0:
+                self._evict(connection, count)
+
+    def _evict(self, connection: sqlite3.Connection, added: int) -> None:
+        """
+        Evict the least recently used pairs beyond ``max_pairs``.
+
+        The table is only counted when the estimated size, raised by every
+        insert, could exceed the limit; inserts by other processes are seen
+        at the next count.
+
+        Args:
+            connection: Connection inside the write transaction
+            added: Number of pairs just inserted or replaced
+        """
+        if self._size_estimate is not None:
+            self._size_estimate += added
+            if self._size_estimate <= self.max_pairs:
+                return
+        size = connection.execute("SELECT COUNT(*) FROM pairs").fetchone()[0]
+        excess = size - self.max_pairs
+        if excess > 0:
+            connection.execute(
+                "DELETE FROM pairs WHERE (profile, origin, destination) IN"
+                " (SELECT profile, origin, destination FROM pairs ORDER BY accessed LIMIT ?)",
+                (excess,)
+            )
+        self._size_estimate = min(size, self.max_pairs)
+
+    def __len__(self) -> int:
+        """Number of stored pairs, including stale ones not yet purged."""
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM pairs").fetchone()[0]
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open an autocommit connection that waits for other processes' locks."""
+        connection = sqlite3.connect(str(self.path), timeout=self.timeout, isolation_level=None)
+        # Durable enough in WAL mode: a crash may lose only the last write
+        connection.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @contextlib.contextmanager
+    def _transaction(self, connection: sqlite3.Connection) -> Iterator[None]:
+        """Run statements in one transaction holding the write lock from the start."""
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _load_points(self, connection: sqlite3.Connection, table: str, keys: np.ndarray) -> None:
+        """Fill a temporary table with (position, key) of the given points."""
+        connection.execute(f"CREATE TEMP TABLE {table} (position INTEGER, key INTEGER)")
+        connection.executemany(
+            f"INSERT INTO {table} VALUES (?, ?)", enumerate(keys.tolist())
+        )
+        connection.execute(f"CREATE INDEX {table}_key ON {table} (key)")
+
+    def _cutoff(self, now: float) -> float:
+        """Creation time before which pairs are stale."""
+        return now - self.ttl_days * 86400 if self.ttl_days > 0 else 0.0
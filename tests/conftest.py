@@ -0,0 +1,17 @@
+"""テスト共通のフィクスチャ"""
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def random_matrix():
+    """ランダムな平面上の点からユークリッド距離行列を作る関数"""
+    
+    def make(n, seed=0):
+        rng = np.random.default_rng(seed)
+        points = rng.random((n, 2)) * 1000
+        diff = points[:, None, :] - points[None, :, :]
+        return np.sqrt((diff ** 2).sum(axis=2))
+    
+    return make
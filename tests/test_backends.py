@@ -0,0 +1,105 @@
+"""ソルバーバックエンドのテスト"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# src ディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from board_route_optimizer.config import Config
+from board_route_optimizer.core import backends
+from board_route_optimizer.core.backends import (
+    BuiltinBackend, OrToolsBackend, create_backend, register_backend
+)
+
+
+class _ReversedBackend:
+    """番号の逆順を返すだけのテスト用バックエンド"""
+    
+    name = 'reversed'
+    
+    def __init__(self, config):
+        self.stats = {}
+    
+    def solve(self, distances, start=None, end=None, time_budget=0.0, coordinates=None):
+        route = list(range(len(distances)))[::-1]
+        self.stats = {'strategy': self.name, 'seconds': 0.0}
+        return route, float(sum(distances[a, b] for a, b in zip(route, route[1:])))
+
+
+class TestBackendRegistry:
+    """バックエンドの登録と選択のテスト"""
+    
+    def test_builtin_by_default(self):
+        """既定では組み込みソルバーを使うこと"""
+        assert isinstance(create_backend(Config()), BuiltinBackend)
+    
+    def test_unknown_backend(self):
+        """未登録の名前はエラーになること"""
+        config = Config()
+        config.optimization.solver = 'unknown'
+        
+        with pytest.raises(ValueError):
+            create_backend(config)
+    
+    def test_register_backend(self, monkeypatch, random_matrix):
+        """登録したバックエンドを名前で選べること"""
+        monkeypatch.setitem(backends.SOLVER_BACKENDS, 'reversed', _ReversedBackend)
+        config = Config()
+        config.optimization.solver = 'reversed'
+        
+        backend = create_backend(config)
+        route, _ = backend.solve(random_matrix(5))
+        
+        assert route == [4, 3, 2, 1, 0]
+        assert backend.stats['strategy'] == 'reversed'
+    
+    def test_register_backend_function(self, monkeypatch):
+        """register_backend で登録できること"""
+        monkeypatch.setattr(backends, 'SOLVER_BACKENDS', dict(backends.SOLVER_BACKENDS))
+        register_backend('reversed', _ReversedBackend)
+        
+        assert 'reversed' in backends.SOLVER_BACKENDS
+    
+    def test_fallback_when_not_installed(self, monkeypatch):
+        """未インストールの任意バックエンドは組み込みソルバーに切り替わること"""
+        monkeypatch.setattr(OrToolsBackend, 'is_available', classmethod(lambda cls: False))
+        config = Config()
+        config.optimization.solver = 'ortools'
+        
+        assert isinstance(create_backend(config), BuiltinBackend)
+
+
+class TestBackends:
+    """各バックエンドの求解のテスト"""
+    
+    @pytest.mark.parametrize('start, end', [(None, None), (3, None), (None, 7), (3, 7)])
+    def test_builtin_endpoints(self, start, end, random_matrix):
+        """組み込みソルバーが始点・終点の指定を守ること"""
+        backend = BuiltinBackend(Config())
+        
+        route, distance = backend.solve(random_matrix(40, seed=1), start, end)
+        
+        assert sorted(route) == list(range(40))
+        assert start is None or route[0] == start
+        assert end is None or route[-1] == end
+        assert backend.stats['strategy']
+    
+    @pytest.mark.parametrize('start, end', [(None, None), (3, None), (None, 7), (3, 7)])
+    def test_ortools_endpoints(self, start, end, random_matrix):
+        """OR-Tools が始点・終点の指定を守ること"""
+        pytest.importorskip('ortools')
+        distances = random_matrix(30, seed=2)
+        backend = OrToolsBackend(Config())
+        
+        route, distance = backend.solve(distances, start, end)
+        
+        assert sorted(route) == list(range(30))
+        assert start is None or route[0] == start
+        assert end is None or route[-1] == end
+        path = np.asarray(route)
+        assert distance == pytest.approx(distances[path[:-1], path[1:]].sum())
+        assert backend.stats['strategy'] == 'ortools'
@@ -0,0 +1,116 @@
+"""空間分割ソルバーのテスト"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# src ディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from board_route_optimizer.config import Config
+from board_route_optimizer.core.decomposition import DecompositionSolver
+
+
+def _coordinates(n, seed=0):
+    """印西市付近のランダムな座標を作成"""
+    rng = np.random.default_rng(seed)
+    return np.column_stack((140.1 + rng.random(n) * 0.1, 35.8 + rng.random(n) * 0.1))
+
+
+def _matrix_function(solver, coordinates, calls=None):
+    """投影座標のユークリッド距離を返す行列関数"""
+    points = solver._project(coordinates)
+    
+    def matrix_function(indices):
+        if calls is not None:
+            calls.append(len(indices))
+        block = points[indices]
+        distances = np.sqrt(((block[:, None, :] - block[None, :, :]) ** 2).sum(axis=2))
+        return distances, distances / 1.2
+    
+    return matrix_function
+
+
+class TestDecomposition:
+    """分割・求解・接合のテスト"""
+    
+    @pytest.mark.parametrize('method', ['grid', 'kmeans'])
+    def test_route_covers_all_points(self, method):
+        """全地点を一度ずつ巡り、距離と所要時間が経路と一致すること"""
+        config = Config()
+        config.optimization.decomposition_method = method
+        config.optimization.decomposition_part_size = 40
+        solver = DecompositionSolver(config)
+        coordinates = _coordinates(300)
+        calls = []
+        
+        route, distance, duration = solver.solve(
+            coordinates, _matrix_function(solver, coordinates, calls)
+        )
+        
+        assert sorted(route) == list(range(300))
+        distances, durations = _matrix_function(solver, coordinates)(list(range(300)))
+        path = np.asarray(route)
+        assert distance == pytest.approx(distances[path[:-1], path[1:]].sum())
+        assert duration == pytest.approx(durations[path[:-1], path[1:]].sum())
+        # 全体の行列は一度も要求されないこと
+        assert max(calls) <= 40
+    
+    @pytest.mark.parametrize('part_size, window', [(40, 20), (3, 20), (40, 0)])
+    def test_one_request_per_junction(self, part_size, window):
+        """接合部ごとの行列要求は修復窓の1回だけで、距離の集計が正しいこと"""
+        config = Config()
+        config.optimization.decomposition_part_size = part_size
+        config.optimization.decomposition_repair_window = window
+        solver = DecompositionSolver(config)
+        coordinates = _coordinates(120, seed=4)
+        calls = []
+        
+        route, distance, _ = solver.solve(coordinates, _matrix_function(solver, coordinates, calls))
+        
+        parts = solver._partition(solver._project(coordinates))
+        assert len(calls) == 2 * len(parts) - 1
+        assert sorted(route) == list(range(120))
+        distances, _ = _matrix_function(solver, coordinates)(list(range(120)))
+        path = np.asarray(route)
+        assert distance == pytest.approx(distances[path[:-1], path[1:]].sum())
+    
+    def test_partition_respects_part_size(self):
+        """格子分割の各部分が上限以下の大きさであること"""
+        config = Config()
+        config.optimization.decomposition_method = 'grid'
+        config.optimization.decomposition_part_size = 25
+        solver = DecompositionSolver(config)
+        
+        parts = solver._partition(solver._project(_coordinates(200)))
+        
+        assert sorted(np.concatenate(parts).tolist()) == list(range(200))
+        assert max(len(part) for part in parts) <= 25
+    
+    def test_junctions_differ_within_part(self):
+        """各部分の入口と出口が異なる地点であること"""
+        config = Config()
+        config.optimization.decomposition_part_size = 20
+        solver = DecompositionSolver(config)
+        points = solver._project(_coordinates(150, seed=3))
+        parts = solver._order_parts(points, solver._partition(points))
+        
+        entries, exits = solver._junctions(points, parts)
+        
+        assert entries[0] is None and exits[-1] is None
+        for part, entry, exit_point in zip(parts, entries, exits):
+            assert entry is None or entry in part
+            assert exit_point is None or exit_point in part
+            if len(part) > 1 and entry is not None and exit_point is not None:
+                assert entry != exit_point
+    
+    def test_unknown_method(self):
+        """未知の分割方法はエラーになること"""
+        config = Config()
+        config.optimization.decomposition_method = 'unknown'
+        solver = DecompositionSolver(config)
+        
+        with pytest.raises(ValueError):
+            solver._partition(solver._project(_coordinates(10)))
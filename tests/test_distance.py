@@ -0,0 +1,481 @@
+"""DistanceCalculator の直線距離計算のテスト"""
+
+import sys
+import os
+import time
+
+import numpy as np
+import pytest
+
+# src ディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from board_route_optimizer.config import Config
+from board_route_optimizer.utils import distance as distance_module
+from board_route_optimizer.utils import road_cache
+from board_route_optimizer.utils.distance import (
+    DistanceCalculator, STRAIGHT_LINE_METHODS, straight_line_distances
+)
+from board_route_optimizer.utils.rate_limit import TokenBucket
+from board_route_optimizer.utils.road_cache import RoadDistanceCache
+
+
+def _locations(n, seed=0):
+    """印西市周辺のランダムな (経度, 緯度) を作成"""
+    rng = np.random.default_rng(seed)
+    return [
+        (140.1 + 0.15 * x, 35.75 + 0.1 * y)
+        for x, y in rng.random((n, 2))
+    ]
+
+
+def _calculator(method):
+    config = Config()
+    config.optimization.straight_line_method = method
+    return DistanceCalculator(config)
+
+
+class TestStraightLineMatrix:
+    """直線距離行列のテスト"""
+    
+    def test_ellipsoidal_matches_geodesic(self):
+        """楕円体の距離がgeopyの測地線距離と一致すること"""
+        geodesic = pytest.importorskip('geopy.distance').geodesic
+        locations = _locations(12)
+        
+        distances, _ = _calculator('ellipsoidal')._calculate_straight_distance_matrix(locations)
+        
+        for i in range(len(locations)):
+            for j in range(len(locations)):
+                expected = geodesic(locations[i][::-1], locations[j][::-1]).meters
+                assert distances[i, j] == pytest.approx(expected, abs=1e-6)
+    
+    @pytest.mark.parametrize('method, tolerance', [('haversine', 0.005), ('equirectangular', 0.005)])
+    def test_approximations_close_to_ellipsoid(self, method, tolerance):
+        """球面・平面近似の誤差が小さいこと"""
+        locations = _locations(30, seed=1)
+        exact, _ = _calculator('ellipsoidal')._calculate_straight_distance_matrix(locations)
+        
+        approximate, _ = _calculator(method)._calculate_straight_distance_matrix(locations)
+        
+        off_diagonal = ~np.eye(len(locations), dtype=bool)
+        relative = np.abs(approximate - exact)[off_diagonal] / exact[off_diagonal]
+        assert relative.max() < tolerance
+    
+    @pytest.mark.parametrize('method', STRAIGHT_LINE_METHODS)
+    def test_matrix_shape_and_durations(self, method):
+        """対称でゼロ対角の行列と、歩行速度から求めた所要時間を返すこと"""
+        calculator = _calculator(method)
+        
+        distances, durations = calculator._calculate_straight_distance_matrix(_locations(25, seed=2))
+        
+        assert np.array_equal(distances, distances.T)
+        assert np.all(np.diag(distances) == 0)
+        assert np.allclose(durations, distances / calculator.config.optimization.walking_speed_ms)
+    
+    @pytest.mark.parametrize('method', STRAIGHT_LINE_METHODS)
+    def test_block_matches_matrix(self, method):
+        """部分ブロックが全体行列の対応部分と一致すること"""
+        calculator = _calculator(method)
+        locations = _locations(20, seed=3)
+        distances, _ = calculator._calculate_straight_distance_matrix(locations)
+        
+        block, _ = calculator._calculate_straight_distance_block(locations, [3, 7], list(range(20)))
+        
+        assert np.allclose(block, distances[[3, 7]], atol=0.05)
+        assert block[0, 3] == 0 and block[1, 7] == 0
+    
+    def test_coincident_points(self):
+        """同一地点間の距離が0であること"""
+        point = np.array([[140.2, 35.8]])
+        
+        assert straight_line_distances(point, point)[0, 0] == 0.0
+    
+    def test_unknown_method(self):
+        """未知の手法ではエラーになること"""
+        with pytest.raises(ValueError):
+            straight_line_distances(np.zeros((1, 2)), np.zeros((1, 2)), 'flat')
+
+
+class _FakeMatrixAPI:
+    """OpenRouteService の行列APIの代わりに直線距離の1.3倍を返す"""
+    
+    def __init__(self):
+        self.requests = []
+    
+    def __call__(self, url, json, headers, timeout):
+        self.requests.append(json)
+        locations = np.array(json['locations'])
+        distances = straight_line_distances(
+            locations[json['sources']], locations[json['destinations']], 'haversine'
+        ) * 1.3
+        return _FakeResponse({'distances': distances.tolist(), 'durations': (distances / 1.1).tolist()})
+    
+    @property
+    def pairs(self):
+        return sum(len(r['sources']) * len(r['destinations']) for r in self.requests)
+
+
+class _FakeResponse:
+    
+    def __init__(self, body, status_code=200, headers=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = str(body)
+    
+    def json(self):
+        return self.body
+
+
+def _patch_post(monkeypatch, fake):
+    """共有セッションの POST を偽の API に差し替える"""
+    monkeypatch.setattr(
+        distance_module.requests.Session, 'post',
+        lambda self, url, **kwargs: fake(url, **kwargs)
+    )
+
+
+class TestRoadDistanceCache:
+    """道路距離の永続キャッシュのテスト"""
+    
+    @pytest.fixture
+    def api(self, monkeypatch):
+        fake = _FakeMatrixAPI()
+        _patch_post(monkeypatch, fake)
+        return fake
+    
+    @staticmethod
+    def _calculator(tmp_path):
+        config = Config()
+        config.api.api_key = 'test-key'
+        config.api.request_delay = 0
+        config.data.cache_directory = str(tmp_path)
+        return DistanceCalculator(config)
+    
+    def test_rerun_makes_no_requests(self, tmp_path, api):
+        """2回目の実行ではAPIを呼ばずに同じ行列を返すこと"""
+        locations = _locations(15)
+        first = self._calculator(tmp_path).calculate_matrix(locations)
+        requests_made = len(api.requests)
+        
+        second = self._calculator(tmp_path).calculate_matrix(locations)
+        
+        assert requests_made == 1
+        assert len(api.requests) == 1
+        assert np.allclose(first[0], second[0]) and np.allclose(first[1], second[1])
+    
+    def test_only_missing_pairs_requested(self, tmp_path, api):
+        """新しい地点を含むペアだけを要求すること"""
+        locations = _locations(20, seed=4)
+        self._calculator(tmp_path).calculate_matrix(locations[:18])
+        api.requests.clear()
+        
+        distances, _ = self._calculator(tmp_path).calculate_matrix(locations)
+        
+        # 2 new rows in full, plus the 18 old rows for the 2 new columns
+        assert api.pairs == 2 * 20 + 18 * 2
+        fresh, _ = self._calculator(tmp_path / 'fresh').calculate_matrix(locations)
+        assert np.allclose(distances, fresh)
+    
+    def test_other_order_and_subset_hit(self, tmp_path, api):
+        """並び順や部分集合が変わっても座標でキャッシュが当たること"""
+        locations = _locations(12, seed=5)
+        self._calculator(tmp_path).calculate_matrix(locations)
+        api.requests.clear()
+        
+        self._calculator(tmp_path).calculate_matrix(locations[::-2])
+        
+        assert api.requests == []
+    
+    def test_ttl_expiry(self, tmp_path):
+        """有効期限を過ぎたペアは返さないこと"""
+        cache = RoadDistanceCache(tmp_path / 'cache.sqlite', ttl_days=1)
+        keys = cache.keys(_locations(3))
+        cache.store('foot-walking', keys, [0], [1, 2], np.array([[5.0, 7.0]]), np.array([[1.0, 2.0]]))
+        
+        hit, _ = cache.lookup('foot-walking', keys, [0], [1, 2])
+        cache.ttl_days = 1e-9
+        expired, _ = cache.lookup('foot-walking', keys, [0], [1, 2])
+        
+        assert hit.tolist() == [[5.0, 7.0]]
+        assert np.isnan(expired).all()
+    
+    def test_lru_eviction(self, tmp_path, monkeypatch):
+        """上限を超えると最も長く使われていないペアから削除すること"""
+        monkeypatch.setattr(road_cache, 'ACCESS_RESOLUTION', 0)
+        cache = RoadDistanceCache(tmp_path / 'cache.sqlite', max_pairs=2)
+        keys = cache.keys(_locations(4, seed=6))
+        cache.store('foot-walking', keys, [0], [1], np.array([[1.0]]), np.array([[1.0]]))
+        cache.store('foot-walking', keys, [0], [2], np.array([[2.0]]), np.array([[2.0]]))
+        cache.lookup('foot-walking', keys, [0], [1])
+        
+        cache.store('foot-walking', keys, [0], [3], np.array([[3.0]]), np.array([[3.0]]))
+        
+        found, _ = cache.lookup('foot-walking', keys, [0], [1, 2, 3])
+        assert len(cache) == 2
+        assert found[0, 0] == 1.0 and np.isnan(found[0, 1]) and found[0, 2] == 3.0
+    
+    def test_unreachable_pairs_not_requested_again(self, tmp_path, api, monkeypatch):
+        """経路のないペアもキャッシュし、再実行で要求しないこと"""
+        locations = _locations(6, seed=12)
+        
+        def partly_unreachable(url, **kwargs):
+            response = api(url, **kwargs)
+            response.body['distances'][0][1] = None
+            response.body['durations'][0][1] = None
+            return response
+        
+        _patch_post(monkeypatch, partly_unreachable)
+        first, _ = self._calculator(tmp_path).calculate_matrix(locations)
+        api.requests.clear()
+        
+        second, durations = self._calculator(tmp_path).calculate_matrix(locations)
+        
+        assert api.requests == []
+        assert np.isnan(first[0, 1]) and np.isnan(second[0, 1]) and np.isnan(durations[0, 1])
+        assert np.allclose(np.delete(second.ravel(), 1), np.delete(first.ravel(), 1))
+    
+    def test_size_limit_over_many_stores(self, tmp_path):
+        """件数を毎回数えなくても上限を超えないこと"""
+        cache = RoadDistanceCache(tmp_path / 'cache.sqlite', max_pairs=10)
+        keys = cache.keys(_locations(12, seed=13))
+        
+        for origin in range(12):
+            cache.store('foot-walking', keys, [origin], [0, 1, 2], np.ones((1, 3)), np.ones((1, 3)))
+            assert len(cache) <= 10
+    
+    def test_profiles_kept_apart(self, tmp_path):
+        """経路プロファイルごとに別のペアとして扱うこと"""
+        cache = RoadDistanceCache(tmp_path / 'cache.sqlite')
+        keys = cache.keys(_locations(2))
+        cache.store('foot-walking', keys, [0], [1], np.array([[4.0]]), np.array([[4.0]]))
+        
+        found, _ = cache.lookup('driving-car', keys, [0], [1])
+        
+        assert np.isnan(found).all()
+
+
+class TestTiledRequests:
+    """行列APIの分割リクエストのテスト"""
+    
+    @pytest.fixture
+    def api(self, monkeypatch):
+        fake = _FakeMatrixAPI()
+        _patch_post(monkeypatch, fake)
+        return fake
+    
+    @staticmethod
+    def _calculator(tmp_path, limit, road_cache=False):
+        config = Config()
+        config.api.api_key = 'test-key'
+        config.api.request_delay = 0
+        config.api.matrix_max_elements = limit
+        config.data.cache_directory = str(tmp_path)
+        config.data.road_cache = road_cache
+        return DistanceCalculator(config)
+    
+    def test_tiles_within_limit(self, tmp_path, api):
+        """各リクエストが上限以内で、つなぎ合わせた行列が一括取得と一致すること"""
+        locations = _locations(30, seed=7)
+        whole, _ = self._calculator(tmp_path, 0).calculate_matrix(locations)
+        api.requests.clear()
+        
+        tiled, durations = self._calculator(tmp_path, 100).calculate_matrix(locations)
+        
+        assert len(api.requests) > 1
+        assert all(len(r['sources']) * len(r['destinations']) <= 100 for r in api.requests)
+        assert api.pairs == 30 * 30
+        assert np.allclose(tiled, whole)
+        assert np.allclose(durations, whole / 1.1)
+    
+    @pytest.mark.parametrize('rows, columns, limit', [(7, 5, 10), (3, 50, 20), (40, 40, 3500)])
+    def test_tiles_cover_block(self, tmp_path, rows, columns, limit):
+        """タイルが重複なくブロック全体を覆うこと"""
+        calculator = self._calculator(tmp_path, limit)
+        covered = np.zeros((rows, columns), dtype=int)
+        
+        for row_slice, column_slice in calculator._tiles(rows, columns):
+            covered[row_slice, column_slice] += 1
+            assert covered[row_slice, column_slice].size <= limit
+        
+        assert (covered == 1).all()
+    
+    def test_tiles_cached_as_they_arrive(self, tmp_path, api, monkeypatch):
+        """途中で失敗しても取得済みのタイルはキャッシュに残ること"""
+        locations = _locations(20, seed=8)
+        calculator = self._calculator(tmp_path, 100, road_cache=True)
+        calls = []
+        
+        def failing(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 3:
+                raise RuntimeError("rate limited")
+            return api(*args, **kwargs)
+        
+        _patch_post(monkeypatch, failing)
+        calculator.config.api.max_concurrent_requests = 1
+        with pytest.raises(RuntimeError):
+            calculator._get_road_distance_matrix(locations)
+        
+        assert len(calculator._get_road_cache()) == 2 * 100
+
+
+class TestTokenBucket:
+    """共有トークンバケットのテスト"""
+    
+    def test_requests_spaced_to_rate(self, tmp_path):
+        """バースト分を超えるリクエストが一定間隔に抑えられること"""
+        bucket = TokenBucket(rate=20, burst=2, path=tmp_path / 'limit')
+        
+        start = time.time()
+        waits = [bucket.acquire() for _ in range(6)]
+        elapsed = time.time() - start
+        
+        assert waits[0] == 0 and waits[1] == 0
+        assert elapsed >= 4 / 20 * 0.9
+    
+    def test_state_shared_through_file(self, tmp_path):
+        """同じ状態ファイルを使うバケット同士で間隔が共有されること"""
+        first = TokenBucket(rate=10, path=tmp_path / 'limit')
+        second = TokenBucket(rate=10, path=tmp_path / 'limit')
+        
+        first.acquire()
+        waited = second.acquire()
+        
+        if second.path is None:
+            pytest.skip("fcntl が使えない環境ではプロセス間で共有しない")
+        assert waited > 0.05
+    
+    def test_unlimited(self):
+        """レート0では待たないこと"""
+        bucket = TokenBucket(rate=0)
+        
+        assert sum(bucket.acquire() for _ in range(100)) == 0
+
+
+class TestConcurrentFetch:
+    """並列取得・再試行・先読みのテスト"""
+    
+    @staticmethod
+    def _calculator(tmp_path, limit=100, road_cache=True):
+        config = Config()
+        config.api.api_key = 'test-key'
+        config.api.request_delay = 0
+        config.api.retry_backoff = 0
+        config.api.matrix_max_elements = limit
+        config.data.cache_directory = str(tmp_path)
+        config.data.road_cache = road_cache
+        return DistanceCalculator(config)
+    
+    def test_retry_after_honoured(self, tmp_path, monkeypatch):
+        """429 応答では Retry-After だけ待って再試行すること"""
+        api = _FakeMatrixAPI()
+        responses = [_FakeResponse('busy', 429, {'Retry-After': '0.05'})]
+        _patch_post(monkeypatch, lambda url, **kwargs: responses.pop() if responses else api(url, **kwargs))
+        sleeps = []
+        monkeypatch.setattr(distance_module.time, 'sleep', sleeps.append)
+        
+        distances, _ = self._calculator(tmp_path, road_cache=False).calculate_matrix(_locations(5))
+        
+        assert sleeps == [0.05]
+        assert len(api.requests) == 1
+        assert np.all(distances[~np.eye(5, dtype=bool)] > 0)
+    
+    def test_client_error_not_retried(self, tmp_path, monkeypatch):
+        """429 以外の 4xx 応答は再試行しないこと"""
+        calls = []
+        
+        def rejecting(url, **kwargs):
+            calls.append(url)
+            return _FakeResponse('bad request', 400)
+        
+        _patch_post(monkeypatch, rejecting)
+        calculator = self._calculator(tmp_path, road_cache=False)
+        
+        with pytest.raises(Exception, match='HTTP 400'):
+            calculator._get_road_distance_matrix(_locations(5))
+        assert len(calls) == 1
+    
+    def test_retries_exhausted(self, tmp_path, monkeypatch):
+        """サーバーエラーが続くと max_retries 回の再試行後に失敗すること"""
+        calls = []
+        
+        def unavailable(url, **kwargs):
+            calls.append(url)
+            return _FakeResponse('unavailable', 503)
+        
+        _patch_post(monkeypatch, unavailable)
+        calculator = self._calculator(tmp_path, road_cache=False)
+        
+        with pytest.raises(Exception, match='HTTP 503'):
+            calculator._get_road_distance_matrix(_locations(5))
+        assert len(calls) == calculator.config.api.max_retries + 1
+    
+    def test_prefetch_fills_cache(self, tmp_path, monkeypatch):
+        """複数地区の先読み後は行列計算でリクエストが発生しないこと"""
+        api = _FakeMatrixAPI()
+        _patch_post(monkeypatch, api)
+        calculator = self._calculator(tmp_path)
+        districts = [_locations(12, seed=seed) for seed in range(3)]
+        
+        requested = calculator.prefetch_road_distances(districts)
+        
+        assert requested == len(api.requests) and requested >= 3
+        assert api.pairs == 3 * 12 * 12
+        api.requests.clear()
+        for locations in districts:
+            distances, _ = calculator.calculate_matrix(locations)
+            assert np.all(np.isfinite(distances))
+        assert api.requests == []
+
+
+class TestMatrixUpdate:
+    """移動・追加された地点の行列差分更新のテスト"""
+    
+    def test_straight_line_matches_full_matrix(self):
+        """移動と追加を反映した行列が全体の再計算と一致すること"""
+        calculator = _calculator('ellipsoidal')
+        old_locations = _locations(20, seed=9)
+        distances, durations = calculator.calculate_matrix(old_locations, use_api=False)
+        locations = list(old_locations) + _locations(2, seed=10)
+        locations[4] = (locations[4][0] + 0.001, locations[4][1])
+        locations[11] = (locations[11][0], locations[11][1] - 0.002)
+        
+        updated, updated_durations = calculator.update_matrix(
+            locations, distances, durations, changed=[4, 11], use_api=False
+        )
+        
+        expected, expected_durations = calculator.calculate_matrix(locations, use_api=False)
+        assert np.allclose(updated, expected)
+        assert np.allclose(updated_durations, expected_durations)
+    
+    def test_road_update_requests_changed_rows_and_columns(self, tmp_path, monkeypatch):
+        """API には変更地点の行と列だけを要求すること"""
+        api = _FakeMatrixAPI()
+        _patch_post(monkeypatch, api)
+        config = Config()
+        config.api.api_key = 'test-key'
+        config.api.request_delay = 0
+        config.data.cache_directory = str(tmp_path)
+        config.data.road_cache = False
+        calculator = DistanceCalculator(config)
+        locations = _locations(30, seed=11)
+        distances, durations = calculator.calculate_matrix(locations)
+        api.requests.clear()
+        locations[7] = (locations[7][0] + 0.003, locations[7][1])
+        
+        updated, _ = calculator.update_matrix(locations, distances, durations, changed=[7])
+        
+        assert api.pairs == 30 + 29
+        expected, _ = calculator.calculate_matrix(locations)
+        assert np.allclose(updated, expected)
+    
+    def test_nothing_changed(self):
+        """変更がなければ既存の行列をそのまま返すこと"""
+        calculator = _calculator('haversine')
+        distances, durations = calculator.calculate_matrix(_locations(5), use_api=False)
+        
+        updated, _ = calculator.update_matrix(_locations(5), distances, durations)
+        
+        assert np.array_equal(updated, distances)
@@ -0,0 +1,387 @@
+"""RouteOptimizer の再最適化機能のテスト"""
+
+import sys
+import os
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# src ディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from board_route_optimizer.config import Config
+from board_route_optimizer.core.optimizer import RouteOptimizer
+
+
+def _district_data(boards):
+    """掲示板番号と座標だけを持つ投票区データを作成"""
+    return pd.DataFrame({
+        '掲示板番号': [board for board, _, _ in boards],
+        '経度': [lon for _, lon, _ in boards],
+        '緯度': [lat for _, _, lat in boards],
+    })
+
+
+def _feature(district, order, board, status='todo'):
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [140.0, 35.0]},
+        "properties": {
+            "district": district,
+            "order": order,
+            "board_number": board,
+            "status": status
+        }
+    }
+
+
+class TestWarmStart:
+    """前回経路からのウォームスタートのテスト"""
+    
+    def test_load_previous_routes_from_geojson(self, tmp_path):
+        """GeoJSON の order から前回の巡回順を復元すること"""
+        path = tmp_path / 'points.geojson'
+        path.write_text(json.dumps({
+            "type": "FeatureCollection",
+            "features": [
+                _feature('第1投票区', 2, '1-3'),
+                _feature('第1投票区', 1, '1-1'),
+                _feature('第1投票区', 0, '1-2', status='done'),
+                _feature('第1投票区', 3, '1-4'),
+                _feature('第2投票区', 1, '2-1'),
+            ]
+        }), encoding='utf-8')
+        optimizer = RouteOptimizer(Config())
+        
+        routes = optimizer.load_previous_routes(path)
+        
+        assert routes == {'第1投票区': ['1-1', '1-3', '1-4'], '第2投票区': ['2-1']}
+    
+    def test_seed_route_drops_and_appends_boards(self):
+        """完了した掲示板を除き、新しい掲示板を加えた初期経路を作ること"""
+        optimizer = RouteOptimizer(Config())
+        optimizer.previous_routes = {'第1投票区': ['1-3', '1-1', '1-2']}
+        data = _district_data([
+            ('1-1', 140.10, 35.80), ('1-3', 140.11, 35.80), ('1-4', 140.12, 35.80)
+        ])
+        
+        route = optimizer._warm_start_route('第1投票区', data)
+        
+        assert route == [1, 0, 2]
+        assert optimizer._warm_start_route('第2投票区', data) is None
+    
+    def test_improve_route_keeps_permutation(self):
+        """局所探索のみで経路を改善すること"""
+        rng = np.random.default_rng(0)
+        points = rng.random((40, 2)) * 1000
+        distances = np.sqrt(((points[:, None] - points[None]) ** 2).sum(axis=2))
+        optimizer = RouteOptimizer(Config())
+        seed = list(range(40))
+        
+        route, distance = optimizer.tsp_solver.improve_route(distances, seed)
+        
+        assert sorted(route) == seed
+        assert distance < optimizer.tsp_solver._calculate_route_distance(seed, distances)
+
+
+class TestIncrementalInsertion:
+    """新規掲示板の差分挿入のテスト"""
+    
+    def test_insert_points_into_route(self):
+        """新しい点を最安位置に挿入し全点を巡ること"""
+        points = np.array([0.0, 1.0, 2.0, 3.0, 4.0, 2.5])
+        distances = np.abs(points[:, None] - points[None, :])
+        optimizer = RouteOptimizer(Config())
+        
+        route, distance = optimizer.tsp_solver.insert_points(distances, [0, 1, 2, 3, 4], [5])
+        
+        assert route == [0, 1, 2, 5, 3, 4]
+        assert distance == pytest.approx(4.0)
+    
+    def test_insert_points_avoids_full_matrix(self, monkeypatch):
+        """差分挿入では全点の候補リストと下界を計算しないこと"""
+        points = np.array([0.0, 1.0, 2.0, 3.0, 4.0, 2.5])
+        distances = np.abs(points[:, None] - points[None, :])
+        solver = RouteOptimizer(Config()).tsp_solver
+        for name in ('_search_matrix', '_candidate_lists', '_path_tour'):
+            monkeypatch.setattr(solver, name, lambda *args, **kwargs: pytest.fail(name))
+        
+        route, _ = solver.insert_points(distances, [0, 1, 2, 3, 4], [5], start=0)
+        
+        assert route == [0, 1, 2, 5, 3, 4]
+        assert solver.stats['lower_bound'] is None
+        
+        monkeypatch.undo()
+        solver.insert_points(distances, [0, 1, 2, 3, 4], [5], start=0, compute_bound=True)
+        assert solver.stats['lower_bound'] == pytest.approx(4.0)
+    
+    def test_update_district_reuses_matrix(self):
+        """既存の行列を再利用し、追加分の行と列だけを計算すること"""
+        config = Config()
+        config.api.api_key = None
+        optimizer = RouteOptimizer(config)
+        old_data = _district_data([
+            ('1-1', 140.100, 35.800), ('1-2', 140.101, 35.800), ('1-3', 140.102, 35.800)
+        ])
+        distance_matrix, duration_matrix = optimizer.distance_calculator.calculate_matrix(
+            [(140.100, 35.800), (140.101, 35.800), (140.102, 35.800)], use_api=False
+        )
+        previous = {
+            'data': old_data,
+            'route': [0, 1, 2],
+            'distance_matrix': distance_matrix.tolist(),
+            'duration_matrix': duration_matrix.tolist()
+        }
+        new_data = _district_data([
+            ('1-1', 140.100, 35.800), ('1-3', 140.102, 35.800),
+            ('1-4', 140.1015, 35.800), ('1-2', 140.101, 35.800)
+        ])
+        optimizer.data_loader.get_district_data = lambda name: new_data
+        
+        result = optimizer._update_district('第1投票区', previous)
+        
+        boards = [location['掲示板番号'] for location in result['locations']]
+        assert boards in (['1-1', '1-2', '1-4', '1-3'], ['1-3', '1-4', '1-2', '1-1'])
+        assert np.asarray(result['distance_matrix'])[:3, :3] == pytest.approx(distance_matrix)
+    
+    def test_update_district_moved_board(self):
+        """座標が修正された掲示板の行と列だけを再計算して経路に入れ直すこと"""
+        config = Config()
+        config.api.api_key = None
+        optimizer = RouteOptimizer(config)
+        old_coordinates = [(140.100, 35.800), (140.101, 35.800), (140.102, 35.800), (140.103, 35.800)]
+        old_data = _district_data([
+            (f'1-{i}', lon, lat) for i, (lon, lat) in enumerate(old_coordinates, start=1)
+        ])
+        distance_matrix, duration_matrix = optimizer.distance_calculator.calculate_matrix(
+            old_coordinates, use_api=False
+        )
+        previous = {
+            'data': old_data,
+            'route': [0, 1, 2, 3],
+            'distance_matrix': distance_matrix.tolist(),
+            'duration_matrix': duration_matrix.tolist()
+        }
+        # 1-2 の座標を 1-3 と 1-4 の間に修正
+        new_data = _district_data([
+            ('1-1', 140.100, 35.800), ('1-2', 140.1025, 35.800),
+            ('1-3', 140.102, 35.800), ('1-4', 140.103, 35.800)
+        ])
+        optimizer.data_loader.get_district_data = lambda name: new_data
+        
+        result = optimizer._update_district('第1投票区', previous)
+        
+        boards = [location['掲示板番号'] for location in result['locations']]
+        assert boards in (['1-1', '1-3', '1-2', '1-4'], ['1-4', '1-2', '1-3', '1-1'])
+        expected, _ = optimizer.distance_calculator.calculate_matrix(
+            [(140.100, 35.800), (140.1025, 35.800), (140.102, 35.800), (140.103, 35.800)],
+            use_api=False
+        )
+        assert np.asarray(result['distance_matrix']) == pytest.approx(expected)
+
+
+class TestOptimalityGap:
+    """最適性ギャップの報告のテスト"""
+    
+    def test_gap_in_result(self):
+        """結果の辞書に下界と最適性ギャップが含まれること"""
+        config = Config()
+        config.api.api_key = None
+        rng = np.random.default_rng(1)
+        data = _district_data([
+            (f'1-{i}', 140.1 + 0.01 * x, 35.8 + 0.01 * y)
+            for i, (x, y) in enumerate(rng.random((25, 2)), start=1)
+        ])
+        
+        result = RouteOptimizer(config).optimize_district(data)
+        
+        assert 0 < result['lower_bound'] <= result['distance']
+        assert result['optimality_gap'] >= 0
+        assert result['strategy'] == 'local_search'
+        assert result['solve_seconds'] >= 0
+
+
+class TestBatchDistricts:
+    """小規模投票区の一括最適化のテスト"""
+    
+    def test_small_districts_solved_in_batch(self):
+        """上限以下の投票区だけを一括で解くこと"""
+        config = Config()
+        config.api.api_key = None
+        config.optimization.batch_max_points = 10
+        optimizer = RouteOptimizer(config)
+        rng = np.random.default_rng(3)
+        districts = {
+            name: _district_data([
+                (f'{k}-{i}', 140.1 + 0.01 * x, 35.8 + 0.01 * y)
+                for i, (x, y) in enumerate(rng.random((size, 2)), start=1)
+            ])
+            for k, (name, size) in enumerate([('第1投票区', 4), ('第2投票区', 9), ('第3投票区', 20)], start=1)
+        }
+        optimizer.data_loader.get_district_data = lambda name: districts[name]
+        
+        results = optimizer._optimize_districts_batch(list(districts))
+        
+        assert sorted(results) == ['第1投票区', '第2投票区']
+        for name, result in results.items():
+            assert sorted(result['route']) == list(range(len(districts[name])))
+            assert result['optimality_gap'] >= 0
+
+
+class TestTimeBudget:
+    """時間予算の配分のテスト"""
+    
+    def test_budget_weights(self):
+        """厳密解法で解ける投票区には予算を配らないこと"""
+        config = Config()
+        config.optimization.time_budget = 10.0
+        optimizer = RouteOptimizer(config)
+        sizes = {'第1投票区': 5, '第2投票区': 30, '第3投票区': 60}
+        optimizer.data_loader.get_district_data = lambda name: _district_data(
+            [(f'{i}', 140.0, 35.0) for i in range(sizes[name])]
+        )
+        
+        weights = optimizer._budget_weights(list(sizes))
+        
+        assert weights == {'第1投票区': 0, '第2投票区': 30, '第3投票区': 60}
+
+
+class TestCheckpoint:
+    """チェックポイントと再開のテスト"""
+    
+    @staticmethod
+    def _optimizer(tmp_path, districts):
+        config = Config()
+        config.api.api_key = None
+        config.data.checkpoint_directory = str(tmp_path / 'checkpoints')
+        optimizer = RouteOptimizer(config)
+        optimizer.poster_boards_df = pd.DataFrame()
+        optimizer.data_loader.get_districts = lambda: list(districts)
+        optimizer.data_loader.get_district_data = lambda name: districts[name]
+        return optimizer
+    
+    @staticmethod
+    def _districts(seed=5):
+        rng = np.random.default_rng(seed)
+        return {
+            name: _district_data([
+                (f'{k}-{i}', 140.1 + 0.01 * x, 35.8 + 0.01 * y)
+                for i, (x, y) in enumerate(rng.random((size, 2)), start=1)
+            ])
+            for k, (name, size) in enumerate([('第1投票区', 6), ('第2投票区', 15)], start=1)
+        }
+    
+    def test_resume_skips_finished_districts(self, tmp_path):
+        """再開時はチェックポイント済みの投票区を解き直さないこと"""
+        districts = self._districts()
+        first = self._optimizer(tmp_path, districts).optimize_all_districts()
+        
+        optimizer = self._optimizer(tmp_path, districts)
+        optimizer._optimize_district = lambda *args: pytest.fail("district was re-optimized")
+        resumed = optimizer.optimize_all_districts(resume=True)
+        
+        assert sorted(resumed) == sorted(first)
+        for name, result in first.items():
+            assert resumed[name]['route'] == result['route']
+            assert resumed[name]['distance'] == pytest.approx(result['distance'])
+            assert resumed[name]['distance_matrix'] == result['distance_matrix']
+            assert resumed[name]['locations'][0]['掲示板番号'] == result['locations'][0]['掲示板番号']
+    
+    def test_matrix_reused_after_interruption(self, tmp_path):
+        """解く前に中断された投票区では保存済みの距離行列を再利用すること"""
+        districts = self._districts()
+        optimizer = self._optimizer(tmp_path, districts)
+        distance_matrix, duration_matrix = optimizer.distance_calculator.calculate_matrix(
+            [(row['経度'], row['緯度']) for _, row in districts['第2投票区'].iterrows()]
+        )
+        optimizer._save_checkpoint(
+            '第2投票区', districts['第2投票区'], matrices=(distance_matrix * 2, duration_matrix)
+        )
+        
+        optimizer = self._optimizer(tmp_path, districts)
+        optimizer.distance_calculator.calculate_matrix = lambda *args, **kwargs: pytest.fail(
+            "matrix was requested again"
+        )
+        result = optimizer._optimize_district('第2投票区', resume=True)
+        
+        assert np.allclose(result['distance_matrix'], distance_matrix * 2)
+    
+    def test_changed_district_not_resumed(self, tmp_path):
+        """データが変わった投票区のチェックポイントは使わないこと"""
+        districts = self._districts()
+        self._optimizer(tmp_path, districts).optimize_all_districts()
+        
+        changed = self._districts(seed=6)
+        changed['第1投票区'] = districts['第1投票区']
+        resumed = self._optimizer(tmp_path, changed)._resume_districts(list(changed))
+        
+        assert sorted(resumed) == ['第1投票区']
+    
+    @pytest.mark.parametrize('field, value', [
+        ('straight_line_method', 'haversine'),
+        ('walking_speed_kmh', 5.0)
+    ])
+    def test_changed_distance_settings_not_resumed(self, tmp_path, field, value):
+        """距離の設定が変わったチェックポイントは行列も含めて使わないこと"""
+        districts = self._districts()
+        self._optimizer(tmp_path, districts).optimize_all_districts()
+        
+        optimizer = self._optimizer(tmp_path, districts)
+        setattr(optimizer.config.optimization, field, value)
+        
+        assert optimizer._resume_districts(list(districts)) == {}
+        assert optimizer._load_checkpoint('第1投票区', districts['第1投票区']) is None
+    
+    @pytest.mark.parametrize('field, value', [
+        ('construction', 'greedy'),
+        ('ils_time_budget', 1.0),
+        ('time_budget', 60.0)
+    ])
+    def test_changed_solver_settings_keep_matrices(self, tmp_path, field, value):
+        """解法の設定が変わっても行列は再利用し、経路だけを解き直すこと"""
+        districts = self._districts()
+        self._optimizer(tmp_path, districts).optimize_all_districts()
+        
+        optimizer = self._optimizer(tmp_path, districts)
+        setattr(optimizer.config.optimization, field, value)
+        
+        assert optimizer._resume_districts(list(districts)) == {}
+        checkpoint = optimizer._load_checkpoint('第1投票区', districts['第1投票区'])
+        assert checkpoint['result'] is None
+        assert checkpoint['distance_matrix'] is not None
+    
+    def test_speed_settings_still_resumed(self, tmp_path):
+        """結果を変えない実行設定の違いではチェックポイントを使うこと"""
+        districts = self._districts()
+        self._optimizer(tmp_path, districts).optimize_all_districts()
+        
+        optimizer = self._optimizer(tmp_path, districts)
+        optimizer.config.optimization.use_numba = not optimizer.config.optimization.use_numba
+        
+        assert sorted(optimizer._resume_districts(list(districts))) == sorted(districts)
+    
+    def test_specific_districts_update_from_checkpoint(self, tmp_path):
+        """新しい RouteOptimizer でも前回のチェックポイントから差分更新すること"""
+        districts = self._districts()
+        self._optimizer(tmp_path, districts).optimize_all_districts()
+        changed = dict(districts)
+        changed['第2投票区'] = pd.concat([
+            districts['第2投票区'].iloc[1:],
+            _district_data([('2-99', 140.105, 35.805)])
+        ], ignore_index=True)
+        
+        optimizer = self._optimizer(tmp_path, changed)
+        optimizer.config.data.output_directory = str(tmp_path / 'output')
+        optimizer._optimize_district = lambda *args: pytest.fail("district was fully re-solved")
+        results = optimizer.optimize_specific_districts(['第2投票区'])
+        
+        result = results['第2投票区']
+        assert result['strategy'] == 'incremental'
+        boards = sorted(location['掲示板番号'] for location in result['locations'])
+        assert boards == sorted(changed['第2投票区']['掲示板番号'])
+        
+        # 更新結果も保存され、次の実行でそのまま再利用できること
+        again = self._optimizer(tmp_path, changed)
+        assert again._resume_districts(['第2投票区'])['第2投票区']['route'] == result['route']
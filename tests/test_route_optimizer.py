@@ -213,6 +213,32 @@ class TestUtilityFunctions:
         except Exception:
             pytest.skip("CLI テストをスキップ")
     
+    def test_cli_time_budgets(self):
+        """2つの時間予算オプションがそれぞれの設定に反映されること"""
+        from board_route_optimizer.cli import create_parser, create_config_from_args
+        
+        args = create_parser().parse_args(['--time-budget', '2', '--total-time-budget', '60'])
+        config = create_config_from_args(args)
+        
+        assert config.optimization.ils_time_budget == 2.0
+        assert config.optimization.time_budget == 60.0
+    
+    def test_cli_solver_registered_later(self, monkeypatch):
+        """パーサー作成後に登録したバックエンドも選べ、未登録の名前は実行時にエラーになること"""
+        from board_route_optimizer.cli import create_parser, create_config_from_args
+        from board_route_optimizer.core import backends
+        
+        parser = create_parser()
+        monkeypatch.setitem(backends.SOLVER_BACKENDS, 'custom', backends.BuiltinBackend)
+        
+        config = create_config_from_args(parser.parse_args(['--solver', 'custom']))
+        assert config.optimization.solver == 'custom'
+        assert isinstance(backends.create_backend(config), backends.BuiltinBackend)
+        
+        config = create_config_from_args(parser.parse_args(['--solver', 'unknown']))
+        with pytest.raises(ValueError):
+            backends.create_backend(config)
+    
     def test_config_from_dict(self):
         """辞書からの設定作成テスト"""
         try:
@@ -0,0 +1,767 @@
+"""TSPSolver のテスト"""
+
+import itertools
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# src ディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from board_route_optimizer.config import Config
+from board_route_optimizer.core import kernels
+from board_route_optimizer.core.lower_bound import LowerBoundCalculator
+from board_route_optimizer.core.tsp_solver import TSPSolver
+from board_route_optimizer.core.tour import Tour
+
+
+def _is_permutation(route, n):
+    return sorted(route) == list(range(n))
+
+
+class TestTour:
+    """配列ベースのツアー表現のテスト"""
+    
+    def _edges(self, tour):
+        order = tour.order.tolist()
+        return {frozenset((order[i], order[(i + 1) % len(order)])) for i in range(len(order))}
+    
+    @pytest.mark.parametrize('a, c', [(1, 3), (1, 7), (6, 2), (8, 0)])
+    def test_two_opt_move(self, a, c):
+        """2-opt の手で指定した辺だけが入れ替わること"""
+        tour = Tour(list(range(10)))
+        b, d = tour.succ(a), tour.succ(c)
+        before = self._edges(tour)
+        
+        tour.two_opt_move(a, b, c, d)
+        
+        expected = (before - {frozenset((a, b)), frozenset((c, d))}) | {
+            frozenset((a, c)), frozenset((b, d))
+        }
+        assert self._edges(tour) == expected
+        assert (tour.order[tour.position] == np.arange(10)).all()
+    
+    @pytest.mark.parametrize('reverse', [False, True])
+    def test_move_segment(self, reverse):
+        """区間が指定した2点の間に挿入されること"""
+        tour = Tour(list(range(10)))
+        
+        tour.move_segment(2, 4, 7, 8, reverse)
+        
+        expected = [1, 5, 6, 7, 4, 3, 2, 8, 9] if reverse else [1, 5, 6, 7, 2, 3, 4, 8, 9]
+        assert tour.path_after(0) == expected
+        assert (tour.order[tour.position] == np.arange(10)).all()
+    
+    def test_path_after(self):
+        """ダミー点で切り開いた経路が得られること"""
+        tour = Tour([3, 4, 0, 1, 2])
+        
+        assert tour.path_after(0) == [1, 2, 3, 4]
+    
+    def test_dont_look_bits(self):
+        """取り出した点は眠り、起こされた点だけが再び取り出されること"""
+        tour = Tour(list(range(4)))
+        popped = [tour.next_active() for _ in range(4)]
+        
+        assert popped == [0, 1, 2, 3]
+        assert tour.next_active() is None
+        
+        tour.wake(2)
+        assert tour.next_active() == 2
+        assert tour.next_active() is None
+
+
+class TestTwoOpt:
+    """2-opt 改善のテスト"""
+    
+    def test_gain_matches_recomputation(self, random_matrix):
+        """見つかった手の改善量が経路長の再計算と一致すること"""
+        distances = random_matrix(12)
+        solver = TSPSolver(Config())
+        tour = Tour(list(range(12)))
+        neighbours = solver._candidate_lists(distances, k=11).tolist()
+        found = 0
+        
+        for a in range(12):
+            move = solver._find_two_opt_move(tour, a, distances, neighbours[a], 0.0, True)
+            if move is None:
+                continue
+            w, x, y, z = move
+            gain = distances[w, x] + distances[y, z] - distances[w, y] - distances[x, z]
+            before = tour.length(distances)
+            tour.two_opt_move(*move)
+            
+            assert gain > 0
+            assert before - tour.length(distances) == pytest.approx(gain)
+            tour = Tour(list(range(12)))
+            found += 1
+        
+        assert found > 0
+    
+    @pytest.mark.parametrize('strategy', ['first', 'best'])
+    def test_improvement_strategies(self, strategy, random_matrix):
+        """first / best の両モードで最近傍法より悪化しないこと"""
+        distances = random_matrix(30, seed=1)
+        config = Config()
+        config.optimization.two_opt_strategy = strategy
+        config.optimization.max_tsp_iterations = 1000
+        solver = TSPSolver(config)
+        
+        initial = solver._nearest_neighbor_construction(0, distances)
+        initial_distance = solver._calculate_route_distance(initial, distances)
+        route, distance = solver.solve_from_start(0, distances)
+        
+        assert route[0] == 0
+        assert _is_permutation(route, 30)
+        assert distance <= initial_distance + 1e-9
+        assert distance == pytest.approx(solver._calculate_route_distance(route, distances))
+    
+    def test_asymmetric_distance_reported_on_original(self, random_matrix):
+        """非対称行列でも元の行列で経路長を報告すること"""
+        distances = random_matrix(10, seed=2)
+        distances[0, 1] += 50.0
+        solver = TSPSolver(Config())
+        
+        route, distance = solver.solve_with_optimal_start(distances)
+        
+        assert _is_permutation(route, 10)
+        assert distance == pytest.approx(solver._calculate_route_distance(route, distances))
+
+
+class TestVectorizedTwoOpt:
+    """NumPy による全近傍 2-opt のテスト"""
+    
+    def test_reaches_two_opt_local_optimum(self, random_matrix):
+        """収束後の経路に改善する 2-opt の手が残らないこと"""
+        distances = random_matrix(80, seed=14)
+        config = Config()
+        config.optimization.two_opt_engine = 'vectorized'
+        config.optimization.tsp_improvement_threshold = 1e-6
+        solver = TSPSolver(config)
+        
+        initial = solver._nearest_neighbor_construction(0, distances)
+        route, distance = solver._two_opt_improvement(
+            initial, distances, solver._calculate_route_distance(initial, distances)
+        )
+        
+        assert route[0] == 0
+        assert _is_permutation(route, 80)
+        assert distance < solver._calculate_route_distance(initial, distances)
+        for i in range(1, 79):
+            for j in range(i + 1, 80):
+                new_route = route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+                assert solver._calculate_route_distance(new_route, distances) >= distance - 1e-6
+
+
+class TestOrOpt:
+    """Or-opt 区間移動のテスト"""
+    
+    def test_gain_matches_recomputation(self, random_matrix):
+        """見つかった手の改善量が経路長の変化と一致すること"""
+        distances = random_matrix(20, seed=6)
+        solver = TSPSolver(Config())
+        neighbours = solver._candidate_lists(distances, k=8).tolist()
+        found = 0
+        
+        for a in range(20):
+            tour = Tour(list(range(20)))
+            move = solver._find_or_opt_move(tour, a, distances, neighbours, 0.0)
+            if move is None:
+                continue
+            first, last, c, e, reverse = move
+            p, nx = tour.pred(first), tour.succ(last)
+            end, other = (last, first) if reverse else (first, last)
+            gain = (
+                distances[p, first] + distances[last, nx] - distances[p, nx]
+                - (distances[c, end] + distances[other, e] - distances[c, e])
+            )
+            before = tour.length(distances)
+            tour.move_segment(first, last, c, e, reverse)
+            
+            assert sorted(tour.order.tolist()) == list(range(20))
+            assert gain > 0
+            assert before - tour.length(distances) == pytest.approx(gain)
+            found += 1
+        
+        assert found > 0
+    
+    def test_or_opt_phase(self, random_matrix):
+        """Or-opt を有効にしても開始点が固定された順列を返し最近傍法より悪化しないこと"""
+        distances = random_matrix(60, seed=7)
+        solver = TSPSolver(Config())
+        initial = solver._nearest_neighbor_construction(3, distances)
+        
+        route, distance = solver.solve_from_start(3, distances)
+        
+        assert route[0] == 3
+        assert _is_permutation(route, 60)
+        assert distance <= solver._calculate_route_distance(initial, distances) + 1e-9
+        assert distance == pytest.approx(solver._calculate_route_distance(route, distances))
+
+
+class TestLinKernighan:
+    """可変深度探索のテスト"""
+    
+    def test_refines_route(self, random_matrix):
+        """有効時に経路が悪化せず改善量が記録されること"""
+        distances = random_matrix(200, seed=8)
+        base_route, base_distance = TSPSolver(Config()).solve_from_start(0, distances)
+        
+        config = Config()
+        config.optimization.lin_kernighan = True
+        solver = TSPSolver(config)
+        route, distance = solver.solve_from_start(0, distances)
+        
+        assert route[0] == 0
+        assert _is_permutation(route, 200)
+        assert distance <= base_distance + 1e-9
+        stats = solver.stats['lin_kernighan']
+        assert stats['improvement'] == pytest.approx(base_distance - distance)
+    
+    def test_time_budget(self, random_matrix):
+        """時間予算が尽きたら探索を打ち切ること"""
+        distances = random_matrix(300, seed=9)
+        config = Config()
+        config.optimization.lin_kernighan = True
+        config.optimization.lk_time_budget = 0.0
+        solver = TSPSolver(config)
+        
+        route, distance = solver.solve_from_start(0, distances)
+        
+        assert _is_permutation(route, 300)
+        assert solver.stats['lin_kernighan']['improvement'] == 0.0
+
+
+class TestIteratedLocalSearch:
+    """ダブルブリッジによる反復局所探索のテスト"""
+    
+    def test_double_bridge_keeps_endpoints(self):
+        """ダブルブリッジ後も順列で、先頭と末尾が変わらないこと"""
+        solver = TSPSolver(Config())
+        rng = np.random.default_rng(0)
+        route = list(range(30))
+        
+        for _ in range(50):
+            kicked, touched = solver._double_bridge(route, rng)
+            assert _is_permutation(kicked, 30)
+            assert kicked[0] == 0 and kicked[-1] == 29
+            assert kicked != route
+            assert set(touched) <= set(route)
+    
+    @pytest.mark.parametrize('acceptance', ['better', 'annealing'])
+    def test_never_worse_than_local_search(self, acceptance, random_matrix):
+        """時間予算内で局所探索の結果より悪化せず、端点を守ること"""
+        distances = random_matrix(120, seed=5)
+        baseline, baseline_distance = TSPSolver(Config()).solve_open_path(distances, start=2, end=9)
+        
+        config = Config()
+        config.optimization.ils_time_budget = 0.5
+        config.optimization.ils_acceptance = acceptance
+        solver = TSPSolver(config)
+        route, distance = solver.solve_open_path(distances, start=2, end=9)
+        
+        assert _is_permutation(route, 120)
+        assert route[0] == 2 and route[-1] == 9
+        assert distance <= baseline_distance + 1e-6
+        assert distance == pytest.approx(solver._calculate_route_distance(route, distances))
+        stats = solver.stats['iterated_local_search']
+        assert stats['iterations'] > 0
+        assert stats['seconds'] < 1.5
+    
+    def test_unknown_acceptance(self, random_matrix):
+        """未知の受理基準はエラーになること"""
+        config = Config()
+        config.optimization.ils_time_budget = 0.1
+        config.optimization.ils_acceptance = 'unknown'
+        
+        with pytest.raises(ValueError):
+            TSPSolver(config).solve_open_path(random_matrix(30))
+
+
+class TestBatchSolve:
+    """小規模インスタンスの一括ベクトル化求解のテスト"""
+    
+    def test_routes_are_valid(self, random_matrix):
+        """大きさの異なるインスタンスそれぞれに正しい経路を返すこと"""
+        matrices = [random_matrix(n, seed=n) for n in (2, 3, 7, 12, 15)]
+        solver = TSPSolver(Config())
+        
+        results = solver.solve_batch(matrices)
+        
+        assert len(results) == len(matrices)
+        for (route, distance), distances in zip(results, matrices):
+            assert _is_permutation(route, len(distances))
+            assert distance == pytest.approx(solver._calculate_route_distance(route, distances))
+        assert len(solver.stats['optimality_gaps']) == len(matrices)
+    
+    def test_close_to_exact(self, random_matrix):
+        """一括解が厳密解に近いこと"""
+        matrices = [random_matrix(12, seed=seed) for seed in range(10)]
+        solver = TSPSolver(Config())
+        
+        batch_total = sum(distance for _, distance in solver.solve_batch(matrices))
+        exact_total = sum(solver._held_karp_path(distances)[1] for distances in matrices)
+        
+        assert batch_total <= exact_total * 1.05
+    
+    def test_points_on_a_line(self):
+        """一直線上の点は端から端へ順に巡ること"""
+        points = np.array([0.0, 3.0, 1.0, 7.0, 4.0, 2.0])
+        distances = np.abs(points[:, None] - points[None, :])
+        
+        [(route, distance)] = TSPSolver(Config()).solve_batch([distances])
+        
+        assert distance == pytest.approx(7.0)
+    
+    def test_empty_batch(self):
+        """空の入力には空のリストを返すこと"""
+        assert TSPSolver(Config()).solve_batch([]) == []
+
+
+class TestPortfolio:
+    """インスタンスに応じた解法選択のテスト"""
+    
+    @pytest.mark.parametrize('n, strategy', [(1, 'trivial'), (3, 'trivial'), (10, 'exact'), (40, 'local_search')])
+    def test_strategy_by_size(self, n, strategy, random_matrix):
+        """点数に応じた解法が選ばれ、記録されること"""
+        distances = random_matrix(n, seed=n)
+        solver = TSPSolver(Config())
+        
+        route, distance = solver.solve(distances)
+        
+        assert _is_permutation(route, n)
+        assert distance == pytest.approx(solver._calculate_route_distance(route, distances))
+        assert solver.stats['strategy'] == strategy
+        assert solver.stats['seconds'] >= 0
+    
+    def test_trivial_is_optimal(self, random_matrix):
+        """3点以下では厳密解と一致すること"""
+        distances = random_matrix(3, seed=9)
+        solver = TSPSolver(Config())
+        
+        _, distance = solver.solve(distances)
+        
+        assert distance == pytest.approx(solver._held_karp_path(distances)[1])
+    
+    def test_budget_runs_metaheuristic(self, random_matrix):
+        """時間予算が残れば反復局所探索を行い、予算内に収まること"""
+        distances = random_matrix(80, seed=4)
+        solver = TSPSolver(Config())
+        _, local_distance = solver.solve(distances)
+        
+        _, distance = solver.solve(distances, time_budget=0.5)
+        
+        assert solver.stats['strategy'] == 'metaheuristic'
+        assert distance <= local_distance + 1e-6
+        assert solver.stats['seconds'] < 1.5
+    
+    def test_metaheuristic_threshold(self, random_matrix):
+        """設定した点数未満では時間予算があっても局所探索だけで終えること"""
+        config = Config()
+        config.optimization.exact_max_points = 0
+        config.optimization.metaheuristic_min_points = 40
+        solver = TSPSolver(config)
+        
+        solver.solve(random_matrix(30, seed=4), time_budget=0.5)
+        
+        assert solver.stats['strategy'] == 'local_search'
+
+
+class TestParallelMultiStart:
+    """並列マルチスタートのテスト"""
+    
+    @pytest.mark.parametrize('backend', ['process', 'thread'])
+    def test_matches_serial(self, backend, random_matrix):
+        """並列実行の結果が逐次実行と一致すること"""
+        distances = random_matrix(40, seed=10)
+        serial = TSPSolver(Config()).solve_with_optimal_start(distances)
+        
+        config = Config()
+        config.optimization.parallel_workers = 2
+        config.optimization.parallel_backend = backend
+        config.optimization.parallel_min_points = 0
+        parallel = TSPSolver(config).solve_with_optimal_start(distances)
+        
+        assert parallel[0] == serial[0]
+        assert parallel[1] == serial[1]
+
+
+class TestOpenPath:
+    """ダミー点による開路モードのテスト"""
+    
+    @pytest.mark.parametrize('start, end', [(None, None), (4, None), (None, 7), (4, 7)])
+    def test_fixed_endpoints(self, start, end, random_matrix):
+        """指定した始点・終点が守られること"""
+        distances = random_matrix(50, seed=11)
+        solver = TSPSolver(Config())
+        
+        route, distance = solver.solve_open_path(distances, start=start, end=end)
+        
+        assert _is_permutation(route, 50)
+        if start is not None:
+            assert route[0] == start
+        if end is not None:
+            assert route[-1] == end
+        assert distance == pytest.approx(solver._calculate_route_distance(route, distances))
+    
+    def test_points_on_a_line(self):
+        """一直線上の点は端から端へ順に巡ること"""
+        points = np.array([0.0, 3.0, 1.0, 7.0, 4.0, 2.0])
+        distances = np.abs(points[:, None] - points[None, :])
+        
+        route, distance = TSPSolver(Config()).solve_open_path(distances)
+        
+        assert distance == pytest.approx(7.0)
+        assert list(points[route]) in ([0, 1, 2, 3, 4, 7], [7, 4, 3, 2, 1, 0])
+    
+    def test_same_start_and_end(self, random_matrix):
+        """始点と終点が同じ場合はエラーになること"""
+        with pytest.raises(ValueError):
+            TSPSolver(Config()).solve_open_path(random_matrix(5), start=1, end=1)
+
+
+class TestConstruction:
+    """初期解構築ヒューリスティックのテスト"""
+    
+    @staticmethod
+    def _points(n, seed=0):
+        rng = np.random.default_rng(seed)
+        points = rng.random((n, 2))
+        distances = np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=-1))
+        return points, distances
+    
+    def test_nearest_neighbor_matches_reference(self):
+        """ベクトル化した最近傍法が素朴な実装と同じ経路を返すこと"""
+        _, distances = self._points(60, seed=1)
+        solver = TSPSolver(Config())
+        
+        route = [5]
+        unvisited = set(range(60)) - {5}
+        while unvisited:
+            nearest = min(sorted(unvisited), key=lambda j: distances[route[-1], j])
+            route.append(nearest)
+            unvisited.remove(nearest)
+        
+        assert solver._nearest_neighbor_construction(5, distances) == route
+    
+    @pytest.mark.parametrize('method', [
+        'nearest_neighbor', 'space_filling_curve', 'greedy',
+        'farthest_insertion', 'cheapest_insertion',
+    ])
+    @pytest.mark.parametrize('start, end', [(None, None), (3, None), (None, 8), (3, 8)])
+    def test_constructions_honour_endpoints(self, method, start, end):
+        """各構築法が順列を返し、始点・終点を守ること"""
+        points, distances = self._points(80, seed=2)
+        config = Config()
+        config.optimization.construction = method
+        solver = TSPSolver(config)
+        
+        route = solver._open_path_construction(distances, start, end, coordinates=points)
+        
+        assert _is_permutation(route, 80)
+        if start is not None:
+            assert route[0] == start
+        if end is not None:
+            assert route[-1] == end
+    
+    @pytest.mark.parametrize('method', ['space_filling_curve', 'greedy', 'farthest_insertion'])
+    def test_tour_quality(self, method):
+        """構築した巡回路が最近傍法と比べて大きく劣らないこと"""
+        points, distances = self._points(200, seed=3)
+        config = Config()
+        config.optimization.construction = method
+        solver = TSPSolver(config)
+        
+        if method == 'space_filling_curve':
+            cycle = solver._space_filling_curve_construction(points)
+        elif method == 'greedy':
+            cycle = solver._greedy_edge_construction(distances, solver._candidate_lists(distances))
+        else:
+            cycle = solver._insertion_construction(distances)
+        reference = solver._nearest_neighbor_construction(0, distances)
+        
+        assert _is_permutation(cycle, 200)
+        assert Tour(cycle).length(distances) < 1.5 * Tour(reference).length(distances)
+    
+    def test_space_filling_curve_without_coordinates(self):
+        """座標がない場合は最近傍法で構築すること"""
+        _, distances = self._points(20)
+        config = Config()
+        config.optimization.construction = 'space_filling_curve'
+        
+        route = TSPSolver(config)._open_path_construction(distances)
+        
+        assert _is_permutation(route, 20)
+    
+    def test_unknown_construction(self, random_matrix):
+        """未知の構築法はエラーになること"""
+        config = Config()
+        config.optimization.construction = 'unknown'
+        
+        with pytest.raises(ValueError):
+            TSPSolver(config)._open_path_construction(random_matrix(10))
+
+
+class TestHeldKarp:
+    """厳密解法のテスト"""
+    
+    def _brute_force(self, distances, start=None, end=None):
+        n = distances.shape[0]
+        best = float('inf')
+        for route in itertools.permutations(range(n)):
+            if start is not None and route[0] != start:
+                continue
+            if end is not None and route[-1] != end:
+                continue
+            best = min(best, sum(distances[route[i], route[i + 1]] for i in range(n - 1)))
+        return best
+    
+    @pytest.mark.parametrize('start, end', [(None, None), (2, None), (None, 5), (2, 5)])
+    def test_matches_brute_force(self, start, end, random_matrix):
+        """全列挙と同じ最適値を返すこと（非対称行列を含む）"""
+        distances = random_matrix(7, seed=12)
+        distances[1, 3] += 40.0
+        solver = TSPSolver(Config())
+        
+        route, distance = solver._held_karp_path(distances, start, end)
+        
+        assert _is_permutation(route, 7)
+        assert distance == pytest.approx(self._brute_force(distances, start, end))
+        assert distance == pytest.approx(solver._calculate_route_distance(route, distances))
+    
+    def test_dispatch_below_threshold(self, random_matrix):
+        """閾値以下では自動的に厳密解を使うこと"""
+        distances = random_matrix(8, seed=13)
+        solver = TSPSolver(Config())
+        
+        _, distance = solver.solve_open_path(distances)
+        _, multi_start_distance = solver.solve_with_optimal_start(distances)
+        
+        assert distance == pytest.approx(self._brute_force(distances))
+        assert multi_start_distance == pytest.approx(distance)
+
+
+class TestCandidateLists:
+    """近傍候補リストのテスト"""
+    
+    def test_candidate_lists_are_nearest_first(self, random_matrix):
+        """候補が自身を含まず距離の昇順で並ぶこと"""
+        distances = random_matrix(40, seed=3)
+        solver = TSPSolver(Config())
+        
+        candidates = solver._candidate_lists(distances, k=5)
+        
+        assert candidates.shape == (40, 5)
+        for i in range(40):
+            assert i not in candidates[i]
+            expected = sorted(j for j in range(40) if j != i)
+            expected.sort(key=lambda j: distances[i, j])
+            assert list(distances[i, candidates[i]]) == pytest.approx(
+                [distances[i, j] for j in expected[:5]]
+            )
+    
+    def test_candidate_lists_small_instance(self, random_matrix):
+        """点数が k 以下の場合は他の全点が候補になること"""
+        distances = random_matrix(4, seed=4)
+        solver = TSPSolver(Config())
+        
+        candidates = solver._candidate_lists(distances, k=10)
+        
+        assert candidates.shape == (4, 3)
+    
+    def test_large_instance(self, random_matrix):
+        """数千点規模でも候補リストで局所探索できること"""
+        distances = random_matrix(1500, seed=5)
+        solver = TSPSolver(Config())
+        
+        route, distance = solver.solve_from_start(0, distances)
+        initial = solver._nearest_neighbor_construction(0, distances)
+        
+        assert _is_permutation(route, 1500)
+        assert distance < solver._calculate_route_distance(initial, distances)
+
+
+class TestLowerBound:
+    """1-tree・Held-Karp下界のテスト"""
+    
+    @pytest.mark.parametrize('start, end', [(None, None), (2, None), (2, 5)])
+    def test_bounds_below_optimum(self, start, end, random_matrix):
+        """下界が厳密解以下で、Held-Karp下界が1-tree下界以上であること"""
+        distances = random_matrix(11, seed=4)
+        solver = TSPSolver(Config())
+        _, optimum = solver._held_karp_path(distances, start, end)
+        calculator = LowerBoundCalculator(Config())
+        
+        one_tree = calculator.one_tree_bound(distances, start, end)
+        held_karp = calculator.held_karp_bound(distances, optimum * 1.05, start, end)
+        
+        assert 0 < one_tree <= held_karp <= optimum + 1e-6
+    
+    def test_points_on_a_line(self):
+        """一直線上の点では下界が最適値と一致すること"""
+        points = np.array([0.0, 3.0, 1.0, 7.0, 4.0, 2.0])
+        distances = np.abs(points[:, None] - points[None, :])
+        
+        assert LowerBoundCalculator(Config()).one_tree_bound(distances) == pytest.approx(7.0)
+    
+    def test_asymmetric_matrix(self, random_matrix):
+        """非対称行列でも下界が厳密解以下であること"""
+        rng = np.random.default_rng(8)
+        distances = random_matrix(10, seed=8) * rng.uniform(1.0, 1.3, (10, 10))
+        np.fill_diagonal(distances, 0)
+        _, optimum = TSPSolver(Config())._held_karp_path(distances)
+        
+        bound = LowerBoundCalculator(Config()).held_karp_bound(distances, optimum)
+        
+        assert bound <= optimum + 1e-6
+    
+    def test_gap_reported(self, random_matrix):
+        """解法の統計に下界と最適性ギャップが記録されること"""
+        distances = random_matrix(60, seed=6)
+        solver = TSPSolver(Config())
+        
+        _, distance = solver.solve_open_path(distances)
+        
+        bound = solver.stats['lower_bound']
+        assert 0 < bound <= distance
+        assert solver.stats['optimality_gap'] == pytest.approx((distance - bound) / bound)
+    
+    def test_exact_solve_has_zero_gap(self, random_matrix):
+        """厳密解ではギャップが0であること"""
+        solver = TSPSolver(Config())
+        
+        _, distance = solver.solve_open_path(random_matrix(8))
+        
+        assert solver.stats['lower_bound'] == distance
+        assert solver.stats['optimality_gap'] == 0.0
+    
+    def test_target_gap_stops_refinement(self, random_matrix):
+        """目標ギャップに達していれば反復局所探索を行わないこと"""
+        config = Config()
+        config.optimization.ils_time_budget = 5.0
+        config.optimization.target_gap = 1.0
+        solver = TSPSolver(config)
+        
+        solver.solve_open_path(random_matrix(60, seed=6))
+        
+        assert 'iterated_local_search' not in solver.stats
+    
+    def test_target_gap_stops_multi_start(self, capsys, random_matrix):
+        """目標ギャップに達した時点で始点の探索を打ち切ること"""
+        config = Config()
+        config.optimization.target_gap = 1.0
+        
+        route, _ = TSPSolver(config).solve_with_optimal_start(random_matrix(40, seed=2))
+        
+        assert _is_permutation(route, 40)
+        assert 'after 1 starting points' in capsys.readouterr().out
+    
+    @pytest.mark.parametrize('target_gap, method', [(0.0, 'one_tree_bound'), (0.05, 'held_karp_bound')])
+    def test_auto_bound(self, monkeypatch, target_gap, method, random_matrix):
+        """既定では目標ギャップがある時だけHeld-Karp下界を計算すること"""
+        config = Config()
+        config.optimization.target_gap = target_gap
+        calculator = LowerBoundCalculator(config)
+        calls = []
+        for name in ('one_tree_bound', 'held_karp_bound'):
+            monkeypatch.setattr(calculator, name, lambda *args, name=name: calls.append(name) or 0.0)
+        
+        calculator.compute(random_matrix(20), 100.0)
+        
+        assert calls == [method]
+    
+    def test_disabled(self, random_matrix):
+        """下界を無効にするとギャップがNoneになること"""
+        config = Config()
+        config.optimization.lower_bound = 'none'
+        solver = TSPSolver(config)
+        
+        solver.solve_open_path(random_matrix(30))
+        
+        assert solver.stats['optimality_gap'] is None
+
+
+class TestKernels:
+    """コンパイル済みカーネルのテスト"""
+    
+    @staticmethod
+    def _config(use_numba):
+        config = Config()
+        config.optimization.use_numba = use_numba
+        return config
+    
+    @staticmethod
+    def _python(function):
+        """Numbaでコンパイルされていれば元のPython関数を返す"""
+        return getattr(function, 'py_func', function)
+    
+    def test_nearest_neighbor_matches_numpy(self, random_matrix):
+        """カーネルの最近傍法がNumPy実装と同じ経路を返すこと"""
+        distances = random_matrix(40, seed=11)
+        expected = TSPSolver(self._config(False))._nearest_neighbor_construction(3, distances)
+        
+        route = self._python(kernels.nearest_neighbor)(3, distances)
+        
+        assert route.tolist() == expected
+    
+    def test_route_distance_matches_python(self, random_matrix):
+        """カーネルの経路長がPython実装と一致すること"""
+        distances = random_matrix(20, seed=12)
+        route = list(np.random.default_rng(12).permutation(20))
+        expected = TSPSolver(self._config(False))._calculate_route_distance(route, distances)
+        
+        total = self._python(kernels.route_distance)(np.asarray(route), distances)
+        
+        assert total == pytest.approx(expected)
+    
+    def test_two_opt_matches_tour(self, random_matrix):
+        """カーネルの2-optがTour上の探索と同じ手順で同じ巡回路を返すこと"""
+        distances = random_matrix(60, seed=13)
+        order = np.random.default_rng(13).permutation(60)
+        solver = TSPSolver(self._config(False))
+        neighbours = solver._candidate_lists(distances, 8)
+        
+        expected = Tour(order)
+        expected_moves = solver._two_opt_search(expected, distances, neighbours)
+        
+        tour = Tour(order)
+        queue = np.array(tour.queued_points(), dtype=np.int64)
+        moves, _, count = self._python(kernels.two_opt_candidates)(
+            tour.order, tour.position, distances, solver._neighbour_array(neighbours),
+            tour.dont_look, queue, 0, len(queue),
+            solver.config.optimization.tsp_improvement_threshold,
+            solver.config.optimization.two_opt_strategy == 'best', 10 ** 6
+        )
+        
+        assert moves == expected_moves > 0
+        assert count == 0
+        assert tour.order.tolist() == expected.order.tolist()
+    
+    def test_spanning_tree_matches_numpy(self, random_matrix):
+        """カーネルの最小全域木がNumPy実装と一致すること"""
+        costs = random_matrix(30, seed=14)
+        penalties = np.random.default_rng(14).normal(0, 20, 30)
+        expected_total, expected_degree = LowerBoundCalculator(
+            self._config(False)
+        )._spanning_tree(costs, penalties)
+        
+        total, degree = self._python(kernels.minimum_spanning_tree)(costs, penalties)
+        
+        assert total == pytest.approx(expected_total)
+        assert degree.tolist() == expected_degree.tolist()
+    
+    @pytest.mark.skipif(not kernels.NUMBA_AVAILABLE, reason="numba is not installed")
+    def test_solver_results_identical(self, random_matrix):
+        """Numbaの有無で経路・距離・下界が一致すること"""
+        distances = random_matrix(150, seed=15)
+        results = []
+        for use_numba in (True, False):
+            solver = TSPSolver(self._config(use_numba))
+            route, distance = solver.solve_open_path(distances)
+            results.append((route, distance, solver.stats['lower_bound']))
+        
+        assert results[0][0] == results[1][0]
+        assert results[0][1] == pytest.approx(results[1][1])
+        assert results[0][2] == pytest.approx(results[1][2])